@@ -0,0 +1,103 @@
+"""
+Benchmark GET /api/admin/users on a large seeded table.
+
+Seeds a throwaway SQLite database with --users accounts and about
+--history-per-user history rows each, then times the first page, a page deep
+into the keyset and a full walk for every sort key. Run from backend/:
+
+    python benchmarks/bench_admin_users.py --users 50000 --history-per-user 4
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_TMP = tempfile.mkdtemp(prefix="bench-admin-users-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'bench.db')}"
+os.environ.setdefault("GEMINI_API_KEY", "bench")
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["SQL_SLOW_QUERY_MS"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+import main  # noqa: E402
+from database import create_all_tables, engine  # noqa: E402
+from models.resume_history import ResumeHistory  # noqa: E402
+from models.user import User, UserRole  # noqa: E402
+
+SORTS = ("created_at", "email", "resume_count")
+
+
+def seed(users: int, history_per_user: float) -> None:
+    rng = random.Random(33)
+    start = datetime(2023, 1, 1)
+    create_all_tables()
+    with engine.begin() as conn:
+        for offset in range(0, users, 5000):
+            ids = conn.execute(insert(User).returning(User.id), [
+                {"email": f"user{i:07d}@bench.example.com", "full_name": f"User {i}", "hashed_password": "x",
+                 "role": UserRole.user, "created_at": start + timedelta(seconds=rng.randrange(users * 60))}
+                for i in range(offset, min(users, offset + 5000))
+            ]).scalars().all()
+            rows = [
+                {"user_id": user_id, "generation_type": "resume",
+                 "created_at": start + timedelta(seconds=rng.randrange(users * 60))}
+                for user_id in ids for _ in range(int(rng.expovariate(1 / history_per_user)) if history_per_user else 0)
+            ]
+            if rows:
+                conn.execute(insert(ResumeHistory), rows)
+
+
+def timed_get(client, headers, params) -> tuple:
+    start = time.perf_counter()
+    r = client.get("/api/admin/users", params=params, headers=headers)
+    r.raise_for_status()
+    return (time.perf_counter() - start) * 1000, r
+
+
+def run(args) -> None:
+    print(f"Seeding {args.users} users ...", flush=True)
+    seed(args.users, args.history_per_user)
+    with TestClient(main.app) as client:
+        creds = {"email": "admin@bench.example.com", "password": "secret1"}
+        client.post("/api/auth/register", json={**creds, "full_name": "Admin", "role": "admin"})
+        token = client.post("/api/auth/login", json=creds).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"{'sort':<14}{'first page ms':>15}{'deep page ms':>15}{'queries':>9}{'walk s':>9}")
+        for sort in SORTS:
+            params = {"limit": args.limit, "sort": sort}
+            timed_get(client, headers, params)   # warm up
+            first = statistics.median(timed_get(client, headers, params)[0] for _ in range(args.repeat))
+
+            cursor, pages, walk_start = None, 0, time.perf_counter()
+            deep_cursor = None
+            while True:
+                _, r = timed_get(client, headers, {**params, **({"cursor": cursor} if cursor else {})})
+                pages += 1
+                cursor = r.headers.get("X-Next-Cursor")
+                if pages == max(1, args.users // args.limit // 2):
+                    deep_cursor = cursor
+                if not cursor:
+                    break
+            walk = time.perf_counter() - walk_start
+
+            deep_params = {**params, **({"cursor": deep_cursor} if deep_cursor else {})}
+            deep = statistics.median(timed_get(client, headers, deep_params)[0] for _ in range(args.repeat))
+            queries = r.headers.get("X-DB-Query-Count")
+            print(f"{sort:<14}{first:>15.1f}{deep:>15.1f}{queries:>9}{walk:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--history-per-user", type=float, default=3.0)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    run(parser.parse_args())
@@ -0,0 +1,77 @@
+"""
+Benchmark generate_portfolio_html against the previous f-string renderer.
+
+For each page size, reports the median render time and peak allocation of the
+baseline (benchmarks/baseline_portfolio_html.py) and of the compiled renderer,
+their ratios, and the ZIP bundle build time. Run from backend/:
+
+    python benchmarks/bench_portfolio_render.py --projects 10 100 400
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("GEMINI_API_KEY", "bench")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import baseline_portfolio_html as baseline  # noqa: E402
+from services.portfolio_bundle_service import build_portfolio_bundle  # noqa: E402
+from services.portfolio_html_service import generate_portfolio_html  # noqa: E402
+
+
+def sample(projects: int, skills: int) -> tuple:
+    profile = {
+        "personal_info": {"name": "Ada <Lovelace>", "email": "ada@example.com", "location": "London",
+                          "github": "https://github.com/ada", "linkedin": "https://linkedin.com/in/ada"},
+        "skills": [f"skill {i}" for i in range(skills)],
+        "projects": [{"name": f"Project {i}", "tech_stack": "Python, SQL", "link": f"https://example.com/{i}"}
+                     for i in range(projects)],
+    }
+    portfolio = {
+        "about_me": "Writes about engines & notes. " * 20,
+        "professional_bio": "Mathematician",
+        "linkedin_summary": "Pioneer of computing. " * 10,
+        "github_highlights": "Engine <42 stars>",
+        "project_descriptions": [{"name": f"Project {i}", "description": "Built a thing. " * 15}
+                                 for i in range(projects)],
+    }
+    return portfolio, profile
+
+
+def measure(fn, repeat: int) -> tuple:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def run(args) -> None:
+    print(f"{'projects':>9}{'old ms':>9}{'new ms':>9}{'speedup':>9}"
+          f"{'old peak KiB':>14}{'new peak KiB':>14}{'alloc ratio':>13}{'bundle ms':>11}{'page KiB':>10}")
+    for projects in args.projects:
+        portfolio, profile = sample(projects, args.skills)
+        old_ms, old_peak = measure(lambda: baseline.generate_portfolio_html(portfolio, profile), args.repeat)
+        new_ms, new_peak = measure(lambda: generate_portfolio_html(portfolio, profile), args.repeat)
+        bundle_ms, _ = measure(lambda: build_portfolio_bundle(portfolio, profile), max(1, args.repeat // 10))
+        size = len(generate_portfolio_html(portfolio, profile).encode()) / 1024
+        print(f"{projects:>9}{old_ms:>9.3f}{new_ms:>9.3f}{old_ms / new_ms:>8.2f}x"
+              f"{old_peak / 1024:>14.1f}{new_peak / 1024:>14.1f}{new_peak / old_peak:>13.2f}"
+              f"{bundle_ms:>11.2f}{size:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--projects", type=int, nargs="+", default=[0, 10, 100, 400])
+    parser.add_argument("--skills", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=200)
+    run(parser.parse_args())
@@ -11,13 +11,122 @@ load_dotenv()
 SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-in-production-please")
 ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+# Authenticated users are cached per worker for AUTH_CACHE_TTL seconds (0 = off).
+# Deletes and role changes made through the API invalidate the entry at once.
+AUTH_CACHE_TTL: int = int(os.getenv("AUTH_CACHE_TTL", "30"))
+AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+# Authorize admin routes from the signed token's role claim instead of the stored
+# role: non-admin tokens are rejected before any lookup, but a demoted admin keeps
+# access until their token expires.
+AUTH_TRUST_ROLE_CLAIM: bool = os.getenv("AUTH_TRUST_ROLE_CLAIM", "false").lower() == "true"
+
+# ─── Password Hashing ─────────────────────────────────────────────────────────
+# bcrypt cost factor; stored hashes below it are upgraded on the next login.
+BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt processes per app worker (0 = hash in the threadpool, inside this process).
+# Every app worker gets its own pool, so the default splits the cores between the
+# WEB_CONCURRENCY app workers: at most about one bcrypt process per core in total.
+WEB_CONCURRENCY: int = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+PASSWORD_HASH_WORKERS: int = int(os.getenv(
+    "PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+))
+# Hash/verify calls allowed in flight per app worker; beyond this login and
+# register answer 503 instead of queueing behind a burst.
+PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
 
 # ─── AI ───────────────────────────────────────────────────────────────────────
 GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+# Maximum in-flight Gemini requests per worker process
+GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+# Generate portfolio sections as concurrent small prompts instead of one long one
+PORTFOLIO_FANOUT: bool = os.getenv("PORTFOLIO_FANOUT", "false").lower() in ("1", "true", "yes")
 
 # ─── Database ─────────────────────────────────────────────────────────────────
 DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./resume_builder.db")
+# Async driver URL for request handlers; derived from DATABASE_URL when unset
+# (sqlite → sqlite+aiosqlite, postgresql → postgresql+asyncpg)
+ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+# Apply pending schema migrations on startup (disable to run `python manage.py migrate` manually)
+AUTO_MIGRATE: bool = os.getenv("AUTO_MIGRATE", "true").lower() in ("1", "true", "yes")
+
+# SQLite profile — PRAGMAs applied to every new connection. WAL lets readers run
+# alongside the single writer; busy_timeout makes writers from other workers
+# wait for the lock instead of failing with "database is locked".
+SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+
+# Connection pool per worker process. Size, overflow and timeout apply to every
+# file-backed database, SQLite included (a burst queues on the pool rather than
+# on the write lock); recycle and pre-ping only to server databases (Postgres etc.)
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Group-commit new history rows: rows submitted within HISTORY_BATCH_DELAY_MS
+# (or until HISTORY_BATCH_MAX are queued) share one transaction
+HISTORY_WRITE_BEHIND: bool = os.getenv("HISTORY_WRITE_BEHIND", "true").lower() in ("1", "true", "yes")
+HISTORY_BATCH_MAX: int = int(os.getenv("HISTORY_BATCH_MAX", "64"))
+HISTORY_BATCH_DELAY_MS: float = float(os.getenv("HISTORY_BATCH_DELAY_MS", "5"))
+
+# SQL instrumentation: statements slower than this are logged with their
+# parameters (0 = off); a statement shape repeated more than SQL_REPEAT_THRESHOLD
+# times in one request is logged as a likely N+1 (0 = off)
+SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+SQL_REPEAT_THRESHOLD: int = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+
+# Retention defaults for `python manage.py retention` (0 disables a rule)
+RETENTION_KEEP_LAST: int = int(os.getenv("RETENTION_KEEP_LAST", "0"))
+RETENTION_MAX_AGE_DAYS: int = int(os.getenv("RETENTION_MAX_AGE_DAYS", "0"))
+RETENTION_BATCH_SIZE: int = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+
+# ─── Rate Limiting (LLM-backed endpoints) ─────────────────────────────────────
+# Token buckets written as "<requests>/<second|minute|hour|day>"; empty = no limit.
+# The bucket holds that many requests and refills at the same rate.
+RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_PER_USER: str = os.getenv("RATE_LIMIT_PER_USER", "10/minute")
+RATE_LIMIT_PER_IP: str = os.getenv("RATE_LIMIT_PER_IP", "30/minute")
+RATE_LIMIT_GLOBAL: str = os.getenv("RATE_LIMIT_GLOBAL", "60/minute")   # shared Gemini quota
+# "memory" limits each worker process on its own; "sqlite" shares the buckets
+# between all workers on the host through RATE_LIMIT_SQLITE_PATH.
+RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH: str = os.getenv("RATE_LIMIT_SQLITE_PATH", "./rate_limits.db")
+# Use the first X-Forwarded-For address as the client IP (only behind a trusted proxy).
+RATE_LIMIT_TRUST_FORWARDED: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes")
+
+# ─── Profile Snapshots ────────────────────────────────────────────────────────
+PROFILE_CACHE_SIZE: int = int(os.getenv("PROFILE_CACHE_SIZE", "4096"))
+# Writes in this process invalidate immediately; the TTL bounds how long other
+# worker processes can keep using a profile that was edited elsewhere.
+PROFILE_CACHE_TTL: int = int(os.getenv("PROFILE_CACHE_TTL", "30"))
+
+# ─── Hosted Portfolios ────────────────────────────────────────────────────────
+PORTFOLIO_PAGE_CACHE_SIZE: int = int(os.getenv("PORTFOLIO_PAGE_CACHE_SIZE", "1024"))
+# Entries expire after this many seconds so other gunicorn workers (which never
+# see this worker's invalidations) serve stale pages for a bounded time only.
+PORTFOLIO_PAGE_CACHE_TTL: int = int(os.getenv("PORTFOLIO_PAGE_CACHE_TTL", "60"))
+PORTFOLIO_PAGE_MAX_AGE: int = int(os.getenv("PORTFOLIO_PAGE_MAX_AGE", "60"))
+# Slugs that resolved to nothing (unknown, unpublished, no portfolio yet) are
+# remembered this long, so repeated misses do not each query the database.
+PORTFOLIO_MISS_CACHE_TTL: int = int(os.getenv("PORTFOLIO_MISS_CACHE_TTL", "10"))
+
+# ─── Metrics ──────────────────────────────────────────────────────────────────
+# When set, GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>".
+# Multi-worker aggregation is configured with PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py).
+METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
+# ─── Request Profiling ────────────────────────────────────────────────────────
+# Fraction of requests (0.0–1.0) recorded by the sampling profiler; admins can
+# also profile a single request by sending "X-Profile: 1".
+PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR: str = os.getenv("PROFILE_DIR", "./profiles")
+PROFILE_KEEP: int = int(os.getenv("PROFILE_KEEP", "200"))   # newest profiles kept on disk
 
 # ─── App ──────────────────────────────────────────────────────────────────────
 APP_NAME: str = "AI Resume & Portfolio Builder"
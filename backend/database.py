@@ -1,33 +1,230 @@
 """
 SQLAlchemy database engine, session factory, and declarative base.
-Tables are auto-created on application startup.
+Tables are auto-created on application startup, then pending migrations run.
+
+The engine is built from a per-backend profile in config.py: SQLite gets WAL,
+synchronous/mmap/cache PRAGMAs and a busy_timeout on every new connection;
+server databases get a sized, recycled, pre-pinged pool. Checkout waits and
+connection counts are recorded in pool_metrics (see get_pool_metrics()); every
+statement is timed and counted per request by services/query_stats.py.
+
+Request handlers use the asyncio engine (aiosqlite / asyncpg) through the async
+get_db dependency. The sync engine and SessionLocal remain for manage.py,
+migrations and startup tasks; ORM flush hooks work with both.
 """
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, AUTO_MIGRATE,
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT_MS, SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE_KB,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+)
+from services.metrics import DB_POOL_WAIT, DB_POOL_CHECKED_OUT, DB_POOL_EVENTS
+from services import query_stats
+
+
+# ── Pool metrics ─────────────────────────────────────────────────────────────
+class PoolMetrics:
+    """
+    Process-wide pool counters; checkout wait covers queueing plus any new connect.
+    Each event is also exported to Prometheus (services/metrics.py).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        DB_POOL_WAIT.observe(seconds)
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        if name in _POOL_EVENTS:
+            DB_POOL_EVENTS.labels(_POOL_EVENTS[name]).inc()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+_POOL_EVENTS = {"connects": "connect", "invalidations": "invalidate", "timeouts": "timeout"}
+pool_metrics = PoolMetrics()
+
+
+class _TimedCheckout:
+    """Pool mixin that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            pool_metrics.incr("timeouts")
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+# ── Engine profiles ──────────────────────────────────────────────────────────
+_url = make_url(DATABASE_URL)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
+_SQLITE_MEMORY = IS_SQLITE and _url.database in (None, "", ":memory:")
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _async_url():
+    """ASYNC_DATABASE_URL, or DATABASE_URL with its driver swapped for the asyncio one."""
+    if ASYNC_DATABASE_URL:
+        return make_url(ASYNC_DATABASE_URL)
+    return _url.set(drivername=_ASYNC_DRIVERS.get(_url.get_backend_name(), _url.drivername))
+
+
+def _engine_options(is_async: bool) -> dict:
+    if _SQLITE_MEMORY:
+        # Each pooled connection would be a separate empty database; keep SQLAlchemy's default
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+    options = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+    if IS_SQLITE:
+        # check_same_thread=False allows multi-threaded access; the pool hands each
+        # connection to one thread at a time. Pool sizes still apply so a burst of
+        # requests queues on the pool rather than on the database lock.
+        if not is_async:
+            options["connect_args"] = {"check_same_thread": False}
+        return options
+    options["pool_recycle"] = DB_POOL_RECYCLE
+    options["pool_pre_ping"] = DB_POOL_PRE_PING
+    return options
+
+
+# Request handlers use async_engine; scripts, migrations and startup tasks use engine
+engine = create_engine(DATABASE_URL, **_engine_options(is_async=False))
+async_engine = create_async_engine(_async_url(), **_engine_options(is_async=True))
+
+
+def _on_connect(dbapi_connection, connection_record):
+    pool_metrics.incr("connects")
+    if not IS_SQLITE:
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    if not _SQLITE_MEMORY:
+        cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}")
+    cursor.close()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    pool_metrics.incr("checkins")
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_metrics.incr("invalidations")
+
+
+for _sync_engine in (engine, async_engine.sync_engine):
+    event.listen(_sync_engine, "connect", _on_connect)
+    event.listen(_sync_engine, "checkout", _on_checkout)
+    event.listen(_sync_engine, "checkin", _on_checkin)
+    event.listen(_sync_engine, "invalidate", _on_invalidate)
+    event.listen(_sync_engine, "before_cursor_execute", query_stats.before_cursor_execute)
+    event.listen(_sync_engine, "after_cursor_execute", query_stats.after_cursor_execute)
+    event.listen(_sync_engine, "handle_error", query_stats.handle_error)
+
+
+def get_pool_metrics() -> dict:
+    """Pool counters plus the request pool's current occupancy."""
+    pool = async_engine.pool
+    return {
+        "backend": _url.get_backend_name(),
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        **pool_metrics.snapshot(),
+    }
 
-# connect_args needed only for SQLite (allows multi-threaded access)
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: attributes stay readable after commit without an
+# implicit (and, under asyncio, illegal) lazy refresh.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
-def get_db():
-    """FastAPI dependency: yields a DB session and closes it after the request."""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """FastAPI dependency: yields an async DB session and closes it after the request."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def create_all_tables():
-    """Called on app startup to create all tables if they don't exist."""
+def create_all_tables(migrate: bool = None):
+    """
+    Called on app startup to create missing tables and apply pending migrations
+    (migrate defaults to the AUTO_MIGRATE setting).
+    """
     # Import models here so they register with Base before create_all
     import models.user          # noqa: F401
     import models.profile       # noqa: F401
+    import models.content_blob  # noqa: F401
     import models.resume_history  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+    import models.daily_stats   # noqa: F401
+    import models.history_archive  # noqa: F401
+    import migrations
+    # Under the schema lock, so workers starting together do not race on CREATE TABLE
+    with migrations.schema_lock(engine):
+        Base.metadata.create_all(bind=engine)
+        if AUTO_MIGRATE if migrate is None else migrate:
+            run_migrations()
+
+
+def run_migrations() -> list:
+    """Apply pending schema migrations (see migrations/__init__.py)."""
+    import migrations
+    return migrations.run_migrations(engine)
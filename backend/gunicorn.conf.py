@@ -0,0 +1,46 @@
+"""
+gunicorn.conf.py — multi-worker production settings.
+
+Run with: gunicorn main:app -c gunicorn.conf.py
+
+Workers are uvicorn workers (the app is async). If PROMETHEUS_MULTIPROC_DIR is
+set, every worker writes its metrics to files there and GET /metrics merges
+them; the directory is emptied when the master starts (stale files from a
+previous run would be counted again) and an exited worker's live gauges are
+dropped so they stop adding to the totals. With AUTO_MIGRATE (the default) the
+master applies pending schema migrations once before starting the workers.
+"""
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()   # same .env as config.py, for AUTO_MIGRATE / WEB_CONCURRENCY below
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() * 2 + 1)))
+# Read by config.py to size per-worker pools (PASSWORD_HASH_WORKERS)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))   # generation requests wait on Gemini
+
+
+def on_starting(server):
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+    if os.getenv("AUTO_MIGRATE", "true").lower() in ("1", "true", "yes"):
+        # Migrate once, before any worker exists (in a child process, so the
+        # master never opens database connections that forked workers would share).
+        # Workers still check on startup, under the schema lock, and find nothing pending.
+        subprocess.run([sys.executable, "manage.py", "migrate"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                       check=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -8,13 +8,24 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import logging
+import random
 import time
 
-from config import APP_NAME, VERSION, ALLOWED_ORIGINS
-from database import create_all_tables
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from config import APP_NAME, VERSION, ALLOWED_ORIGINS, HISTORY_WRITE_BEHIND, PROFILE_SAMPLE_RATE
+from database import create_all_tables, SessionLocal, AsyncSessionLocal, async_engine
+from services import content_store, stats_rollup  # noqa: F401  (flush hooks)
+from services.history_writer import history_writer
+from services.password_hasher import password_hasher
+from services.metrics import HTTP_REQUESTS, HTTP_LATENCY, DB_QUERIES_PER_REQUEST
+from services.query_stats import track_queries, finish_request
+from services.auth_service import principal_from_token
+from services.profiler import sampler, new_profile_id, save_profile
+from models.user import UserRole
 
 # ── Import all routers ────────────────────────────────────────────────────────
-from routers import auth, profile, resume, cover_letter, ats, portfolio, pdf, admin
+from routers import auth, profile, resume, cover_letter, ats, portfolio, pdf, admin, public_portfolio, metrics
 
 # ── Logging ──────────────────────────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
@@ -39,28 +50,151 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Process-Time-Ms", "X-DB-Query-Count", "X-DB-Query-Time-Ms", "X-Profile-Id"],
 )
 
 
 # ── Request Timing Middleware ─────────────────────────────────────────────────
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    start = time.time()
-    response = await call_next(request)
-    duration = round((time.time() - start) * 1000, 2)
-    response.headers["X-Process-Time-Ms"] = str(duration)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        with track_queries() as queries:
+            response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        # Label by route template (/api/portfolio/{slug}), never the raw path,
+        # so the number of series stays bounded.
+        route = request.scope.get("route")
+        template = getattr(route, "path", "unmatched")
+        HTTP_REQUESTS.labels(request.method, template, str(status_code)).inc()
+        HTTP_LATENCY.labels(request.method, template).observe(elapsed)
+        DB_QUERIES_PER_REQUEST.labels(request.method, template).observe(queries.count)
+        finish_request(queries, request.method, template)
+    response.headers["X-Process-Time-Ms"] = str(round(elapsed * 1000, 2))
+    response.headers["X-DB-Query-Count"] = str(queries.count)
+    response.headers["X-DB-Query-Time-Ms"] = str(queries.ms)
     return response
 
 
+# ── Request Profiling Middleware ──────────────────────────────────────────────
+_NEVER_PROFILED = ("/metrics", "/api/admin/profiles")
+
+
+async def _requested_by_admin(headers: Headers) -> bool:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    async with AsyncSessionLocal() as db:
+        principal = await principal_from_token(token, db)
+    return principal is not None and principal.role == UserRole.admin
+
+
+class ProfilingMiddleware:
+    """
+    Record a sampled profile of PROFILE_SAMPLE_RATE of requests, and of any
+    admin request sent with "X-Profile: 1"; the id is returned in X-Profile-Id.
+
+    A plain ASGI middleware rather than @app.middleware: unsampled requests
+    pass straight through without the extra task and response wrapping, and
+    recording stops when the last body chunk is sent, streamed or not. The
+    profile is written after the response has gone out. Every HTTP request is
+    counted in sampler.in_flight so profiles can report their overlap.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        sampler.in_flight += 1   # lets each profile report how many requests overlapped it
+        try:
+            if scope["path"].startswith(_NEVER_PROFILED):
+                return await self.app(scope, receive, send)
+            reason = None
+            if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+                reason = "sampled"
+            else:
+                headers = Headers(scope=scope)
+                if headers.get("x-profile") == "1" and await _requested_by_admin(headers):
+                    reason = "requested"
+            if reason is None:
+                return await self.app(scope, receive, send)
+            await self._record(scope, receive, send, reason)
+        finally:
+            sampler.in_flight -= 1
+
+    async def _record(self, scope, receive, send, reason: str):
+        profile_id = new_profile_id()
+        status_code = 500
+        start = time.perf_counter()
+        recording = sampler.begin()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", []).append((b"x-profile-id", profile_id.encode()))
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                sampler.end(recording)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.end(recording)
+        meta = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(scope.get("route"), "path", "unmatched"),
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "reason": reason,
+        }
+        try:
+            await run_in_threadpool(save_profile, profile_id, recording, meta)
+        except OSError as e:
+            logger.warning(f"Could not store request profile: {e}")
+
+
+app.add_middleware(ProfilingMiddleware)
+
+
 # ── Startup Event ─────────────────────────────────────────────────────────────
 @app.on_event("startup")
 def startup_event():
     """Create database tables and log startup info."""
     logger.info(f"🚀 Starting {APP_NAME} v{VERSION}")
     create_all_tables()
+    with SessionLocal() as db:
+        stats_rollup.backfill_if_empty(db)
     logger.info("✅ Database tables created/verified")
 
 
+@app.on_event("startup")
+async def start_history_writer():
+    """Start the group-commit writer for generation history."""
+    if HISTORY_WRITE_BEHIND:
+        await history_writer.start()
+
+
+@app.on_event("startup")
+async def start_password_hasher():
+    """Spawn the bcrypt worker processes (PASSWORD_HASH_WORKERS)."""
+    await password_hasher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued history rows, stop the bcrypt workers, then close pooled async database connections."""
+    await history_writer.stop()
+    await password_hasher.stop()
+    await async_engine.dispose()
+
+
 # ── Global Exception Handler ──────────────────────────────────────────────────
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -80,6 +214,8 @@ app.include_router(ats.router)
 app.include_router(portfolio.router)
 app.include_router(pdf.router)
 app.include_router(admin.router)
+app.include_router(public_portfolio.router)
+app.include_router(metrics.router)
 
 
 # ── Root Health Check ─────────────────────────────────────────────────────────
@@ -0,0 +1,112 @@
+"""
+manage.py — maintenance commands for the backend.
+
+Usage:
+  python manage.py migrate           — apply pending schema migrations
+  python manage.py migrate --status  — list applied and pending migrations
+  python manage.py rebuild-stats     — recompute the daily_stats rollup from users and live + archived history
+  python manage.py vacuum            — compact the SQLite file (e.g. after migration 0003)
+  python manage.py retention --keep-last 20 --max-age-days 365 [--to jsonl --out-dir DIR] [--dry-run]
+                                     — archive old history rows in batches
+"""
+import argparse
+import logging
+import os
+import time
+
+from config import RETENTION_KEEP_LAST, RETENTION_MAX_AGE_DAYS, RETENTION_BATCH_SIZE
+from database import create_all_tables, SessionLocal, engine
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+logger = logging.getLogger("manage")
+
+
+def migrate(args) -> None:
+    import migrations
+
+    if args.status:
+        done = migrations.applied_versions(engine)
+        for module in migrations.discover():
+            state = "applied" if module.VERSION in done else "pending"
+            logger.info(f"{module.VERSION:04d} [{state}] {module.DESCRIPTION}")
+        return
+    applied = migrations.run_migrations(engine)
+    logger.info(f"Applied {len(applied)} migration(s): {applied}" if applied else "Database is up to date")
+
+
+def rebuild_stats(args) -> None:
+    from services import stats_rollup
+
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        days = stats_rollup.rebuild(db)
+    logger.info(f"Rebuilt daily_stats: {days} days in {time.perf_counter() - start:.2f}s")
+
+
+def vacuum(args) -> None:
+    if engine.dialect.name != "sqlite":
+        logger.info("vacuum only applies to SQLite databases")
+        return
+    path = engine.url.database
+    before = os.path.getsize(path)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM")
+    logger.info(f"Vacuumed {path}: {before / 1e6:.1f} MB -> {os.path.getsize(path) / 1e6:.1f} MB")
+
+
+def retention(args) -> None:
+    from services.retention import RetentionPolicy, JsonlSink, TableSink, run_retention
+
+    policy = RetentionPolicy(
+        keep_last=args.keep_last,
+        max_age_days=args.max_age_days,
+        generation_types=tuple(args.type or ()),
+    )
+    if not policy.enabled:
+        logger.info("No retention rule set (use --keep-last / --max-age-days or RETENTION_* settings)")
+        return
+    sink = JsonlSink(args.out_dir) if args.to == "jsonl" else TableSink()
+    report = run_retention(SessionLocal, policy, sink=sink, batch_size=args.batch_size,
+                           pause_ms=args.pause_ms, dry_run=args.dry_run)
+    if args.dry_run:
+        logger.info(f"Dry run: {report.candidates} rows match {policy}")
+    else:
+        logger.info(report.summary())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI Resume & Portfolio Builder maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = commands.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_cmd.add_argument("--status", action="store_true", help="List migrations without applying")
+    migrate_cmd.set_defaults(handler=migrate, migrate_on_setup=False)
+
+    commands.add_parser("rebuild-stats", help="Recompute daily_stats from users and live + archived history") \
+        .set_defaults(handler=rebuild_stats)
+
+    commands.add_parser("vacuum", help="Compact the SQLite database file") \
+        .set_defaults(handler=vacuum)
+
+    retention_cmd = commands.add_parser("retention", help="Archive old resume_history rows in batches")
+    retention_cmd.add_argument("--keep-last", type=int, default=RETENTION_KEEP_LAST,
+                               help="Keep the newest N rows per user and generation type")
+    retention_cmd.add_argument("--max-age-days", type=int, default=RETENTION_MAX_AGE_DAYS,
+                               help="Archive rows older than this many days")
+    retention_cmd.add_argument("--type", action="append", choices=["resume", "cover_letter", "portfolio"],
+                               help="Limit to a generation type (repeatable)")
+    retention_cmd.add_argument("--to", choices=["table", "jsonl"], default="table",
+                               help="Archive into resume_history_archive or JSONL.gz files")
+    retention_cmd.add_argument("--out-dir", default="archive", help="Directory for --to jsonl")
+    retention_cmd.add_argument("--batch-size", type=int, default=RETENTION_BATCH_SIZE)
+    retention_cmd.add_argument("--pause-ms", type=float, default=0, help="Sleep between batches")
+    retention_cmd.add_argument("--dry-run", action="store_true", help="Only count matching rows")
+    retention_cmd.set_defaults(handler=retention)
+
+    args = parser.parse_args()
+    create_all_tables(migrate=getattr(args, "migrate_on_setup", None))
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+migrations — ordered, idempotent schema migrations for existing databases.
+
+create_all_tables() only creates missing tables; anything that changes an
+existing table (new columns, indexes, data moves) is a migration module in this
+package named vNNNN_<description>.py that defines:
+
+    VERSION: int
+    DESCRIPTION: str
+    def upgrade(conn): ...   # conn is a SQLAlchemy Connection inside a transaction
+
+Applied versions are recorded in the schema_migrations table. Migrations run
+on startup (unless AUTO_MIGRATE=false) and via `python manage.py migrate`;
+gunicorn.conf.py runs the latter once in the master before any worker starts.
+Each upgrade must be idempotent (IF NOT EXISTS / inspect first) because a
+fresh database already has the current schema from create_all.
+
+Schema changes happen under schema_lock(): a Postgres advisory lock, or an
+exclusive lock on "<database file>.migrate.lock" for SQLite, so workers that
+start together apply each migration once and in order; the others wait, then
+find nothing pending. A migration that hits "database is locked" (SQLite busy
+with app traffic) is retried with backoff before startup gives up.
+"""
+import importlib
+import logging
+import os
+import pkgutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+try:
+    import fcntl
+except ImportError:     # Windows: no cross-process SQLite lock; single-process dev servers only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+_PG_LOCK_KEY = 0x7265_7375_6D65   # arbitrary, fixed advisory lock id for schema changes
+_LOCK_RETRIES = 6                   # waits 0.5, 1, 2, 4, 8 s between attempts
+_local_lock = threading.RLock()
+_lock_depth = 0
+
+
+@contextmanager
+def schema_lock(engine: Engine):
+    """Hold the cross-process schema lock (re-entrant within a process)."""
+    global _lock_depth
+    with _local_lock:
+        if _lock_depth:
+            _lock_depth += 1
+            try:
+                yield
+            finally:
+                _lock_depth -= 1
+            return
+        with _process_lock(engine):
+            _lock_depth = 1
+            try:
+                yield
+            finally:
+                _lock_depth = 0
+
+
+@contextmanager
+def _process_lock(engine: Engine):
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _PG_LOCK_KEY})
+            conn.commit()
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _PG_LOCK_KEY})
+                conn.commit()
+        return
+    path = engine.url.database if engine.dialect.name == "sqlite" else None
+    if not path or path == ":memory:" or fcntl is None:
+        yield
+        return
+    with open(os.path.abspath(path) + ".migrate.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _is_lock_error(error: OperationalError) -> bool:
+    message = str(error.orig).lower()
+    return "locked" in message or "busy" in message or "deadlock" in message
+
+
+def discover() -> list:
+    """All migration modules in this package, ordered by VERSION."""
+    modules = []
+    for info in pkgutil.iter_modules(__path__):
+        if info.name.startswith("v") and info.name[1:5].isdigit():
+            modules.append(importlib.import_module(f"{__name__}.{info.name}"))
+    modules.sort(key=lambda m: m.VERSION)
+    versions = [m.VERSION for m in modules]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return modules
+
+
+def applied_versions(engine: Engine) -> set:
+    _metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending(engine: Engine) -> list:
+    done = applied_versions(engine)
+    return [m for m in discover() if m.VERSION not in done]
+
+
+def run_migrations(engine: Engine) -> list:
+    """Apply pending migrations in order, each in its own transaction. Returns applied versions."""
+    applied = []
+    with schema_lock(engine):
+        for module in pending(engine):
+            if _apply(engine, module):
+                applied.append(module.VERSION)
+    return applied
+
+
+def _apply(engine: Engine, module) -> bool:
+    logger.info(f"Applying migration {module.VERSION:04d}: {module.DESCRIPTION}")
+    for attempt in range(_LOCK_RETRIES):
+        try:
+            with engine.begin() as conn:
+                module.upgrade(conn)
+                conn.execute(insert(schema_migrations).values(
+                    version=module.VERSION,
+                    description=module.DESCRIPTION,
+                    applied_at=datetime.utcnow(),
+                ))
+            return True
+        except IntegrityError:
+            # Recorded by a process that does not take the schema lock (an older release)
+            logger.info(f"Migration {module.VERSION:04d} already applied by another process")
+            return False
+        except OperationalError as e:
+            if not _is_lock_error(e) or attempt == _LOCK_RETRIES - 1:
+                raise
+            wait = 0.5 * 2 ** attempt
+            logger.warning(f"Migration {module.VERSION:04d}: database busy ({e.orig}); retrying in {wait:.1f}s")
+            time.sleep(wait)
+    return False
@@ -0,0 +1,13 @@
+"""
+Add resume_history.profile_fingerprint (portfolio download reuse).
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 1
+DESCRIPTION = "add resume_history.profile_fingerprint"
+
+
+def upgrade(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("resume_history")}
+    if "profile_fingerprint" not in columns:
+        conn.execute(text("ALTER TABLE resume_history ADD COLUMN profile_fingerprint VARCHAR(64)"))
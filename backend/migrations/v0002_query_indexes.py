@@ -0,0 +1,28 @@
+"""
+Composite indexes shaped like the hot queries.
+
+- ix_resume_history_user_type_created: "latest <type> for this user" lookups
+  (routers/ats.py, routers/portfolio.py) and typed by-id fetches (routers/pdf.py,
+  routers/cover_letter.py) filter on user_id + generation_type and order by created_at.
+- ix_resume_history_user_created: the per-user history list in routers/resume.py
+  (user_id filter, newest first, id as tie-breaker).
+- ix_users_created_at: the admin user listing's default (created_at, id) order.
+"""
+from sqlalchemy import text
+
+VERSION = 2
+DESCRIPTION = "composite indexes for resume_history and users query patterns"
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_resume_history_user_type_created "
+    "ON resume_history (user_id, generation_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_resume_history_user_created "
+    "ON resume_history (user_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_users_created_at "
+    "ON users (created_at, id)",
+)
+
+
+def upgrade(conn):
+    for statement in INDEXES:
+        conn.execute(text(statement))
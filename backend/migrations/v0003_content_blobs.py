@@ -0,0 +1,94 @@
+"""
+Move history bodies into the content-addressed blob store.
+
+Adds resume_history.resume_blob_hash / cover_letter_blob_hash, then walks the
+table in id order, BATCH_SIZE rows at a time, storing each distinct body once
+in content_blobs (zlib-compressed, keyed by SHA-256, with a reference count)
+and clearing the legacy text columns. The hashing and packing rules match
+models/content_blob.py, but are repeated here so the migration does not change
+if the model does.
+
+SQLite does not give the freed pages back to the OS by itself; run
+`python manage.py vacuum` afterwards to shrink the database file.
+"""
+import hashlib
+import zlib
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import (Column, DateTime, Integer, LargeBinary, MetaData, String, Table,
+                        bindparam, inspect, text)
+from sqlalchemy.dialects import postgresql, sqlite
+
+VERSION = 3
+DESCRIPTION = "content-addressed blob store for resume_history bodies"
+
+BATCH_SIZE = 500
+
+_metadata = MetaData()
+content_blobs = Table(
+    "content_blobs", _metadata,
+    Column("hash", String(64), primary_key=True),
+    Column("codec", String(8), nullable=False),
+    Column("data", LargeBinary, nullable=False),
+    Column("size", Integer, nullable=False),
+    Column("ref_count", Integer, nullable=False),
+    Column("created_at", DateTime),
+)
+
+
+def _pack(raw: bytes) -> tuple[str, bytes]:
+    packed = zlib.compress(raw, 6)
+    return ("zlib", packed) if len(packed) < len(raw) else ("raw", raw)
+
+
+def upgrade(conn):
+    content_blobs.create(conn, checkfirst=True)
+    columns = {c["name"] for c in inspect(conn).get_columns("resume_history")}
+    for column in ("resume_blob_hash", "cover_letter_blob_hash"):
+        if column not in columns:
+            conn.execute(text(f"ALTER TABLE resume_history ADD COLUMN {column} VARCHAR(64)"))
+
+    dialect_insert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+    upsert = dialect_insert(content_blobs)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[content_blobs.c.hash],
+        set_={"ref_count": content_blobs.c.ref_count + upsert.excluded.ref_count},
+    )
+    move = text(
+        "UPDATE resume_history SET "
+        "resume_blob_hash = COALESCE(:resume_hash, resume_blob_hash), "
+        "cover_letter_blob_hash = COALESCE(:letter_hash, cover_letter_blob_hash), "
+        "resume_markdown = NULL, cover_letter = NULL WHERE id = :row_id"
+    ).bindparams(bindparam("resume_hash", type_=String), bindparam("letter_hash", type_=String))
+
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, resume_markdown, cover_letter FROM resume_history "
+            "WHERE id > :last_id AND (resume_markdown IS NOT NULL OR cover_letter IS NOT NULL) "
+            "ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BATCH_SIZE}).all()
+        if not rows:
+            break
+
+        refs, bodies, updates = Counter(), {}, []
+        for row_id, resume_md, letter in rows:
+            hashes = []
+            for body in (resume_md, letter):
+                if body is None:
+                    hashes.append(None)
+                    continue
+                raw = body.encode("utf-8")
+                digest = hashlib.sha256(raw).hexdigest()
+                bodies.setdefault(digest, raw)
+                refs[digest] += 1
+                hashes.append(digest)
+            updates.append({"row_id": row_id, "resume_hash": hashes[0], "letter_hash": hashes[1]})
+
+        now = datetime.utcnow()
+        for digest, count in refs.items():
+            codec, data = _pack(bodies[digest])
+            conn.execute(upsert, {"hash": digest, "codec": codec, "data": data,
+                                  "size": len(bodies[digest]), "ref_count": count, "created_at": now})
+        conn.execute(move, updates)
+        last_id = rows[-1][0]
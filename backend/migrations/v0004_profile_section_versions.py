@@ -0,0 +1,16 @@
+"""
+Add profiles.section_versions and profiles.version (per-section change counters
+and the optimistic-locking row version used by PATCH /api/profile).
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 4
+DESCRIPTION = "add profiles.section_versions and profiles.version"
+
+
+def upgrade(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("profiles")}
+    if "section_versions" not in columns:
+        conn.execute(text("ALTER TABLE profiles ADD COLUMN section_versions JSON"))
+    if "version" not in columns:
+        conn.execute(text("ALTER TABLE profiles ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
@@ -0,0 +1,14 @@
+"""
+Add users.portfolio_published — hosted portfolios at /p/{slug} are opt-in, so
+every existing user starts unpublished.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 5
+DESCRIPTION = "add users.portfolio_published"
+
+
+def upgrade(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("users")}
+    if "portfolio_published" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN portfolio_published BOOLEAN NOT NULL DEFAULT FALSE"))
@@ -0,0 +1,48 @@
+"""
+Give resume_history_archive its own primary key.
+
+The table was keyed by the id the row had in resume_history, but SQLite can
+hand out a deleted rowid again, so archiving a later row with a reused id
+failed with an IntegrityError. The table is rebuilt with a surrogate id and
+the original id moved to an indexed history_id column.
+"""
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, MetaData, String, Table, inspect, text
+
+VERSION = 6
+DESCRIPTION = "surrogate primary key for resume_history_archive"
+
+_COPIED = "user_id, generation_type, job_role, company_name, ats_score, created_at, archived_at, payload"
+
+_metadata = MetaData()
+archive_v6 = Table(
+    "resume_history_archive_v6", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("history_id", Integer, nullable=False),
+    Column("user_id", Integer, nullable=False),
+    Column("generation_type", String),
+    Column("job_role", String),
+    Column("company_name", String),
+    Column("ats_score", Integer),
+    Column("created_at", DateTime),
+    Column("archived_at", DateTime, nullable=False),
+    Column("payload", LargeBinary, nullable=False),
+)
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    if not inspector.has_table("resume_history_archive"):
+        return      # created with the current shape by create_all
+    if "history_id" in {c["name"] for c in inspector.get_columns("resume_history_archive")}:
+        return
+
+    archive_v6.create(conn)
+    conn.execute(text(
+        f"INSERT INTO resume_history_archive_v6 (history_id, {_COPIED}) "
+        f"SELECT id, {_COPIED} FROM resume_history_archive ORDER BY id"
+    ))
+    conn.execute(text("DROP TABLE resume_history_archive"))
+    conn.execute(text("ALTER TABLE resume_history_archive_v6 RENAME TO resume_history_archive"))
+    for name, columns in (("ix_resume_history_archive_user_created", "user_id, created_at"),
+                          ("ix_resume_history_archive_history_id", "history_id")):
+        conn.execute(text(f"CREATE INDEX {name} ON resume_history_archive ({columns})"))
@@ -3,6 +3,9 @@ models/__init__.py — makes models importable as a package.
 """
 from .user import User, UserRole
 from .profile import Profile
+from .content_blob import ContentBlob
 from .resume_history import ResumeHistory
+from .daily_stats import DailyStats
+from .history_archive import HistoryArchive
 
-__all__ = ["User", "UserRole", "Profile", "ResumeHistory"]
+__all__ = ["User", "UserRole", "Profile", "ResumeHistory", "DailyStats", "ContentBlob", "HistoryArchive"]
@@ -0,0 +1,53 @@
+"""
+ContentBlob ORM model — content-addressed, compressed storage for generated documents.
+
+Each distinct body (resume markdown, cover letter, portfolio JSON) is stored once,
+keyed by the SHA-256 of its UTF-8 text, and shared by every history row that
+points at it. ref_count is maintained by services/content_store.py; a blob is
+removed when its last reference goes away.
+"""
+import hashlib
+import zlib
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime
+from database import Base
+
+CODEC_ZLIB = "zlib"
+CODEC_RAW = "raw"
+ZLIB_LEVEL = 6
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pack(text: str) -> tuple[str, bytes]:
+    """Compress a body for storage. Returns (codec, data); tiny bodies that do not shrink stay raw."""
+    raw = text.encode("utf-8")
+    packed = zlib.compress(raw, ZLIB_LEVEL)
+    if len(packed) < len(raw):
+        return CODEC_ZLIB, packed
+    return CODEC_RAW, raw
+
+
+def unpack(codec: str, data: bytes) -> str:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    if codec == CODEC_RAW:
+        return bytes(data).decode("utf-8")
+    raise ValueError(f"Unknown content codec: {codec}")
+
+
+class ContentBlob(Base):
+    __tablename__ = "content_blobs"
+
+    hash = Column(String(64), primary_key=True)          # sha256 of the uncompressed text
+    codec = Column(String(8), nullable=False, default=CODEC_ZLIB)
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)               # uncompressed size in bytes
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    @property
+    def text(self) -> str:
+        return unpack(self.codec, self.data)
@@ -0,0 +1,20 @@
+"""
+DailyStats ORM model — per-day rollup of platform activity for the admin dashboard.
+Maintained incrementally by services/stats_rollup.py in the same transaction as
+the user/history writes it counts; rebuildable with `python manage.py rebuild-stats`.
+"""
+from sqlalchemy import Column, Integer, Date
+from database import Base
+
+
+class DailyStats(Base):
+    __tablename__ = "daily_stats"
+
+    day = Column(Date, primary_key=True)
+    resumes = Column(Integer, default=0, nullable=False)
+    cover_letters = Column(Integer, default=0, nullable=False)
+    portfolios = Column(Integer, default=0, nullable=False)
+    ats_score_sum = Column(Integer, default=0, nullable=False)
+    ats_score_count = Column(Integer, default=0, nullable=False)
+    signups = Column(Integer, default=0, nullable=False)
+    user_deletions = Column(Integer, default=0, nullable=False)
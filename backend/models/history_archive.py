@@ -0,0 +1,31 @@
+"""
+HistoryArchive ORM model — resume_history rows moved out by the retention job.
+
+Metadata stays in columns so archived rows can still be listed and counted;
+the document bodies are folded into one zlib-compressed JSON payload per row
+(see services/retention.py), so archived rows hold no content_blobs references.
+history_id is the id the row had in resume_history; it is not the primary key
+because SQLite may reuse a deleted rowid for a later history row.
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, Index
+from database import Base
+
+
+class HistoryArchive(Base):
+    __tablename__ = "resume_history_archive"
+    __table_args__ = (
+        Index("ix_resume_history_archive_user_created", "user_id", "created_at"),
+        Index("ix_resume_history_archive_history_id", "history_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    history_id = Column(Integer, nullable=False)      # id the row had in resume_history
+    user_id = Column(Integer, nullable=False)
+    generation_type = Column(String, nullable=True)
+    job_role = Column(String, nullable=True)
+    company_name = Column(String, nullable=True)
+    ats_score = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    payload = Column(LargeBinary, nullable=False)     # zlib(JSON of the full row incl. bodies)
@@ -1,5 +1,10 @@
 """
 Profile ORM model — stores a user's structured career data as JSON.
+
+section_versions counts changes per section ({"experience": 3, ...}) so clients
+can make conditional item-level edits (PATCH /api/profile). version is the row
+version SQLAlchemy checks on every UPDATE, so two concurrent writers cannot
+both succeed from the same starting state.
 """
 from sqlalchemy import Column, Integer, ForeignKey, JSON, DateTime, Text
 from sqlalchemy.orm import relationship
@@ -22,9 +27,13 @@ class Profile(Base):
     certifications = Column(JSON, default=[])   # list of {name, issuer, year}
     internships = Column(JSON, default=[])      # list of {company, role, duration, description}
     achievements = Column(Text, nullable=True)  # free-text achievements
+    section_versions = Column(JSON, default=dict)  # per-section change counters
+    version = Column(Integer, nullable=False, default=1)
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     user = relationship("User", back_populates="profile")
+
+    __mapper_args__ = {"version_id_col": version}
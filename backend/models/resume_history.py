@@ -1,24 +1,91 @@
 """
 ResumeHistory ORM model — logs every AI-generated resume for a user.
+
+Document bodies (resume_markdown, cover_letter) live in the content_blobs table
+(models/content_blob.py): the row stores only the blob hash, identical bodies
+are stored once, and the properties below decompress on read. Assigning a body
+stages it; services/content_store.py stores it and sets the hash at flush time.
+
+Rows written before the content store keep their text in the legacy columns
+until migration 0003 moves it; reads fall back to those columns transparently.
+
+List queries load only metadata. Endpoints that need a body pass
+RESUME_BODY / COVER_LETTER_BODY to .options() so the blob arrives in the
+same SELECT instead of a lazy load per row.
 """
-from sqlalchemy import Column, Integer, ForeignKey, Text, String, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, Text, String, DateTime, Index
+from sqlalchemy.orm import relationship, deferred, joinedload, undefer
 from datetime import datetime
 from database import Base
+from models.content_blob import ContentBlob
 
 
 class ResumeHistory(Base):
     __tablename__ = "resume_history"
+    __table_args__ = (
+        # Mirrors migrations/v0002_query_indexes.py for freshly created databases
+        Index("ix_resume_history_user_type_created", "user_id", "generation_type", "created_at"),
+        Index("ix_resume_history_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     job_role = Column(String, nullable=True)          # e.g. "Backend Developer"
     company_name = Column(String, nullable=True)      # used for cover letters
-    resume_markdown = Column(Text, nullable=True)     # generated resume (markdown)
-    cover_letter = Column(Text, nullable=True)        # generated cover letter
+    resume_blob_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=True)  # resume markdown / portfolio JSON
+    cover_letter_blob_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=True)
     ats_score = Column(Integer, nullable=True)        # 0–100
     generation_type = Column(String, default="resume")  # resume | cover_letter | portfolio
+    profile_fingerprint = Column(String(64), nullable=True)  # hash of the profile used (portfolio)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Pre-content-store bodies; emptied by migrations/v0003_content_blobs.py
+    legacy_resume_markdown = deferred(Column("resume_markdown", Text, nullable=True))
+    legacy_cover_letter = deferred(Column("cover_letter", Text, nullable=True))
+
     # Relationships
     user = relationship("User", back_populates="resume_history")
+    resume_blob = relationship(ContentBlob, foreign_keys=[resume_blob_hash], viewonly=True)
+    cover_letter_blob = relationship(ContentBlob, foreign_keys=[cover_letter_blob_hash], viewonly=True)
+
+    # ── Document bodies ──────────────────────────────────────────────────────
+    @property
+    def pending_bodies(self) -> dict:
+        """Bodies assigned since the last flush, keyed by "resume" / "cover_letter"."""
+        return self.__dict__.setdefault("_pending_bodies", {})
+
+    def _read_body(self, kind: str, blob_attr: str, legacy_attr: str):
+        if kind in self.pending_bodies:
+            return self.pending_bodies[kind]
+        cache = self.__dict__.setdefault("_body_cache", {})
+        blob = getattr(self, blob_attr)
+        if blob is None:
+            return getattr(self, legacy_attr)
+        if cache.get(kind, (None,))[0] != blob.hash:
+            cache[kind] = (blob.hash, blob.text)
+        return cache[kind][1]
+
+    @property
+    def resume_markdown(self):
+        return self._read_body("resume", "resume_blob", "legacy_resume_markdown")
+
+    @resume_markdown.setter
+    def resume_markdown(self, value):
+        self.pending_bodies["resume"] = value
+        self.resume_blob_hash  # load the current hash so the flush hook can release it
+        self.resume_blob_hash = None   # marks the row dirty; the flush hook sets the real hash
+
+    @property
+    def cover_letter(self):
+        return self._read_body("cover_letter", "cover_letter_blob", "legacy_cover_letter")
+
+    @cover_letter.setter
+    def cover_letter(self, value):
+        self.pending_bodies["cover_letter"] = value
+        self.cover_letter_blob_hash
+        self.cover_letter_blob_hash = None
+
+
+# Loader options for endpoints that read a body
+RESUME_BODY = (joinedload(ResumeHistory.resume_blob), undefer(ResumeHistory.legacy_resume_markdown))
+COVER_LETTER_BODY = (joinedload(ResumeHistory.cover_letter_blob), undefer(ResumeHistory.legacy_cover_letter))
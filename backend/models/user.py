@@ -1,7 +1,10 @@
 """
 User ORM model — stores credentials, role, and metadata.
+
+portfolio_published is the user's opt-in to serve their latest portfolio
+publicly at /p/{slug}; it is off until they publish.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SAEnum, Index, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -15,12 +18,16 @@ class UserRole(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     full_name = Column(String, nullable=True)
     hashed_password = Column(String, nullable=False)
     role = Column(SAEnum(UserRole), default=UserRole.user, nullable=False)
+    portfolio_published = Column(Boolean, default=False, server_default=false(), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
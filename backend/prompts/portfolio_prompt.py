@@ -1,13 +1,70 @@
 """
 Portfolio Content Prompt — generates structured portfolio content sections.
 Uses labeled sections parseable by ai_service._parse_portfolio_sections().
+
+Each section also has a fingerprint over just the profile fields it depends on,
+so a stored portfolio can be partially regenerated: only sections whose
+fingerprint changed are requested again, via a prompt containing only them.
 """
+import hashlib
+import json
+
+GLOBAL_SECTIONS = ("about_me", "professional_bio", "linkedin_summary", "github_highlights")
+MAX_PROJECT_SECTIONS = 4
+
+# Section key -> (label, instructions). Project sections are added per project.
+_SECTION_SPECS = {
+    "about_me": ("[ABOUT_ME]", 'Write a 150-200 word "About Me" section in first person. Engaging, professional, mentions top skills, passion for technology, and career goals. Suitable for a portfolio hero section.'),
+    "professional_bio": ("[BIO]", 'Write a 80-100 word professional third-person bio. Like what you\'d find on a conference speaker page or LinkedIn "About". Start with the name.'),
+    "linkedin_summary": ("[LINKEDIN]", 'Write a 200-250 word LinkedIn "About" section in first person. Keyword-rich for recruiters. Include: role, top skills, achievements, and a call to connect.'),
+    "github_highlights": ("[GITHUB]", "Write a 100-120 word GitHub profile README introduction. Engaging and technical. Mention primary languages/frameworks, what you build, and where to find the best projects."),
+}
 
 
-def build_portfolio_prompt(profile: dict) -> str:
+def project_names(profile: dict) -> list:
+    """Names of the projects that get their own [PROJECT:name] section."""
+    projects = profile.get("projects", [])
+    return [p.get("name", f"Project {i+1}") for i, p in enumerate(projects[:MAX_PROJECT_SECTIONS])]
+
+
+def section_fingerprints(profile: dict) -> dict:
+    """
+    Map each portfolio section key to a hash of the profile inputs it depends on.
+
+    The profile-wide sections depend on personal details, skills, experience and
+    the project *list* (names and stacks), but not on project descriptions, so
+    editing one project only dirties that project's section.
+    """
+    personal = profile.get("personal_info", {})
+    projects = profile.get("projects", [])
+    shared = {
+        "name": personal.get("name", ""),
+        "summary": personal.get("summary", ""),
+        "github": personal.get("github", ""),
+        "linkedin": personal.get("linkedin", ""),
+        "skills": profile.get("skills", [])[:20],
+        "experience": profile.get("experience", [])[:3],
+        "projects": [(p.get("name", ""), p.get("tech_stack", "")) for p in projects[:6]],
+    }
+    fingerprints = {key: _digest({"section": key, **shared}) for key in GLOBAL_SECTIONS}
+    for name, project in zip(project_names(profile), projects):
+        fingerprints[f"project:{name}"] = _digest({"owner": shared["name"], "project": project})
+    return fingerprints
+
+
+def _digest(inputs: dict) -> str:
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def build_portfolio_prompt(profile: dict, sections=None) -> str:
     """
     Build the Gemini prompt for portfolio content generation.
     Returns content with labeled sections: [ABOUT_ME], [BIO], [LINKEDIN], [PROJECT:name], [GITHUB]
+
+    Args:
+        sections: optional collection of section keys (see section_fingerprints)
+                  to request; None asks for every section.
     """
     personal = profile.get("personal_info", {})
     name = personal.get("name", "Developer")
@@ -18,19 +75,29 @@ def build_portfolio_prompt(profile: dict) -> str:
     skills = profile.get("skills", [])
     projects = profile.get("projects", [])
     experience = profile.get("experience", [])
-    certifications = profile.get("certifications", [])
 
     skills_str = ", ".join(skills[:20]) if skills else "Various technologies"
 
-    projects_str = ""
-    for p in projects[:6]:
-        projects_str += f"\n- {p.get('name', '')}: Tech: {p.get('tech_stack', '')} | Description: {p.get('description', '')} | Link: {p.get('link', '')}"
-
-    exp_str = ""
-    for e in experience[:3]:
-        exp_str += f"\n- {e.get('role', '')} at {e.get('company', '')} ({e.get('duration', '')}): {e.get('description', '')}"
-
-    project_names = [p.get("name", f"Project {i+1}") for i, p in enumerate(projects[:4])]
+    projects_str = "".join(
+        f"\n- {p.get('name', '')}: Tech: {p.get('tech_stack', '')} | Description: {p.get('description', '')} | Link: {p.get('link', '')}"
+        for p in projects[:6]
+    )
+    exp_str = "".join(
+        f"\n- {e.get('role', '')} at {e.get('company', '')} ({e.get('duration', '')}): {e.get('description', '')}"
+        for e in experience[:3]
+    )
+
+    wanted = None if sections is None else set(sections)
+    blocks = []
+    for key in GLOBAL_SECTIONS[:3]:
+        if wanted is None or key in wanted:
+            blocks.append("{}\n{}".format(*_SECTION_SPECS[key]))
+    names = [n for n in project_names(profile) if wanted is None or f"project:{n}" in wanted]
+    if names:
+        blocks.append(_project_sections(names))
+    if wanted is None or "github_highlights" in wanted:
+        blocks.append("{}\n{}".format(*_SECTION_SPECS["github_highlights"]))
+    sections_str = "\n\n".join(blocks)
 
     return f"""You are a professional portfolio content writer for software developers.
 
@@ -45,19 +112,7 @@ Projects: {projects_str}
 
 Generate content in the EXACT format below (keep the labels exactly as shown):
 
-[ABOUT_ME]
-Write a 150-200 word "About Me" section in first person. Engaging, professional, mentions top skills, passion for technology, and career goals. Suitable for a portfolio hero section.
-
-[BIO]
-Write a 80-100 word professional third-person bio. Like what you'd find on a conference speaker page or LinkedIn "About". Start with the name.
-
-[LINKEDIN]
-Write a 200-250 word LinkedIn "About" section in first person. Keyword-rich for recruiters. Include: role, top skills, achievements, and a call to connect.
-
-{_project_sections(project_names)}
-
-[GITHUB]
-Write a 100-120 word GitHub profile README introduction. Engaging and technical. Mention primary languages/frameworks, what you build, and where to find the best projects.
+{sections_str}
 
 Keep all content fresh, specific, and impressive. Avoid generic clichés."""
 
@@ -1,21 +1,40 @@
 """
 Admin Router — admin-only endpoints for user management and platform analytics.
 Endpoints:
-  GET /api/admin/users      — list all registered users
+  GET /api/admin/users      — list registered users (keyset-paginated, filterable)
   GET /api/admin/stats      — platform-wide statistics
+  GET /api/admin/stats/daily — per-day activity time series
+  GET /api/admin/db/pool    — database connection pool metrics (this worker)
+  GET /api/admin/auth/cache — authenticated-user cache hit rate and auth latency (this worker)
+  GET /api/admin/auth/hasher — bcrypt process pool load, queue depth and rejections (this worker)
+  GET /api/admin/rate-limits — LLM rate limiter decisions by scope (this worker)
+  GET /api/admin/profiles   — sampled request profiles, newest first
+  GET /api/admin/profiles/{id}?format=speedscope|collapsed — one profile's flame graph data
+  PUT /api/admin/users/{id}/role — change a user's role
   DELETE /api/admin/users/{id} — delete a user
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy import delete, func, select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, date
 from pydantic import BaseModel
-from database import get_db
+from database import get_db, get_pool_metrics
 from models.user import User, UserRole
 from models.profile import Profile
 from models.resume_history import ResumeHistory
-from services.auth_service import get_admin_user
+from models.history_archive import HistoryArchive
+from services.auth_service import Principal, get_admin_user, principal_cache
+from services.password_hasher import password_hasher
+from services.rate_limiter import rate_limiter
+from services import profiler
+from services.portfolio_page_cache import page_cache
+from services.profile_repository import profile_cache
+from services import stats_rollup
+from services.pagination import encode_cursor, decode_cursor, keyset_after, ilike_contains, NEXT_CURSOR_HEADER
+from services.content_store import delete_history
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -42,108 +61,338 @@ class PlatformStats(BaseModel):
     new_users_today: int
 
 
+class DailyStatsPoint(BaseModel):
+    day: date
+    resumes: int
+    cover_letters: int
+    portfolios: int
+    signups: int
+    avg_ats_score: float | None
+
+
+class PoolStats(BaseModel):
+    backend: str
+    pool_size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    checkins: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    wait_ms_total: float
+    wait_ms_avg: float
+    wait_ms_max: float
+
+
+class AuthCacheStats(BaseModel):
+    enabled: bool
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    hit_ms_avg: float
+    hit_ms_max: float
+    miss_ms_avg: float
+    miss_ms_max: float
+
+
+class PasswordHasherStats(BaseModel):
+    mode: str
+    workers: int
+    bcrypt_rounds: int
+    in_flight: int
+    queue_depth: int
+    max_pending: int
+    completed: int
+    rejected: int
+    rehashed: int
+    ms_avg: float
+    ms_max: float
+
+
+class RateLimitStats(BaseModel):
+    enabled: bool
+    backend: str
+    allowed: int
+    rejected_user: int
+    rejected_ip: int
+    rejected_global: int
+    errors: int
+    check_us_avg: float
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    created_at: datetime
+    method: str
+    path: str
+    route: str
+    status: int
+    duration_ms: float
+    samples: int
+    interval_ms: float
+    reason: str
+    pid: int
+    scope: str = "process"             # samples cover every thread of the worker
+    max_concurrent_requests: int = 1   # >1: other requests' stacks are mixed in
+
+
+class RoleUpdate(BaseModel):
+    role: UserRole
+
+
 @router.get("/users", response_model=List[UserAdminView])
-def list_all_users(
-    admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+async def list_all_users(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    sort: str = Query("created_at", pattern="^(created_at|email|resume_count)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    role: Optional[UserRole] = None,
+    has_profile: Optional[bool] = None,
+    search: Optional[str] = Query(None, max_length=100, description="Substring of email or name"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    admin: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Admin: List all registered users with profile and activity stats.
+    Admin: List registered users with profile and activity stats.
     Requires admin role.
+
+    One query per page: the page of user ids is selected first (keyset on
+    (sort key, id), no OFFSET), then profiles are outer-joined and history is
+    counted with a single GROUP BY restricted to those ids. The next page's
+    cursor is returned in the X-Next-Cursor header (absent on the last page).
+
+    sort=resume_count is the exception: ordering by activity needs every user's
+    count, so each page aggregates all of resume_history (a scan of the covering
+    ix_resume_history_user_type_created index) and its cost grows with the
+    table. benchmarks/bench_admin_users.py measures it; a maintained counter
+    column is the next step if it becomes the slow page.
     """
-    users = db.query(User).order_by(User.created_at.desc()).all()
-    result = []
-
-    for user in users:
-        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-        resume_count = (
-            db.query(ResumeHistory)
-            .filter(ResumeHistory.user_id == user.id)
-            .count()
-        )
-        result.append(UserAdminView(
+    history_counts = (
+        select(ResumeHistory.user_id, func.count(ResumeHistory.id).label("n"))
+        .group_by(ResumeHistory.user_id)
+    )
+    descending = order == "desc"
+
+    if sort == "resume_count":
+        # Ordering by activity needs every user's count up front
+        counts = history_counts.subquery("counts")
+        sort_col = func.coalesce(counts.c.n, 0)
+        page_query = select(User.id, sort_col.label("sort_key")).outerjoin(counts, counts.c.user_id == User.id)
+    else:
+        sort_col = User.created_at if sort == "created_at" else User.email
+        page_query = select(User.id, sort_col.label("sort_key"))
+
+    page_query = page_query.outerjoin(Profile, Profile.user_id == User.id)
+    if role is not None:
+        page_query = page_query.where(User.role == role)
+    if has_profile is not None:
+        page_query = page_query.where(Profile.id.isnot(None) if has_profile else Profile.id.is_(None))
+    if search:
+        page_query = page_query.where(or_(ilike_contains(User.email, search), ilike_contains(User.full_name, search)))
+    if created_after:
+        page_query = page_query.where(User.created_at >= created_after)
+    if created_before:
+        page_query = page_query.where(User.created_at < created_before)
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, 2)
+        page_query = page_query.where(keyset_after(sort_col, User.id, sort_value, last_id, descending))
+    direction = (lambda col: col.desc()) if descending else (lambda col: col.asc())
+    page = page_query.order_by(direction(sort_col), direction(User.id)).limit(limit + 1).cte("page")
+
+    if sort != "resume_count":
+        counts = history_counts.where(ResumeHistory.user_id.in_(select(page.c.id))).subquery("counts")
+
+    rows = (await db.execute(
+        select(User, Profile.id.isnot(None), func.coalesce(counts.c.n, 0), page.c.sort_key)
+        .select_from(page)
+        .join(User, User.id == page.c.id)
+        .outerjoin(Profile, Profile.user_id == User.id)
+        .outerjoin(counts, counts.c.user_id == User.id)
+        .order_by(direction(page.c.sort_key), direction(User.id))
+    )).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_user, _, _, last_key = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_key, last_user.id)
+
+    return [
+        UserAdminView(
             id=user.id,
             email=user.email,
             full_name=user.full_name,
             role=user.role,
             created_at=user.created_at,
-            has_profile=profile is not None,
-            resume_count=resume_count
-        ))
-
-    return result
+            has_profile=bool(user_has_profile),
+            resume_count=count
+        )
+        for user, user_has_profile, count, _ in rows
+    ]
 
 
 @router.get("/stats", response_model=PlatformStats)
-def get_platform_stats(
-    admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+async def get_platform_stats(
+    admin: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Admin: Get platform-wide analytics and statistics.
+    Reads the daily_stats rollup, so cost grows with days, not rows.
     """
-    today = datetime.utcnow().date()
-
-    total_users = db.query(User).count()
+    sums = await db.run_sync(stats_rollup.totals)
+    today = await db.run_sync(stats_rollup.today_stats)
+    avg_ats = round(sums["ats_score_sum"] / sums["ats_score_count"], 1) if sums["ats_score_count"] else 0.0
 
-    total_resumes = (
-        db.query(ResumeHistory)
-        .filter(ResumeHistory.generation_type == "resume")
-        .count()
-    )
-    total_cover_letters = (
-        db.query(ResumeHistory)
-        .filter(ResumeHistory.generation_type == "cover_letter")
-        .count()
-    )
-    total_portfolios = (
-        db.query(ResumeHistory)
-        .filter(ResumeHistory.generation_type == "portfolio")
-        .count()
+    return PlatformStats(
+        total_users=sums["signups"] - sums["user_deletions"],
+        total_resumes_generated=sums["resumes"],
+        total_cover_letters_generated=sums["cover_letters"],
+        total_portfolios_generated=sums["portfolios"],
+        avg_ats_score=avg_ats,
+        new_users_today=today.signups if today else 0
     )
 
-    avg_ats_result = (
-        db.query(func.avg(ResumeHistory.ats_score))
-        .filter(ResumeHistory.ats_score.isnot(None))
-        .scalar()
-    )
-    avg_ats = round(float(avg_ats_result), 1) if avg_ats_result else 0.0
 
-    new_today = (
-        db.query(User)
-        .filter(func.date(User.created_at) == today)
-        .count()
-    )
+@router.get("/stats/daily", response_model=List[DailyStatsPoint])
+async def get_daily_stats(
+    days: int = Query(30, ge=1, le=366),
+    admin: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Admin: Per-day activity for the last `days` days (days without activity are omitted)."""
+    return [
+        DailyStatsPoint(
+            day=row.day,
+            resumes=row.resumes,
+            cover_letters=row.cover_letters,
+            portfolios=row.portfolios,
+            signups=row.signups,
+            avg_ats_score=round(row.ats_score_sum / row.ats_score_count, 1) if row.ats_score_count > 0 else None
+        )
+        for row in await db.run_sync(stats_rollup.daily_series, days)
+    ]
 
-    return PlatformStats(
-        total_users=total_users,
-        total_resumes_generated=total_resumes,
-        total_cover_letters_generated=total_cover_letters,
-        total_portfolios_generated=total_portfolios,
-        avg_ats_score=avg_ats,
-        new_users_today=new_today
+
+@router.get("/db/pool", response_model=PoolStats)
+async def get_db_pool_stats(admin: Principal = Depends(get_admin_user)):
+    """Admin: Connection pool occupancy, checkout wait times and connection counts for this worker."""
+    return PoolStats(**get_pool_metrics())
+
+
+@router.get("/auth/cache", response_model=AuthCacheStats)
+async def get_auth_cache_stats(admin: Principal = Depends(get_admin_user)):
+    """Admin: Principal cache hit rate and get_current_user latency for this worker."""
+    return AuthCacheStats(**principal_cache.stats())
+
+
+@router.get("/auth/hasher", response_model=PasswordHasherStats)
+async def get_password_hasher_stats(admin: Principal = Depends(get_admin_user)):
+    """Admin: bcrypt worker pool occupancy, queue depth, overload rejections and hash latency."""
+    return PasswordHasherStats(**password_hasher.stats())
+
+
+@router.get("/rate-limits", response_model=RateLimitStats)
+async def get_rate_limit_stats(admin: Principal = Depends(get_admin_user)):
+    """Admin: Requests allowed and rejected (by user, IP or global budget) on the LLM routes."""
+    return RateLimitStats(**rate_limiter.stats())
+
+
+@router.get("/profiles", response_model=List[ProfileInfo])
+async def list_request_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    route: Optional[str] = Query(None, description="Only profiles of this route template"),
+    admin: Principal = Depends(get_admin_user),
+):
+    """Admin: Stored request profiles (sampled or requested with X-Profile: 1), newest first."""
+    profiles = await run_in_threadpool(profiler.list_profiles)
+    if route:
+        profiles = [p for p in profiles if p.get("route") == route]
+    return profiles[:limit]
+
+
+@router.get("/profiles/{profile_id}")
+async def get_request_profile(
+    profile_id: str,
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    admin: Principal = Depends(get_admin_user),
+):
+    """
+    Admin: Download one profile — speedscope JSON (open at https://www.speedscope.app)
+    or folded stacks for flamegraph.pl.
+    """
+    path = profiler.profile_path(profile_id, format)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"{profile_id}.collapsed")
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.speedscope.json")
+
+
+@router.put("/users/{user_id}/role", response_model=UserAdminView)
+async def update_user_role(
+    user_id: int,
+    req: RoleUpdate,
+    admin: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Admin: Promote or demote a user. Cannot change your own role.
+    Takes effect on the user's next request (their cached principal is dropped),
+    unless AUTH_TRUST_ROLE_CLAIM is set, in which case it applies from their next login.
+    """
+    if user_id == admin.id:
+        raise HTTPException(status_code=400, detail="Cannot change your own role")
+
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user.role = req.role
+    await db.commit()
+    principal_cache.invalidate(user_id)
+
+    has_profile = await db.scalar(select(Profile.id).where(Profile.user_id == user_id).limit(1)) is not None
+    resume_count = await db.scalar(select(func.count(ResumeHistory.id)).where(ResumeHistory.user_id == user_id))
+    return UserAdminView(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role,
+        created_at=user.created_at,
+        has_profile=has_profile,
+        resume_count=resume_count,
     )
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: int,
-    admin: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    admin: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Admin: Delete a user account and all associated data.
+    Admin: Delete a user account and all associated data, archived history included.
     Cannot delete yourself.
     """
     if user_id == admin.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own admin account")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Cascade delete associated data
-    db.query(ResumeHistory).filter(ResumeHistory.user_id == user_id).delete()
-    db.query(Profile).filter(Profile.user_id == user_id).delete()
-    db.delete(user)
-    db.commit()
+    await db.run_sync(delete_history, ResumeHistory.user_id == user_id)
+    await db.execute(delete(HistoryArchive).where(HistoryArchive.user_id == user_id))
+    await db.execute(delete(Profile).where(Profile.user_id == user_id))
+    await db.delete(user)
+    await db.commit()
+    page_cache.invalidate_user(user_id)
+    profile_cache.invalidate(user_id)
+    principal_cache.invalidate(user_id)
@@ -5,25 +5,27 @@ Endpoints:
   POST /api/auth/login
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from models.user import User, UserRole
 from schemas.auth import RegisterRequest, LoginRequest, TokenResponse, UserPublic
-from services.auth_service import hash_password, verify_password, create_access_token, get_current_user
+from services.auth_service import Principal, create_access_token, get_current_user
+from services.password_hasher import password_hasher
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
-def register(req: RegisterRequest, db: Session = Depends(get_db)):
+async def register(req: RegisterRequest, db: AsyncSession = Depends(get_db)):
     """
     Register a new user account.
     - Validates email uniqueness
-    - Hashes the password with bcrypt
+    - Hashes the password with bcrypt (in the password-hashing process pool)
     - Returns the created user (without password)
     """
     # Check if email already registered
-    existing = db.query(User).filter(User.email == req.email).first()
+    existing = await db.scalar(select(User).where(User.email == req.email))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,29 +42,35 @@ def register(req: RegisterRequest, db: Session = Depends(get_db)):
     user = User(
         email=req.email,
         full_name=req.full_name,
-        hashed_password=hash_password(req.password),
+        hashed_password=await password_hasher.hash(req.password),  # bcrypt is CPU-bound
         role=req.role,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(req: LoginRequest, db: Session = Depends(get_db)):
+async def login(req: LoginRequest, db: AsyncSession = Depends(get_db)):
     """
     Authenticate a user and return a JWT access token.
-    - Verifies email and password
+    - Verifies email and password (upgrading the stored hash if BCRYPT_ROUNDS was raised)
     - Returns token + role + user metadata
     """
-    user = db.query(User).filter(User.email == req.email).first()
-    if not user or not verify_password(req.password, user.hashed_password):
+    user = await db.scalar(select(User).where(User.email == req.email))
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await password_hasher.verify(req.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
 
     token = create_access_token(data={"sub": str(user.id), "role": user.role.value})
 
@@ -76,7 +84,7 @@ def login(req: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserPublic)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: Principal = Depends(get_current_user)):
     """
     Return the currently authenticated user's public profile.
     Protected — requires Bearer token.
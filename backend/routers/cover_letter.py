@@ -4,23 +4,26 @@ Endpoints:
   POST /api/cover-letter/generate   — generate cover letter
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
-from models.user import User
-from models.profile import Profile
-from models.resume_history import ResumeHistory
+from models.resume_history import ResumeHistory, COVER_LETTER_BODY
 from schemas.resume import CoverLetterRequest, CoverLetterResponse
-from services.auth_service import get_current_user
+from services.auth_service import Principal, get_current_user
+from services.rate_limiter import limit_llm_requests
 from services.ai_service import generate_cover_letter
+from services.history_writer import history_writer
+from services.profile_repository import require_snapshot
 
 router = APIRouter(prefix="/api/cover-letter", tags=["Cover Letter"])
 
 
-@router.post("/generate", response_model=CoverLetterResponse)
-def generate_cover_letter_endpoint(
+@router.post("/generate", response_model=CoverLetterResponse, dependencies=[Depends(limit_llm_requests)])
+async def generate_cover_letter_endpoint(
     req: CoverLetterRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Generate a tailored cover letter for a specific company and job role.
@@ -28,24 +31,13 @@ def generate_cover_letter_endpoint(
     - Calls Gemini API with the cover letter prompt
     - Saves to history
     """
-    # Fetch profile
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found. Please complete your profile first."
-        )
-
-    profile_dict = {
-        "personal_info": profile.personal_info or {},
-        "skills": profile.skills or [],
-        "experience": profile.experience or [],
-        "projects": profile.projects or [],
-    }
+    # Fetch profile (cached snapshot)
+    snapshot = await require_snapshot(db, current_user.id)
 
     try:
-        letter = generate_cover_letter(
-            profile=profile_dict,
+        letter = await run_in_threadpool(
+            generate_cover_letter,
+            profile=snapshot.to_dict(),
             company_name=req.company_name,
             job_role=req.job_role,
             job_description=req.job_description,
@@ -63,31 +55,30 @@ def generate_cover_letter_endpoint(
         job_role=req.job_role,
         company_name=req.company_name,
         cover_letter=letter,
-        generation_type="cover_letter"
+        generation_type="cover_letter",
+        profile_fingerprint=snapshot.fingerprint
     )
-    db.add(history_entry)
-    db.commit()
-    db.refresh(history_entry)
+    history_id = await history_writer.submit(history_entry)
 
     return CoverLetterResponse(
         cover_letter=letter,
         company_name=req.company_name,
-        history_id=history_entry.id
+        history_id=history_id
     )
 
 
 @router.get("/history/{history_id}", response_model=CoverLetterResponse)
-def get_cover_letter_history(
+async def get_cover_letter_history(
     history_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Retrieve a previously generated cover letter by history ID."""
-    item = db.query(ResumeHistory).filter(
+    item = await db.scalar(select(ResumeHistory).options(*COVER_LETTER_BODY).where(
         ResumeHistory.id == history_id,
         ResumeHistory.user_id == current_user.id,
         ResumeHistory.generation_type == "cover_letter"
-    ).first()
+    ))
 
     if not item:
         raise HTTPException(status_code=404, detail="Cover letter not found.")
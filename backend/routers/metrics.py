@@ -0,0 +1,31 @@
+"""
+Metrics Router — Prometheus scrape endpoint.
+Endpoints:
+  GET /metrics   — all instruments in the text exposition format
+
+Open by default so a scraper on the private network needs no credentials; set
+METRICS_TOKEN to require a bearer token. Under gunicorn with
+PROMETHEUS_MULTIPROC_DIR set, any worker returns the totals of all workers.
+"""
+import hmac
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
+from config import METRICS_TOKEN
+from services.metrics import render_latest
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Prometheus exposition of the HTTP, Gemini, render, database pool and queue metrics."""
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied.encode(), METRICS_TOKEN.encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
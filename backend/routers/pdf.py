@@ -4,16 +4,18 @@ Endpoints:
   POST /api/pdf/download          — download PDF from provided markdown
   GET  /api/pdf/history/{id}      — download PDF from a history item
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import Optional
 from io import BytesIO
 from database import get_db
-from models.user import User
-from models.resume_history import ResumeHistory
-from services.auth_service import get_current_user
-from services.pdf_service import markdown_to_pdf
+from models.resume_history import ResumeHistory, RESUME_BODY
+from services.auth_service import Principal, get_current_user
+from services.pdf_service import markdown_to_pdf, markdown_to_pdf_fit
 
 router = APIRouter(prefix="/api/pdf", tags=["PDF Export"])
 
@@ -21,19 +23,28 @@ router = APIRouter(prefix="/api/pdf", tags=["PDF Export"])
 class PDFRequest(BaseModel):
     markdown_text: str
     filename: str = "resume"
+    fit_pages: Optional[int] = Field(None, ge=1, le=5)  # shrink layout to fit N pages
+
+
+def _render_pdf(markdown_text: str, fit_pages: Optional[int]) -> bytes:
+    """Render markdown with the default layout, or fit it to `fit_pages` pages."""
+    if fit_pages:
+        return markdown_to_pdf_fit(markdown_text, max_pages=fit_pages)
+    return markdown_to_pdf(markdown_text)
 
 
 @router.post("/download")
 def download_pdf_from_markdown(
     req: PDFRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Convert provided Markdown text to PDF and return as a file download.
     The markdown can be any resume content — directly from the generate endpoint.
+    Set fit_pages to shrink font size and spacing until the PDF fits that many pages.
     """
     try:
-        pdf_bytes = markdown_to_pdf(req.markdown_text)
+        pdf_bytes = _render_pdf(req.markdown_text, req.fit_pages)
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -49,19 +60,21 @@ def download_pdf_from_markdown(
 
 
 @router.get("/history/{history_id}")
-def download_pdf_from_history(
+async def download_pdf_from_history(
     history_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fit_pages: Optional[int] = Query(None, ge=1, le=5),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Download a PDF for a previously generated resume from history.
+    Pass ?fit_pages=1 for a one-page layout.
     """
-    item = db.query(ResumeHistory).filter(
+    item = await db.scalar(select(ResumeHistory).options(*RESUME_BODY).where(
         ResumeHistory.id == history_id,
         ResumeHistory.user_id == current_user.id,
         ResumeHistory.generation_type == "resume"
-    ).first()
+    ))
 
     if not item:
         raise HTTPException(status_code=404, detail="Resume history item not found")
@@ -70,7 +83,7 @@ def download_pdf_from_history(
         raise HTTPException(status_code=400, detail="No resume content to convert to PDF")
 
     try:
-        pdf_bytes = markdown_to_pdf(item.resume_markdown)
+        pdf_bytes = await run_in_threadpool(_render_pdf, item.resume_markdown, fit_pages)
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
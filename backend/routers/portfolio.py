@@ -2,63 +2,110 @@
 Portfolio Router — generates portfolio website content and downloadable HTML site.
 Endpoints:
   POST /api/portfolio/generate      — generate portfolio content (JSON)
-  POST /api/portfolio/download      — generate + download as full HTML website
+  POST /api/portfolio/download      — download as full HTML website (reuses content
+                                      generated from the same profile unless ?fresh=true)
   GET  /api/portfolio/download/{id} — re-download HTML from a saved history entry
+  GET/PUT/DELETE /api/portfolio/publish — show, enable or disable public hosting
+Once published, the latest portfolio is served at /p/{slug} (routers/public_portfolio.py).
+Both download routes accept ?format=bundle for a ZIP static site (minified HTML,
+content-hashed shared CSS, precompressed .gz/.br files).
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
+from models.resume_history import ResumeHistory, RESUME_BODY
 from models.user import User
-from models.profile import Profile
-from models.resume_history import ResumeHistory
-from schemas.resume import PortfolioResponse
-from services.auth_service import get_current_user
+from schemas.resume import PortfolioResponse, PortfolioPublishResponse
+from services.auth_service import Principal, get_current_user
+from services.rate_limiter import limit_llm_requests, rate_limiter, client_ip
 from services.ai_service import generate_portfolio
+from services.history_writer import history_writer
 from services.portfolio_html_service import generate_portfolio_html
+from services.portfolio_bundle_service import build_portfolio_bundle
+from services.profile_repository import require_snapshot
+from services.portfolio_page_cache import page_cache, portfolio_slug
 import json
 
 router = APIRouter(prefix="/api/portfolio", tags=["Portfolio"])
 
 
-def _get_profile(user_id: int, db: Session):
-    """Fetch profile ORM object, raise 404 if missing."""
-    profile = db.query(Profile).filter(Profile.user_id == user_id).first()
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found. Please complete your profile first."
+def _portfolio_file_response(portfolio_data: dict, pd: dict, fmt: str) -> Response:
+    """Build the download response: a single HTML file or a static-site ZIP bundle."""
+    name = pd.get("personal_info", {}).get("name", "portfolio")
+    safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_').lower()
+
+    if fmt == "bundle":
+        return Response(
+            content=build_portfolio_bundle(portfolio_data, pd),
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{safe_name}_portfolio.zip"'}
+        )
+
+    return Response(
+        content=generate_portfolio_html(portfolio_data, pd),
+        media_type="text/html",
+        headers={"Content-Disposition": f'attachment; filename="{safe_name}_portfolio.html"'}
+    )
+
+
+def _load_portfolio_data(item: ResumeHistory) -> dict | None:
+    """Decode the portfolio JSON stored on a history row (None if unreadable)."""
+    try:
+        return json.loads(item.resume_markdown or "")
+    except json.JSONDecodeError:
+        return None
+
+
+async def _latest_portfolio_data(user_id: int, db: AsyncSession) -> dict | None:
+    """Content of the user's most recent portfolio, used to regenerate only changed sections."""
+    item = await db.scalar(
+        select(ResumeHistory)
+        .options(*RESUME_BODY)
+        .where(
+            ResumeHistory.user_id == user_id,
+            ResumeHistory.generation_type == "portfolio"
         )
-    return profile
-
-
-def _profile_dict(profile: Profile) -> dict:
-    return {
-        "personal_info": profile.personal_info or {},
-        "education": profile.education or [],
-        "experience": profile.experience or [],
-        "skills": profile.skills or [],
-        "projects": profile.projects or [],
-        "certifications": profile.certifications or [],
-        "internships": profile.internships or [],
-        "achievements": profile.achievements or "",
-    }
-
-
-@router.post("/generate", response_model=PortfolioResponse)
-def generate_portfolio_endpoint(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+        .order_by(ResumeHistory.created_at.desc())
+        .limit(1)
+    )
+    return _load_portfolio_data(item) if item else None
+
+
+async def _latest_matching_portfolio(user_id: int, fingerprint: str, db: AsyncSession):
+    """Most recent portfolio history row generated from a profile with this fingerprint."""
+    return await db.scalar(
+        select(ResumeHistory)
+        .options(*RESUME_BODY)
+        .where(
+            ResumeHistory.user_id == user_id,
+            ResumeHistory.generation_type == "portfolio",
+            ResumeHistory.profile_fingerprint == fingerprint
+        )
+        .order_by(ResumeHistory.created_at.desc())
+        .limit(1)
+    )
+
+
+@router.post("/generate", response_model=PortfolioResponse, dependencies=[Depends(limit_llm_requests)])
+async def generate_portfolio_endpoint(
+    fresh: bool = Query(False, description="Regenerate every section, ignoring stored content"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Generate complete portfolio content from the user's profile (JSON response).
     Returns: About Me, bio, LinkedIn summary, project descriptions, GitHub highlights.
+    Only sections whose inputs changed since the last portfolio are regenerated.
     """
-    profile = _get_profile(current_user.id, db)
-    pd = _profile_dict(profile)
+    snapshot = await require_snapshot(db, current_user.id)
+    pd = snapshot.to_dict()
+    previous = None if fresh else await _latest_portfolio_data(current_user.id, db)
 
     try:
-        portfolio_data = generate_portfolio(pd)
+        portfolio_data = await run_in_threadpool(generate_portfolio, pd, previous=previous)
     except RuntimeError as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
@@ -66,11 +113,11 @@ def generate_portfolio_endpoint(
     history_entry = ResumeHistory(
         user_id=current_user.id,
         generation_type="portfolio",
-        resume_markdown=json.dumps(portfolio_data)  # store full data for re-download
+        resume_markdown=json.dumps(portfolio_data),  # store full data for re-download
+        profile_fingerprint=snapshot.fingerprint
     )
-    db.add(history_entry)
-    db.commit()
-    db.refresh(history_entry)
+    history_id = await history_writer.submit(history_entry)
+    page_cache.invalidate_user(current_user.id)
 
     return PortfolioResponse(
         about_me=portfolio_data.get("about_me", ""),
@@ -78,67 +125,74 @@ def generate_portfolio_endpoint(
         linkedin_summary=portfolio_data.get("linkedin_summary", ""),
         project_descriptions=portfolio_data.get("project_descriptions", []),
         github_highlights=portfolio_data.get("github_highlights", ""),
-        history_id=history_entry.id
+        history_id=history_id,
+        public_slug=portfolio_slug(pd["personal_info"].get("name", ""), current_user.id)
     )
 
 
 @router.post("/download")
-def download_portfolio_website(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def download_portfolio_website(
+    request: Request,
+    fresh: bool = Query(False, description="Regenerate content even if the profile is unchanged"),
+    format: str = Query("html", pattern="^(html|bundle)$"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Generate portfolio content and return it as a complete downloadable HTML website.
+    Return the portfolio as a complete downloadable HTML website.
+    Content generated earlier from an identical profile is reused; Gemini is only
+    called when the profile changed since then or `fresh=true` is passed, and only
+    then does the request count against the AI rate limits.
     The HTML file is self-contained — no external dependencies, ready to host anywhere.
     """
-    profile = _get_profile(current_user.id, db)
-    pd = _profile_dict(profile)
-
-    try:
-        portfolio_data = generate_portfolio(pd)
-    except RuntimeError as e:
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
-
-    # Build the HTML website
-    html_content = generate_portfolio_html(portfolio_data, pd)
-
-    # Save to history for re-download later
-    name = pd.get("personal_info", {}).get("name", "portfolio")
-    history_entry = ResumeHistory(
-        user_id=current_user.id,
-        generation_type="portfolio",
-        resume_markdown=json.dumps(portfolio_data)
-    )
-    db.add(history_entry)
-    db.commit()
-
-    safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_').lower()
-    filename = f"{safe_name}_portfolio.html"
+    snapshot = await require_snapshot(db, current_user.id)
+    pd = snapshot.to_dict()
+    fingerprint = snapshot.fingerprint
+
+    portfolio_data = None
+    if not fresh:
+        item = await _latest_matching_portfolio(current_user.id, fingerprint, db)
+        if item:
+            portfolio_data = _load_portfolio_data(item)
+
+    if portfolio_data is None:
+        await rate_limiter.check(current_user.id, client_ip(request))
+        previous = None if fresh else await _latest_portfolio_data(current_user.id, db)
+        try:
+            portfolio_data = await run_in_threadpool(generate_portfolio, pd, previous=previous)
+        except RuntimeError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+        # Save to history for re-download later
+        history_entry = ResumeHistory(
+            user_id=current_user.id,
+            generation_type="portfolio",
+            resume_markdown=json.dumps(portfolio_data),
+            profile_fingerprint=fingerprint
+        )
+        await history_writer.submit(history_entry)
+        page_cache.invalidate_user(current_user.id)
 
-    return Response(
-        content=html_content,
-        media_type="text/html",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
-    )
+    return await run_in_threadpool(_portfolio_file_response, portfolio_data, pd, format)
 
 
 @router.get("/download/{history_id}")
-def re_download_portfolio(
+async def re_download_portfolio(
     history_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    format: str = Query("html", pattern="^(html|bundle)$"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Re-download the HTML portfolio website from a previously generated history entry.
     """
-    profile = _get_profile(current_user.id, db)
-    pd = _profile_dict(profile)
+    pd = (await require_snapshot(db, current_user.id)).to_dict()
 
-    item = db.query(ResumeHistory).filter(
+    item = await db.scalar(select(ResumeHistory).options(*RESUME_BODY).where(
         ResumeHistory.id == history_id,
         ResumeHistory.user_id == current_user.id,
         ResumeHistory.generation_type == "portfolio"
-    ).first()
+    ))
 
     if not item:
         raise HTTPException(status_code=404, detail="Portfolio history item not found.")
@@ -148,12 +202,54 @@ def re_download_portfolio(
     except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail="Could not parse saved portfolio data.")
 
-    html_content = generate_portfolio_html(portfolio_data, pd)
-    name = pd.get("personal_info", {}).get("name", "portfolio")
-    safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_').lower()
+    return await run_in_threadpool(_portfolio_file_response, portfolio_data, pd, format)
 
-    return Response(
-        content=html_content,
-        media_type="text/html",
-        headers={"Content-Disposition": f'attachment; filename="{safe_name}_portfolio.html"'}
+
+async def _publish_state(user_id: int, db: AsyncSession) -> PortfolioPublishResponse:
+    snapshot = await require_snapshot(db, user_id)
+    published = await db.scalar(select(User.portfolio_published).where(User.id == user_id))
+    return PortfolioPublishResponse(
+        published=bool(published),
+        public_slug=portfolio_slug(snapshot.personal_info.get("name", ""), user_id)
     )
+
+
+async def _set_published(user_id: int, published: bool, db: AsyncSession) -> PortfolioPublishResponse:
+    await db.execute(update(User).where(User.id == user_id).values(portfolio_published=published))
+    await db.commit()
+    page_cache.invalidate_user(user_id)
+    return await _publish_state(user_id, db)
+
+
+@router.get("/publish", response_model=PortfolioPublishResponse)
+async def get_publish_state(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Whether the latest portfolio is publicly hosted, and at which slug."""
+    return await _publish_state(current_user.id, db)
+
+
+@router.put("/publish", response_model=PortfolioPublishResponse)
+async def publish_portfolio(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Publish the latest portfolio at /p/{public_slug}. The page shows the profile's
+    contact details, so hosting is opt-in and off by default.
+    """
+    await require_snapshot(db, current_user.id)
+    return await _set_published(current_user.id, True, db)
+
+
+@router.delete("/publish", response_model=PortfolioPublishResponse)
+async def unpublish_portfolio(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stop hosting the portfolio; /p/{slug} returns 404 from this worker at once and
+    from other workers within PORTFOLIO_PAGE_CACHE_TTL seconds.
+    """
+    return await _set_published(current_user.id, False, db)
@@ -3,44 +3,78 @@ Profile Router — CRUD for user's career profile.
 Endpoints:
   GET  /api/profile       — get current user's profile
   PUT  /api/profile       — create or update profile
+  PATCH /api/profile      — item-level JSON-Patch style edits with per-section versions
+
+Each section (personal_info, experience, skills, ...) has a version counter that
+is bumped whenever its content changes. PATCH can make edits conditional on
+those versions (expected_versions), and both PUT and PATCH write only the
+columns whose content actually changed.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 from database import get_db
 from models.profile import Profile
-from models.user import User
-from schemas.profile import ProfileUpdateRequest, ProfileResponse
-from services.auth_service import get_current_user
+from schemas.profile import (
+    ProfileUpdateRequest, ProfileResponse, ProfilePatchRequest, ProfilePatchResponse,
+)
+from services.auth_service import Principal, get_current_user
+from services.profile_patch import SECTIONS, apply_patch
+from services.profile_repository import ProfileSnapshot, get_snapshot, profile_cache
+from services.portfolio_page_cache import page_cache
 
 router = APIRouter(prefix="/api/profile", tags=["Profile"])
 
 
-def _profile_to_dict(profile: Profile) -> dict:
-    """Convert a Profile ORM model to a plain dict for the response."""
-    return {
-        "user_id": profile.user_id,
-        "personal_info": profile.personal_info or {},
-        "education": profile.education or [],
-        "experience": profile.experience or [],
-        "skills": profile.skills or [],
-        "projects": profile.projects or [],
-        "certifications": profile.certifications or [],
-        "internships": profile.internships or [],
-        "achievements": profile.achievements,
-    }
+def _snapshot_response(snapshot: ProfileSnapshot) -> dict:
+    """Build the response body from a profile snapshot."""
+    body = snapshot.to_dict()
+    if not snapshot.achievements_set:
+        body["achievements"] = None
+    return {"user_id": snapshot.user_id, **body, "section_versions": dict(snapshot.section_versions)}
+
+
+async def _get_or_create_profile(db: AsyncSession, user_id: int) -> Profile:
+    profile = await db.scalar(select(Profile).where(Profile.user_id == user_id))
+    if not profile:
+        profile = Profile(user_id=user_id, section_versions={})
+        db.add(profile)
+    return profile
+
+
+def _write_sections(profile: Profile, changed: dict) -> None:
+    """Assign only the changed section columns and bump their versions."""
+    versions = dict(profile.section_versions or {})
+    for section, value in changed.items():
+        setattr(profile, section, value)
+        versions[section] = versions.get(section, 0) + 1
+    profile.section_versions = versions
+
+
+async def _commit_profile(db: AsyncSession, profile: Profile) -> None:
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        profile_cache.invalidate(profile.user_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profile was modified by another request. Reload it and retry."
+        )
 
 
 @router.get("", response_model=ProfileResponse)
-def get_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_profile(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve the authenticated user's career profile.
     Returns empty fields if profile not yet created.
     """
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
-    if not profile:
+    snapshot = await get_snapshot(db, current_user.id)
+    if not snapshot:
         # Return empty profile structure
         return ProfileResponse(
             user_id=current_user.id,
@@ -53,43 +87,80 @@ def get_profile(
             internships=[],
             achievements=None
         )
-    return _profile_to_dict(profile)
+    return _snapshot_response(snapshot)
 
 
 @router.put("", response_model=ProfileResponse)
-def upsert_profile(
+async def upsert_profile(
     req: ProfileUpdateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create or update the authenticated user's career profile.
     Performs an upsert — creates if doesn't exist, updates fields that are provided.
     """
-    profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+    profile = await _get_or_create_profile(db, current_user.id)
 
-    if not profile:
-        profile = Profile(user_id=current_user.id)
-        db.add(profile)
+    # Update only provided fields (partial update support), and of those only
+    # the ones whose content differs from what is stored
+    provided = req.model_dump(exclude_none=True)
+    changed = {
+        section: value for section, value in provided.items()
+        if value != getattr(profile, section)
+    }
+    _write_sections(profile, changed)
+
+    if changed or profile.id is None:
+        await _commit_profile(db, profile)
+        page_cache.invalidate_user(current_user.id)
+    return _snapshot_response(profile_cache.store(profile))
+
+
+@router.patch("", response_model=ProfilePatchResponse)
+async def patch_profile(
+    req: ProfilePatchRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply item-level operations (add / replace / remove one experience, project,
+    skill or field) without resending the profile. If expected_versions is given
+    and any listed section has moved on, nothing is applied and 409 is returned
+    with the current versions. Returns the new versions and the changed sections only.
+    """
+    profile = await _get_or_create_profile(db, current_user.id)
+    versions = profile.section_versions or {}
+
+    unknown = set(req.expected_versions) - set(SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown profile section(s) in expected_versions: {', '.join(sorted(unknown))}"
+        )
+    stale = {
+        section for section, expected in req.expected_versions.items()
+        if versions.get(section, 0) != expected
+    }
+    if stale:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": f"Section(s) changed since the expected version: {', '.join(sorted(stale))}",
+                "section_versions": versions,
+            }
+        )
+
+    current = {section: getattr(profile, section) for section in SECTIONS}
+    changed = apply_patch(current, req.operations)
+    _write_sections(profile, changed)
 
-    # Update only provided fields (partial update support)
-    if req.personal_info is not None:
-        profile.personal_info = req.personal_info.model_dump()
-    if req.education is not None:
-        profile.education = [e.model_dump() for e in req.education]
-    if req.experience is not None:
-        profile.experience = [e.model_dump() for e in req.experience]
-    if req.skills is not None:
-        profile.skills = req.skills
-    if req.projects is not None:
-        profile.projects = [p.model_dump() for p in req.projects]
-    if req.certifications is not None:
-        profile.certifications = [c.model_dump() for c in req.certifications]
-    if req.internships is not None:
-        profile.internships = [i.model_dump() for i in req.internships]
-    if req.achievements is not None:
-        profile.achievements = req.achievements
-
-    db.commit()
-    db.refresh(profile)
-    return _profile_to_dict(profile)
+    if changed or profile.id is None:
+        await _commit_profile(db, profile)
+        page_cache.invalidate_user(current_user.id)
+        profile_cache.store(profile)
+    return ProfilePatchResponse(
+        user_id=current_user.id,
+        section_versions=profile.section_versions or {},
+        changed=changed,
+    )
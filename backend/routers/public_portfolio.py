@@ -0,0 +1,115 @@
+"""
+Public Portfolio Router — serves hosted portfolio pages without authentication.
+Endpoints:
+  GET /p/{slug}   — latest generated portfolio for the user behind the slug
+
+Only users who published their portfolio (PUT /api/portfolio/publish) are
+served; every other slug is a 404 that does not reveal whether the user exists.
+Cache hits are answered from services.portfolio_page_cache without a database
+query or a render; misses load the rows on the async session and render the
+page in the threadpool. Slugs that resolve to nothing are cached as misses for
+a short TTL.
+"""
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from config import PORTFOLIO_PAGE_MAX_AGE
+from database import AsyncSessionLocal
+from models.resume_history import ResumeHistory, RESUME_BODY
+from models.user import User
+from services.portfolio_html_service import generate_portfolio_html
+from services.portfolio_page_cache import page_cache, portfolio_slug, user_id_from_slug, CachedPage
+from services.profile_repository import get_snapshot
+
+router = APIRouter(prefix="/p", tags=["Public Portfolio"])
+
+_CACHE_CONTROL = f"public, max-age={PORTFOLIO_PAGE_MAX_AGE}"
+
+
+async def _render_page(slug: str) -> CachedPage | None:
+    """Load the user's profile and latest portfolio, render it and cache the result (or the miss)."""
+    user_id = user_id_from_slug(slug)
+    if user_id is None:
+        return None
+
+    async with AsyncSessionLocal() as db:
+        published = await db.scalar(select(User.portfolio_published).where(User.id == user_id))
+        snapshot = await get_snapshot(db, user_id) if published else None
+        if not snapshot:
+            page_cache.put_miss(slug, user_id)
+            return None
+        pd = snapshot.to_dict()
+        if portfolio_slug(pd["personal_info"].get("name", ""), user_id) != slug:
+            page_cache.put_miss(slug, user_id)
+            return None
+
+        item = await db.scalar(
+            select(ResumeHistory)
+            .options(*RESUME_BODY)
+            .where(
+                ResumeHistory.user_id == user_id,
+                ResumeHistory.generation_type == "portfolio"
+            )
+            .order_by(ResumeHistory.created_at.desc())
+            .limit(1)
+        )
+        if not item:
+            page_cache.put_miss(slug, user_id)
+            return None
+        try:
+            portfolio_data = json.loads(item.resume_markdown or "")
+        except json.JSONDecodeError:
+            page_cache.put_miss(slug, user_id)
+            return None
+
+    html = await run_in_threadpool(generate_portfolio_html, portfolio_data, pd)
+    return page_cache.put(slug, user_id, html)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    """True if Accept-Encoding gives gzip (or *, when gzip isn't listed) a q-value above 0."""
+    q_values = {}
+    for item in (accept_encoding or "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            q_values[coding.lower()] = q
+    return q_values.get("gzip", q_values.get("*", 0.0)) > 0
+
+
+@router.get("/{slug}")
+async def serve_portfolio(slug: str, request: Request):
+    """Serve a user's hosted portfolio with strong ETags and gzip when accepted."""
+    page = page_cache.get(slug)
+    if page is None:
+        page = None if page_cache.is_miss(slug) else await _render_page(slug)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Portfolio not found.")
+
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding"))
+    etag = page.gzip_etag if use_gzip else page.etag
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=page.gzipped, media_type="text/html; charset=utf-8", headers=headers)
+    return Response(content=page.html, media_type="text/html; charset=utf-8", headers=headers)
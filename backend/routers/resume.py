@@ -2,66 +2,53 @@
 Resume Router — generates ATS-optimized resumes via LLM and manages history.
 Endpoints:
   POST /api/resume/generate    — generate a resume
-  GET  /api/resume/history     — get user's generation history
+  GET  /api/resume/history     — get user's generation history (cursor-paginated, filterable)
   GET  /api/resume/history/{id} — get specific history item
   DELETE /api/resume/history/{id} — delete history item
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
 import logging
 import traceback
 from database import get_db
-from models.user import User
-from models.profile import Profile
-from models.resume_history import ResumeHistory
+from models.resume_history import ResumeHistory, RESUME_BODY
 from schemas.resume import ResumeGenerateRequest, ResumeResponse, HistoryItem
-from services.auth_service import get_current_user
+from services.auth_service import Principal, get_current_user
+from services.rate_limiter import limit_llm_requests
 from services.ai_service import generate_resume
+from services.history_writer import history_writer
+from services.profile_repository import require_snapshot
+from services.portfolio_page_cache import page_cache
+from services.pagination import encode_cursor, decode_cursor, keyset_after, ilike_contains, NEXT_CURSOR_HEADER
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/resume", tags=["Resume"])
 
 
-def _get_profile_dict(user_id: int, db: Session) -> dict:
-    """Fetch user profile as a plain dict, raise 404 if not found."""
-    profile = db.query(Profile).filter(Profile.user_id == user_id).first()
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found. Please complete your profile first."
-        )
-    return {
-        "personal_info": profile.personal_info or {},
-        "education": profile.education or [],
-        "experience": profile.experience or [],
-        "skills": profile.skills or [],
-        "projects": profile.projects or [],
-        "certifications": profile.certifications or [],
-        "internships": profile.internships or [],
-        "achievements": profile.achievements or "",
-    }
-
-
-@router.post("/generate", response_model=ResumeResponse)
-def generate_resume_endpoint(
+@router.post("/generate", response_model=ResumeResponse, dependencies=[Depends(limit_llm_requests)])
+async def generate_resume_endpoint(
     req: ResumeGenerateRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Generate an ATS-optimized resume for the authenticated user.
-    - Fetches user's profile from DB
+    - Fetches user's profile snapshot (cached; see services/profile_repository.py)
     - Calls Gemini API with engineered prompts
     - Saves the result to resume_history
     - Returns the Markdown resume
     """
-    profile_dict = _get_profile_dict(current_user.id, db)
+    snapshot = await require_snapshot(db, current_user.id)
 
     try:
-        resume_md = generate_resume(
-            profile=profile_dict,
+        resume_md = await run_in_threadpool(
+            generate_resume,
+            profile=snapshot.to_dict(),
             job_role=req.job_role,
             job_description=req.job_description or ""
         )
@@ -77,46 +64,83 @@ def generate_resume_endpoint(
         user_id=current_user.id,
         job_role=req.job_role,
         resume_markdown=resume_md,
-        generation_type="resume"
+        generation_type="resume",
+        profile_fingerprint=snapshot.fingerprint
     )
-    db.add(history_entry)
-    db.commit()
-    db.refresh(history_entry)
+    history_id = await history_writer.submit(history_entry)
 
     return ResumeResponse(
         resume_markdown=resume_md,
         job_role=req.job_role,
-        history_id=history_entry.id
+        history_id=history_id
     )
 
 
 @router.get("/history", response_model=List[HistoryItem])
-def get_history(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_history(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    generation_type: Optional[str] = Query(None, pattern="^(resume|cover_letter|portfolio)$"),
+    job_role: Optional[str] = Query(None, max_length=100, description="Substring of the target role"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Return all resume/cover letter generation history for the current user."""
-    history = (
-        db.query(ResumeHistory)
-        .filter(ResumeHistory.user_id == current_user.id)
-        .order_by(ResumeHistory.created_at.desc())
-        .limit(50)
-        .all()
+    """
+    Return the current user's generation history, newest first.
+    Selects metadata columns only, so cost does not depend on document size.
+
+    Pages are keyset-paginated on (created_at, id) using the per-user history
+    indexes, so deep pages cost the same as the first. The next page's cursor
+    is returned in the X-Next-Cursor header (absent on the last page).
+    """
+    query = (
+        select(
+            ResumeHistory.id,
+            ResumeHistory.job_role,
+            ResumeHistory.company_name,
+            ResumeHistory.generation_type,
+            ResumeHistory.ats_score,
+            ResumeHistory.created_at,
+        )
+        .where(ResumeHistory.user_id == current_user.id)
     )
+    if generation_type:
+        query = query.where(ResumeHistory.generation_type == generation_type)
+    if job_role:
+        query = query.where(ilike_contains(ResumeHistory.job_role, job_role))
+    if created_after:
+        query = query.where(ResumeHistory.created_at >= created_after)
+    if created_before:
+        query = query.where(ResumeHistory.created_at < created_before)
+    if cursor:
+        last_created, last_id = decode_cursor(cursor, 2)
+        query = query.where(keyset_after(ResumeHistory.created_at, ResumeHistory.id, last_created, last_id, True))
+
+    history = (await db.execute(
+        query
+        .order_by(ResumeHistory.created_at.desc(), ResumeHistory.id.desc())
+        .limit(limit + 1)
+    )).all()
+    if len(history) > limit:
+        history = history[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(history[-1].created_at, history[-1].id)
     return history
 
 
 @router.get("/history/{history_id}", response_model=ResumeResponse)
-def get_history_item(
+async def get_history_item(
     history_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Return full content of a specific history item."""
-    item = db.query(ResumeHistory).filter(
+    item = await db.scalar(select(ResumeHistory).options(*RESUME_BODY).where(
         ResumeHistory.id == history_id,
         ResumeHistory.user_id == current_user.id
-    ).first()
+    ))
 
     if not item:
         raise HTTPException(status_code=404, detail="History item not found")
@@ -129,19 +153,21 @@ def get_history_item(
 
 
 @router.delete("/history/{history_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_history_item(
+async def delete_history_item(
     history_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a specific history item for the current user."""
-    item = db.query(ResumeHistory).filter(
+    item = await db.scalar(select(ResumeHistory).where(
         ResumeHistory.id == history_id,
         ResumeHistory.user_id == current_user.id
-    ).first()
+    ))
 
     if not item:
         raise HTTPException(status_code=404, detail="History item not found")
 
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
+    if item.generation_type == "portfolio":
+        page_cache.invalidate_user(current_user.id)
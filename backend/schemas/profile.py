@@ -2,7 +2,7 @@
 Pydantic schemas for the user profile module.
 """
 from pydantic import BaseModel
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict, Literal
 
 
 class PersonalInfo(BaseModel):
@@ -75,6 +75,32 @@ class ProfileResponse(BaseModel):
     certifications: Any = []
     internships: Any = []
     achievements: Optional[str] = None
+    section_versions: Dict[str, int] = {}
 
     class Config:
         from_attributes = True
+
+
+class ProfilePatchOperation(BaseModel):
+    """
+    One JSON-Patch style operation. path is a JSON Pointer into the profile:
+      /skills                   the whole section
+      /experience/2             one item ("-" appends with op "add")
+      /experience/2/description one field of an item
+      /personal_info/email      one personal_info field
+    """
+    op: Literal["add", "replace", "remove"]
+    path: str
+    value: Any = None
+
+
+class ProfilePatchRequest(BaseModel):
+    operations: List[ProfilePatchOperation]
+    # Optional preconditions: {"experience": 4} fails with 409 if experience changed since version 4
+    expected_versions: Dict[str, int] = {}
+
+
+class ProfilePatchResponse(BaseModel):
+    user_id: int
+    section_versions: Dict[str, int]
+    changed: Dict[str, Any]   # only the sections this patch modified, in their new state
@@ -58,6 +58,12 @@ class PortfolioResponse(BaseModel):
     project_descriptions: List[dict]
     github_highlights: str
     history_id: Optional[int] = None
+    public_slug: Optional[str] = None   # hosted at /p/{public_slug}
+
+
+class PortfolioPublishResponse(BaseModel):
+    published: bool
+    public_slug: str                     # served at /p/{public_slug} while published
 
 
 # ─── History ─────────────────────────────────────────────────────────────────
@@ -1,58 +1,83 @@
 """
 AI Service — wraps the Google Gemini API for all LLM-powered generation tasks.
 Uses the new `google-genai` SDK (v1.x) with automatic retry on rate limits.
+Every attempt is recorded in services/metrics.py, labelled with its task
+(resume, cover_letter, portfolio, ats).
 """
 import time
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
 from google.genai import types
 from google.genai.errors import ClientError
-from config import GEMINI_API_KEY, GEMINI_MODEL
+from config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_MAX_CONCURRENCY, PORTFOLIO_FANOUT
 from prompts.resume_prompt import build_resume_prompt
 from prompts.cover_letter_prompt import build_cover_letter_prompt
-from prompts.portfolio_prompt import build_portfolio_prompt
+from prompts.portfolio_prompt import (
+    build_portfolio_prompt, section_fingerprints, project_names, GLOBAL_SECTIONS
+)
 from prompts.ats_prompt import build_ats_prompt
+from services.metrics import (
+    GEMINI_REQUESTS, GEMINI_LATENCY, GEMINI_RETRIES, GEMINI_TOKENS, GEMINI_IN_FLIGHT, estimate_tokens,
+)
 
 logger = logging.getLogger(__name__)
 
 # Create a single client instance (thread-safe, reusable)
 _client = genai.Client(api_key=GEMINI_API_KEY)
 
+# Caps concurrent Gemini requests from this process (held only while a request is in flight)
+_llm_slots = threading.BoundedSemaphore(GEMINI_MAX_CONCURRENCY)
+_fanout_pool = ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY, thread_name_prefix="gemini-fanout")
 
-def _call_gemini(prompt: str, max_retries: int = 3) -> str:
+
+def _call_gemini(prompt: str, max_retries: int = 3, task: str = "other") -> str:
     """
     Send a prompt to Gemini and return the text response.
     Automatically retries on 429 rate-limit errors with exponential backoff.
     Raises RuntimeError on unrecoverable failure.
     """
+    GEMINI_TOKENS.labels(task, "prompt").inc(estimate_tokens(prompt))
     for attempt in range(max_retries):
         try:
-            response = _client.models.generate_content(
-                model=GEMINI_MODEL,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=8192,
-                ),
-            )
-            return response.text.strip()
+            with _llm_slots, GEMINI_IN_FLIGHT.track_inprogress():
+                start = time.perf_counter()
+                try:
+                    response = _client.models.generate_content(
+                        model=GEMINI_MODEL,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(
+                            temperature=0.7,
+                            max_output_tokens=8192,
+                        ),
+                    )
+                finally:
+                    GEMINI_LATENCY.labels(task).observe(time.perf_counter() - start)
+            text = response.text.strip()
+            GEMINI_REQUESTS.labels(task, "ok").inc()
+            GEMINI_TOKENS.labels(task, "completion").inc(estimate_tokens(text))
+            return text
 
         except ClientError as e:
             error_str = str(e)
             # 429 RESOURCE_EXHAUSTED — rate limited, wait and retry
             if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+                GEMINI_REQUESTS.labels(task, "rate_limited").inc()
                 wait = (attempt + 1) * 15  # 15s, 30s, 45s
                 logger.warning(f"Gemini rate limited (attempt {attempt+1}/{max_retries}). Waiting {wait}s...")
                 if attempt < max_retries - 1:
+                    GEMINI_RETRIES.labels(task).inc()
                     time.sleep(wait)
                     continue
                 raise RuntimeError(
                     "Gemini API rate limit exceeded. Please wait a moment and try again. "
                     "Consider upgrading your API plan for higher quotas."
                 )
+            GEMINI_REQUESTS.labels(task, "error").inc()
             # 400 INVALID_ARGUMENT — usually wrong model name
-            elif "400" in error_str or "INVALID_ARGUMENT" in error_str:
+            if "400" in error_str or "INVALID_ARGUMENT" in error_str:
                 raise RuntimeError(
                     f"Gemini API invalid request. Check your GEMINI_MODEL in .env. Error: {error_str}"
                 )
@@ -65,6 +90,7 @@ def _call_gemini(prompt: str, max_retries: int = 3) -> str:
                 raise RuntimeError(f"Gemini API error: {error_str}")
 
         except Exception as e:
+            GEMINI_REQUESTS.labels(task, "error").inc()
             raise RuntimeError(f"Gemini API unexpected error: {str(e)}")
 
     raise RuntimeError("Gemini API failed after all retries.")
@@ -75,7 +101,7 @@ def _call_gemini(prompt: str, max_retries: int = 3) -> str:
 def generate_resume(profile: dict, job_role: str, job_description: str = "") -> str:
     """Generate an ATS-optimized resume in Markdown format."""
     prompt = build_resume_prompt(profile, job_role, job_description)
-    return _call_gemini(prompt)
+    return _call_gemini(prompt, task="resume")
 
 
 # ─── Cover Letter Generation ──────────────────────────────────────────────────
@@ -91,14 +117,88 @@ def generate_cover_letter(
     prompt = build_cover_letter_prompt(
         profile, company_name, job_role, job_description, hiring_manager
     )
-    return _call_gemini(prompt)
+    return _call_gemini(prompt, task="cover_letter")
+
+
+def generate_portfolio(profile: dict, previous: dict = None, fanout: bool = None) -> dict:
+    """
+    Generate portfolio content sections from the user's profile.
+
+    If `previous` (a stored portfolio dict) is given, only sections whose
+    input fingerprint changed since it was generated are requested from Gemini,
+    and the rest are carried over. The result records the fingerprints under
+    "section_hashes" so the next call can do the same; a section the reply left
+    out is not recorded as up to date, so it is requested again next time.
+
+    With `fanout` (default: PORTFOLIO_FANOUT) each dirty section is requested as
+    its own small prompt and the prompts run concurrently, so latency tracks the
+    slowest section rather than the length of the whole portfolio.
+    """
+    if fanout is None:
+        fanout = PORTFOLIO_FANOUT
+
+    hashes = section_fingerprints(profile)
+    old_hashes = (previous or {}).get("section_hashes") or {}
+    old_content = _portfolio_sections_by_key(previous) if previous else {}
 
+    dirty = [
+        key for key, digest in hashes.items()
+        if old_hashes.get(key) != digest or key not in old_content
+    ]
+    if fanout and len(dirty) > 1:
+        fresh = _generate_sections_concurrently(profile, dirty)
+    elif dirty:
+        # Full prompt when nothing can be reused, targeted prompt otherwise
+        sections = dirty if len(dirty) < len(hashes) else None
+        raw = _call_gemini(build_portfolio_prompt(profile, sections=sections), task="portfolio")
+        fresh = _portfolio_sections_by_key(_parse_portfolio_sections(raw))
+    else:
+        fresh = {}
+    if dirty:
+        logger.info(f"Portfolio: regenerated {len(dirty)}/{len(hashes)} sections (fanout={fanout})")
 
-def generate_portfolio(profile: dict) -> dict:
-    """Generate all portfolio content sections from the user's profile."""
-    prompt = build_portfolio_prompt(profile)
-    raw = _call_gemini(prompt)
-    return _parse_portfolio_sections(raw)
+    merged = {key: fresh.get(key, old_content.get(key, "")) for key in hashes}
+    # A dirty section the reply left out keeps its old hash (or none), so the next call retries it
+    missing = [key for key in dirty if key not in fresh]
+    if missing:
+        logger.warning(f"Portfolio: Gemini reply omitted {len(missing)} section(s): {missing}")
+    saved_hashes = {
+        key: digest if key not in missing else old_hashes.get(key)
+        for key, digest in hashes.items()
+        if key not in missing or old_hashes.get(key) is not None
+    }
+    return {
+        "about_me": merged["about_me"],
+        "professional_bio": merged["professional_bio"],
+        "linkedin_summary": merged["linkedin_summary"],
+        "project_descriptions": [
+            {"name": name, "description": merged[f"project:{name}"]}
+            for name in project_names(profile)
+        ],
+        "github_highlights": merged["github_highlights"],
+        "section_hashes": saved_hashes,
+    }
+
+
+def _generate_sections_concurrently(profile: dict, keys: list) -> dict:
+    """Request each section with its own prompt in parallel; returns {section key: text}."""
+    def one(key: str) -> dict:
+        raw = _call_gemini(build_portfolio_prompt(profile, sections=[key]), task="portfolio")
+        return _portfolio_sections_by_key(_parse_portfolio_sections(raw))
+
+    fresh = {}
+    for parsed in _fanout_pool.map(one, keys):  # re-raises the first failure
+        fresh.update(parsed)
+    return fresh
+
+
+def _portfolio_sections_by_key(portfolio: dict) -> dict:
+    """Flatten a portfolio dict to {section key: text}, using 'project:<name>' keys."""
+    flat = {key: portfolio[key] for key in GLOBAL_SECTIONS if portfolio.get(key)}
+    for proj in portfolio.get("project_descriptions", []):
+        if proj.get("description"):
+            flat[f"project:{proj.get('name', '')}"] = proj["description"]
+    return flat
 
 
 # ─── ATS Analysis ─────────────────────────────────────────────────────────────
@@ -106,7 +206,7 @@ def generate_portfolio(profile: dict) -> dict:
 def analyze_ats(resume_text: str, job_description: str) -> tuple:
     """Analyze resume against JD using Gemini and return structured data."""
     prompt = build_ats_prompt(resume_text, job_description)
-    raw = _call_gemini(prompt)
+    raw = _call_gemini(prompt, task="ats")
     return _parse_ats_response(raw)
 
 
@@ -165,6 +265,7 @@ def _parse_portfolio_sections(raw_text: str) -> dict:
     for line in raw_text.splitlines():
         stripped = line.strip()
         if stripped.startswith("[ABOUT_ME]"):
+            if current_key: result = _flush(result, current_key, current_content)
             current_key = "about_me"; current_content = []
         elif stripped.startswith("[BIO]"):
             if current_key: result = _flush(result, current_key, current_content)
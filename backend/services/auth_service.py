@@ -1,33 +1,33 @@
 """
-Authentication service — password hashing, JWT token creation & verification.
-Uses bcrypt for password hashing and python-jose for JWT.
+Authentication service — JWT token creation & verification.
+Uses python-jose for JWT; bcrypt hashing lives in services/password_hasher.py.
+
+get_current_user returns a frozen Principal rather than the User row. Principals
+are cached per worker for AUTH_CACHE_TTL seconds, so an authenticated request
+normally costs no users query; code that deletes a user or changes a role must
+call principal_cache.invalidate(user_id).
 """
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
-from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
+    AUTH_CACHE_TTL, AUTH_CACHE_SIZE, AUTH_TRUST_ROLE_CLAIM,
+)
 from models.user import User, UserRole
 
-# ─── Password Hashing ─────────────────────────────────────────────────────────
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def hash_password(plain_password: str) -> str:
-    """Hash a plain-text password using bcrypt."""
-    return pwd_context.hash(plain_password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its bcrypt hash."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 # ─── JWT Token ────────────────────────────────────────────────────────────────
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -43,37 +43,176 @@ def decode_token(token: str) -> dict:
     return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
 
+# ─── Principal Cache ──────────────────────────────────────────────────────────
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated user as request handlers see it (a detached, read-only copy)."""
+    id: int
+    email: str
+    full_name: Optional[str]
+    role: UserRole
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, full_name=user.full_name,
+                   role=user.role, created_at=user.created_at)
+
+
+class PrincipalCache:
+    """Bounded LRU of principals by user id, with a TTL and hit/latency counters."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[int, tuple[Principal, float]]" = OrderedDict()
+        self._generations: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._timings = {"hit": [0, 0.0, 0.0], "miss": [0, 0.0, 0.0]}  # count, total s, max s
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max_entries > 0
+
+    def get(self, user_id: int) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put(self, principal: Principal, generation: int) -> None:
+        """Cache a principal loaded at generation, unless it was invalidated since."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._generations.get(principal.id, 0) != generation:
+                return
+            self._entries[principal.id] = (principal, time.monotonic() + self._ttl)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def record(self, outcome: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings[outcome]
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+            for outcome, (count, total, worst) in self._timings.items():
+                stats[f"{outcome}_ms_avg"] = round(total / count * 1000, 3) if count else 0.0
+                stats[f"{outcome}_ms_max"] = round(worst * 1000, 3)
+            return stats
+
+
+principal_cache = PrincipalCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+
 # ─── FastAPI Dependencies ──────────────────────────────────────────────────────
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """
-    FastAPI dependency: extracts and validates the JWT token from the
-    Authorization header, returns the database User object.
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """FastAPI dependency: the validated JWT payload (401 if invalid or without a subject)."""
     try:
         payload = decode_token(token)
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+async def _load_principal(claims: dict, db: AsyncSession) -> Principal:
+    started = time.perf_counter()
+    user_id = int(claims["sub"])
+    principal = principal_cache.get(user_id)
+    outcome = "hit"
+    if principal is None:
+        outcome = "miss"
+        generation = principal_cache.generation(user_id)
+        user = await db.scalar(select(User).where(User.id == user_id))
+        if user is None:
+            raise _credentials_exception()
+        principal = Principal.from_user(user)
+        principal_cache.put(principal, generation)
+    principal_cache.record(outcome, time.perf_counter() - started)
+
+    if AUTH_TRUST_ROLE_CLAIM and claims.get("role") in UserRole.__members__:
+        principal = replace(principal, role=UserRole(claims["role"]))
+    return principal
+
+
+async def get_current_user(claims: dict = Depends(get_token_claims), db: AsyncSession = Depends(get_db)) -> Principal:
+    """
+    FastAPI dependency: extracts and validates the JWT token from the
+    Authorization header, returns the authenticated user's Principal.
+    """
+    return await _load_principal(claims, db)
+
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
-        raise credentials_exception
-    return user
+async def principal_from_token(token: str, db: AsyncSession) -> Principal | None:
+    """The Principal behind a bearer token, or None if it is invalid (for code outside dependencies)."""
+    try:
+        claims = decode_token(token)
+        if claims.get("sub") is None:
+            return None
+        return await _load_principal(claims, db)
+    except (JWTError, HTTPException, ValueError):
+        return None
+
+
+def _forbidden() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Admin access required"
+    )
 
 
-def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_admin_user(claims: dict = Depends(get_token_claims), db: AsyncSession = Depends(get_db)) -> Principal:
     """FastAPI dependency: ensures the current user has admin role."""
+    if AUTH_TRUST_ROLE_CLAIM and claims.get("role") != UserRole.admin.value:
+        raise _forbidden()
+    current_user = await _load_principal(claims, db)
     if current_user.role != UserRole.admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
+        raise _forbidden()
     return current_user
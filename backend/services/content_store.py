@@ -0,0 +1,147 @@
+"""
+Content Store Service — stores history bodies as shared, compressed blobs.
+
+A before_flush hook picks up bodies staged on ResumeHistory rows (see
+models/resume_history.py), upserts one content_blobs row per distinct text
+(INSERT ... ON CONFLICT adds to ref_count, so concurrent writers of the same
+document converge on one blob) and releases the blobs of replaced or deleted
+bodies. Blobs whose count reaches zero are swept after the flush, once no row
+in the same transaction still points at them.
+
+Bulk deletes bypass the ORM hooks, so code that removes history rows in bulk
+must go through delete_history() to keep the counts right (from an AsyncSession:
+await db.run_sync(delete_history, *criteria)).
+"""
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import delete, event, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from models.content_blob import ContentBlob, content_hash, pack
+from models.resume_history import ResumeHistory
+
+_FIELDS = {
+    "resume": ("resume_blob_hash", "legacy_resume_markdown"),
+    "cover_letter": ("cover_letter_blob_hash", "legacy_cover_letter"),
+}
+_SWEEP_KEY = "content_store_sweep"
+_STORED_KEY = "content_store_stored"
+
+
+def _previous_hash(obj: ResumeHistory, hash_attr: str):
+    history = inspect(obj).attrs[hash_attr].history
+    return next((v for v in history.deleted if v is not None), None)
+
+
+@event.listens_for(Session, "before_flush")
+def _store_bodies(session: Session, flush_context, instances) -> None:
+    deltas = Counter()
+    texts = {}
+    stored = session.info[_STORED_KEY] = []
+
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, ResumeHistory) or not obj.pending_bodies:
+            continue
+        persistent = obj not in session.new
+        cache = obj.__dict__.setdefault("_body_cache", {})
+        for kind, value in obj.pending_bodies.items():
+            hash_attr, legacy_attr = _FIELDS[kind]
+            if persistent:
+                old = _previous_hash(obj, hash_attr)
+                if old:
+                    deltas[old] -= 1
+                setattr(obj, legacy_attr, None)
+            if value is None:
+                setattr(obj, hash_attr, None)
+                cache.pop(kind, None)
+                continue
+            digest = content_hash(value)
+            texts.setdefault(digest, value)
+            deltas[digest] += 1
+            setattr(obj, hash_attr, digest)
+            cache[kind] = (digest, value)
+        stored.append(obj)
+
+    for obj in session.deleted:
+        if isinstance(obj, ResumeHistory):
+            for hash_attr, _ in _FIELDS.values():
+                digest = getattr(obj, hash_attr)
+                if digest:
+                    deltas[digest] -= 1
+
+    if deltas:
+        _apply(session, deltas, texts)
+
+
+@event.listens_for(Session, "after_flush")
+def _sweep_after_flush(session: Session, flush_context) -> None:
+    # Staged bodies are only dropped once the flush succeeded; after a rollback
+    # they are still on the object, so retrying it stores them again.
+    for obj in session.info.pop(_STORED_KEY, ()):
+        obj.pending_bodies.clear()
+    hashes = session.info.pop(_SWEEP_KEY, None)
+    if hashes:
+        _sweep(session, hashes)
+
+
+def _apply(session: Session, deltas: Counter, texts: dict) -> None:
+    """Add reference deltas; new texts are inserted, released hashes are queued for the sweep."""
+    connection = session.connection()
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    table = ContentBlob.__table__
+    released = []
+    for digest, delta in sorted(deltas.items()):
+        if delta > 0 and digest in texts:
+            codec, data = pack(texts[digest])
+            stmt = dialect_insert(table).values(
+                hash=digest, codec=codec, data=data, size=len(texts[digest].encode("utf-8")),
+                ref_count=delta, created_at=datetime.utcnow(),
+            )
+            connection.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.hash],
+                set_={"ref_count": table.c.ref_count + stmt.excluded.ref_count},
+            ))
+        elif delta:
+            connection.execute(
+                update(table).where(table.c.hash == digest).values(ref_count=table.c.ref_count + delta)
+            )
+            if delta < 0:
+                released.append(digest)
+    if released:
+        session.info.setdefault(_SWEEP_KEY, set()).update(released)
+
+
+def _sweep(session: Session, hashes) -> None:
+    table = ContentBlob.__table__
+    session.connection().execute(
+        delete(table).where(table.c.hash.in_(list(hashes)), table.c.ref_count <= 0)
+    )
+
+
+def restage_bodies(obj: ResumeHistory) -> None:
+    """
+    Stage a row's bodies again after the transaction that stored them rolled
+    back, so the next flush re-creates its blobs instead of keeping hashes that
+    point at blobs which no longer exist.
+    """
+    for kind, (_, value) in list(obj.__dict__.get("_body_cache", {}).items()):
+        if kind not in obj.pending_bodies:
+            setattr(obj, "resume_markdown" if kind == "resume" else "cover_letter", value)
+
+
+def delete_history(db: Session, *criteria) -> int:
+    """Bulk-delete history rows matching criteria and release their blobs. Returns rows deleted."""
+    deltas = Counter()
+    rows = db.execute(
+        select(ResumeHistory.resume_blob_hash, ResumeHistory.cover_letter_blob_hash).where(*criteria)
+    )
+    for resume_hash, letter_hash in rows:
+        for digest in (resume_hash, letter_hash):
+            if digest:
+                deltas[digest] -= 1
+    deleted = db.query(ResumeHistory).filter(*criteria).delete(synchronize_session=False)
+    if deltas:
+        _apply(db, deltas, {})
+        _sweep(db, db.info.pop(_SWEEP_KEY, set()))
+    return deleted
+
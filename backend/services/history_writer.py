@@ -0,0 +1,167 @@
+"""
+History Writer — group-commit write-behind for new ResumeHistory rows.
+
+Generation endpoints hand their history row to history_writer.submit() instead
+of committing it themselves. A background task collects rows submitted within
+HISTORY_BATCH_DELAY_MS (or until HISTORY_BATCH_MAX are queued) and inserts them
+in one transaction, so concurrent requests share one commit — on SQLite one
+write-lock acquisition and one journal sync — instead of paying for one each.
+
+submit() resolves with the row id only after its batch has committed, so a
+response never references a row that is not durable. If a batch fails, its
+rows are retried one per transaction so only the offending request sees the
+error; each is reset first (no id, document bodies staged again), because a
+flush that succeeded before the commit failed left it pointing at rolled-back
+blobs. stop() drains the queue before shutdown, including rows submitted after
+it was called; when the writer is not running
+(HISTORY_WRITE_BEHIND=false, scripts, tests without lifespan) submit() simply
+commits the row directly.
+"""
+import asyncio
+import logging
+from config import HISTORY_BATCH_MAX, HISTORY_BATCH_DELAY_MS
+from database import AsyncSessionLocal
+from models.resume_history import ResumeHistory
+from services import content_store, stats_rollup  # noqa: F401  (flush hooks the rows rely on)
+from services.metrics import HISTORY_QUEUE_DEPTH, HISTORY_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class HistoryWriter:
+    def __init__(self, session_factory=AsyncSessionLocal, max_batch: int = HISTORY_BATCH_MAX,
+                 max_delay_ms: float = HISTORY_BATCH_DELAY_MS):
+        self._session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._batch_full: asyncio.Event | None = None
+        self.batches = 0
+        self.rows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._batch_full = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="history-writer")
+
+    async def stop(self) -> None:
+        """Flush everything queued so far, then stop the background task."""
+        if not self.running:
+            return
+        self._queue.put_nowait(_STOP)
+        self._batch_full.set()
+        await self._task
+        self._task = None
+
+    async def submit(self, entry: ResumeHistory) -> int:
+        """Queue a new history row and wait until it is committed. Returns its id."""
+        if not self.running:
+            await self._commit([(entry, None)])
+            return entry.id
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((entry, future))
+        HISTORY_QUEUE_DEPTH.inc()
+        if self._queue.qsize() >= self.max_batch:
+            self._batch_full.set()
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_batch_size": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
+
+    # ── Background loop ──────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            if self.max_delay and self._queue.qsize() + 1 < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_full.clear()
+            while len(batch) < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            HISTORY_QUEUE_DEPTH.dec(len(batch))
+            await self._commit(batch)
+        await self._drain()
+
+    async def _drain(self) -> None:
+        """Commit everything still queued behind _STOP so no submit() is left waiting."""
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not _STOP:
+                    batch.append(item)
+            if batch:
+                HISTORY_QUEUE_DEPTH.dec(len(batch))
+                await self._commit(batch)
+        # No await after the final empty() check: once this returns, running is
+        # False and later submit() calls commit directly instead of queueing.
+
+    async def _commit(self, batch: list) -> None:
+        try:
+            async with self._session_factory() as db:
+                db.add_all([entry for entry, _ in batch])
+                try:
+                    await db.commit()
+                except Exception:
+                    # Returns the rows to transient; close() alone would leave them
+                    # detached with an identity, and a retry would insert nothing
+                    await db.rollback()
+                    raise
+        except Exception as exc:
+            if len(batch) == 1:
+                self._resolve(batch, exc)
+                return
+            logger.warning(f"History batch of {len(batch)} failed ({exc}); retrying rows individually")
+            for item in batch:
+                self._reset(item[0])
+                await self._commit([item])
+            return
+        self.batches += 1
+        self.rows += len(batch)
+        HISTORY_BATCH_SIZE.observe(len(batch))
+        self._resolve(batch)
+
+    @staticmethod
+    def _reset(entry: ResumeHistory) -> None:
+        """Undo what the rolled-back flush did to a row so it can be inserted again."""
+        entry.id = None
+        content_store.restage_bodies(entry)
+
+    @staticmethod
+    def _resolve(batch: list, exc: Exception | None = None) -> None:
+        for entry, future in batch:
+            if future is None:
+                if exc is not None:
+                    raise exc
+            elif not future.done():
+                if exc is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(entry.id)
+
+
+history_writer = HistoryWriter()
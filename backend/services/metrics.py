@@ -0,0 +1,126 @@
+"""
+Metrics — Prometheus instruments for the hot paths, exposed at GET /metrics.
+
+Instruments are defined here and updated where the work happens (the HTTP
+middleware in main.py, ai_service, pdf_service, the portfolio renderers,
+database pool and query events, history_writer, rate_limiter).
+
+Under gunicorn every worker is a separate process. Set PROMETHEUS_MULTIPROC_DIR
+to an empty, writable directory before starting (gunicorn.conf.py clears it and
+reports exited workers); prometheus_client then keeps each worker's values in
+memory-mapped files and render_latest() merges them, so any worker can answer
+a scrape. Gauges are summed over live workers ("livesum"). Without the
+variable, metrics are kept in process memory.
+"""
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Latency buckets (seconds): fast API paths, and slow LLM / render work
+_FAST = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_SLOW = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+_WAIT = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+# ── HTTP ─────────────────────────────────────────────────────────────────────
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route"], buckets=_FAST,
+)
+
+# ── Gemini ───────────────────────────────────────────────────────────────────
+GEMINI_REQUESTS = Counter(
+    "gemini_requests_total", "Gemini API attempts by task and outcome (ok, rate_limited, error)",
+    ["task", "outcome"],
+)
+GEMINI_LATENCY = Histogram(
+    "gemini_request_duration_seconds", "Latency of one Gemini API attempt",
+    ["task"], buckets=_SLOW,
+)
+GEMINI_RETRIES = Counter("gemini_retries_total", "Gemini attempts retried after a 429", ["task"])
+GEMINI_TOKENS = Counter(
+    "gemini_estimated_tokens_total", "Estimated Gemini tokens (characters / 4) by task and kind",
+    ["task", "kind"],
+)
+GEMINI_IN_FLIGHT = Gauge(
+    "gemini_requests_in_flight", "Gemini requests currently holding a concurrency slot",
+    multiprocess_mode="livesum",
+)
+
+# ── PDF / portfolio rendering ────────────────────────────────────────────────
+PDF_RENDER_LATENCY = Histogram(
+    "pdf_render_duration_seconds", "Markdown-to-PDF render time by mode (default, fit)",
+    ["mode"], buckets=_SLOW,
+)
+PDF_RENDER_PASSES = Counter("pdf_render_passes_total", "xhtml2pdf layout passes (fit mode runs several)")
+PDF_RENDERS_IN_PROGRESS = Gauge(
+    "pdf_renders_in_progress", "PDF renders currently running",
+    multiprocess_mode="livesum",
+)
+PORTFOLIO_RENDER_LATENCY = Histogram(
+    "portfolio_render_duration_seconds", "Portfolio render time by output (html, bundle)",
+    ["output"], buckets=_FAST,
+)
+
+# ── Database pool ────────────────────────────────────────────────────────────
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a pooled connection (including connect)",
+    buckets=_WAIT,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out", "Pooled connections currently in use",
+    multiprocess_mode="livesum",
+)
+DB_POOL_EVENTS = Counter(
+    "db_pool_events_total", "Pool events (connect, invalidate, timeout)", ["event"],
+)
+
+# ── SQL queries ──────────────────────────────────────────────────────────────
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Time to execute one SQL statement (cursor execute)",
+    buckets=_WAIT,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements run while handling one request, by route template",
+    ["method", "route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than SQL_SLOW_QUERY_MS")
+DB_REPEATED_STATEMENTS = Counter(
+    "db_repeated_statements_total",
+    "Statement shapes run more than SQL_REPEAT_THRESHOLD times in one request (likely N+1)",
+    ["method", "route"],
+)
+
+# ── History writer / rate limiter ────────────────────────────────────────────
+HISTORY_QUEUE_DEPTH = Gauge(
+    "history_writer_queue_depth", "History rows waiting for a group commit",
+    multiprocess_mode="livesum",
+)
+HISTORY_BATCH_SIZE = Histogram(
+    "history_writer_batch_rows", "Rows per history group commit",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "LLM route requests rejected by the rate limiter", ["scope"],
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for Gemini text (about four characters per token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition-format payload and its content type, merged across workers when multiprocess."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,56 @@
+"""
+Pagination helpers — opaque keyset cursors and filters shared by list endpoints.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and
+base64url-wrapped so clients treat it as an opaque token. The next page is
+fetched with a WHERE on that key instead of OFFSET, so deep pages cost the
+same as the first one.
+"""
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """Encode sort-key values (datetimes allowed) into an opaque cursor string."""
+    payload = [
+        {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> list:
+    """Decode a cursor produced by encode_cursor; raises 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != arity:
+            raise ValueError("wrong arity")
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_after(sort_column, id_column, sort_value, id_value, descending: bool):
+    """WHERE clause selecting rows strictly after (sort_value, id_value) in sort order."""
+    if descending:
+        return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < id_value))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > id_value))
+
+
+def ilike_contains(column, text: str):
+    """Case-insensitive substring match on text, taking %, _ and \\ in it literally."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
@@ -0,0 +1,161 @@
+"""
+Password Hasher — bcrypt hashing and verification in a dedicated process pool.
+
+A bcrypt call at BCRYPT_ROUNDS=12 takes ~250 ms of CPU. Run in the app worker
+(even on a thread) it competes with every other request for the GIL, so a
+login burst slows unrelated endpoints. password_hasher runs the work in
+PASSWORD_HASH_WORKERS separate processes instead, so it scales with cores and
+the event loop only waits on a future.
+
+At most PASSWORD_HASH_MAX_PENDING calls may be in flight; past that, callers
+get 503 with Retry-After instead of joining an unbounded queue. verify()
+returns a replacement hash when the stored one was made with an older cost
+(passlib's needs_update), which the login route saves.
+
+When the pool is not running (PASSWORD_HASH_WORKERS=0, scripts, tests without
+lifespan) the same functions run in the threadpool. Workers are started with
+the "spawn" method and only import this module, passlib and config, never the
+app — but as with any spawn pool, a script that starts the app itself must
+keep that under `if __name__ == "__main__":`.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+from config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+
+# ── Worker functions (run in the pool processes) ────────────────────────────
+def hash_password(plain_password: str) -> str:
+    """Hash a plain-text password using bcrypt at BCRYPT_ROUNDS."""
+    return pwd_context.hash(plain_password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Check a password; returns (matches, new hash if the stored one needs an upgrade)."""
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+    return True, None
+
+
+def _warm_up() -> None:
+    pass
+
+
+# ── Pool ─────────────────────────────────────────────────────────────────────
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._seconds_total = 0.0
+        self._seconds_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> None:
+        """Spawn the worker processes up front so the first logins do not pay for it."""
+        if self.running or self.workers <= 0:
+            return
+        self._executor = self._new_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)))
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        executor, self._executor = self._executor, None
+        await run_in_threadpool(executor.shutdown, True)
+
+    async def hash(self, plain_password: str) -> str:
+        return await self._run(hash_password, plain_password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        ok, new_hash = await self._run(verify_password, plain_password, hashed_password)
+        if new_hash is not None:
+            with self._lock:
+                self.rehashed += 1
+        return ok, new_hash
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in requests right now. Please retry shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            executor = self._executor
+            if executor is None:
+                return await run_in_threadpool(fn, *args)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace the pool so later calls work again.
+                logger.error("Password hashing pool broke; starting a new one")
+                if self._executor is executor:
+                    self._executor = self._new_executor()
+                    executor.shutdown(wait=False)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Sign-in is temporarily unavailable. Please retry.",
+                    headers={"Retry-After": "1"},
+                )
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self._seconds_total += elapsed
+                self._seconds_max = max(self._seconds_max, elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            capacity = self.workers if self.running else 0
+            return {
+                "mode": "process_pool" if self.running else "threadpool",
+                "workers": capacity,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - capacity),
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "ms_avg": round(self._seconds_total / self.completed * 1000, 2) if self.completed else 0.0,
+                "ms_max": round(self._seconds_max * 1000, 2),
+            }
+
+
+password_hasher = PasswordHasher()
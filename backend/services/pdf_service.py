@@ -2,66 +2,76 @@
 PDF Export Service — converts Markdown resume to a downloadable PDF.
 Uses markdown2 for HTML conversion and xhtml2pdf (pisa) for PDF rendering.
 Falls back to plain-text PDF if CSS rendering isn't available.
+Fit-to-page mode shrinks the same styles until the resume fits N pages.
+Render time, renders in progress and layout passes are exported as metrics.
 """
 import io
+import re
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+from string import Template
 import markdown2
+from services.metrics import PDF_RENDER_LATENCY, PDF_RENDER_PASSES, PDF_RENDERS_IN_PROGRESS
 
 # ── PDF CSS Styling ────────────────────────────────────────────────────────────
-RESUME_CSS = """
+# Sizes are template variables so fit-to-page mode can scale the same styles.
+_RESUME_CSS_TEMPLATE = Template("""
 @page {
     size: A4;
-    margin: 20mm 15mm 20mm 15mm;
+    margin: ${page_margin_v}mm 15mm ${page_margin_v}mm 15mm;
 }
 
 body {
     font-family: 'Helvetica', 'Arial', sans-serif;
-    font-size: 12pt;
-    line-height: 1.5;
+    font-size: ${body_size}pt;
+    line-height: ${line_height};
     color: #000000;
 }
 
 h1 {
-    font-size: 13pt;
+    font-size: ${heading_size}pt;
     color: #000000;
     font-weight: bold;
     border-bottom: 2px solid #000000;
-    padding-bottom: 4px;
-    margin-bottom: 6px;
+    padding-bottom: ${gap_4}px;
+    margin-bottom: ${gap_6}px;
 }
 
 h2 {
-    font-size: 13pt;
+    font-size: ${heading_size}pt;
     color: #000000;
     font-weight: bold;
     border-bottom: 1px solid #cccccc;
-    margin-top: 14px;
-    margin-bottom: 4px;
+    margin-top: ${gap_14}px;
+    margin-bottom: ${gap_4}px;
 }
 
 h3 {
-    font-size: 13pt;
+    font-size: ${heading_size}pt;
     color: #000000;
     font-weight: bold;
-    margin-bottom: 2px;
+    margin-bottom: ${gap_2}px;
 }
 
 ul {
-    margin-top: 2px;
+    margin-top: ${gap_2}px;
     padding-left: 20px;
 }
 
 li {
-    margin-bottom: 2px;
+    margin-bottom: ${gap_2}px;
 }
 
 p {
-    margin: 4px 0;
+    margin: ${gap_4}px 0;
 }
 
 hr {
     border: none;
     border-top: 1px solid #e0e0e0;
-    margin: 8px 0;
+    margin: ${gap_8}px 0;
 }
 
 strong {
@@ -72,59 +82,169 @@ a {
     color: #1e3a5f;
     text-decoration: none;
 }
-"""
+""")
 
 
-def markdown_to_pdf(markdown_text: str) -> bytes:
-    """
-    Convert a Markdown-formatted resume to a styled PDF.
+def build_resume_css(font_scale: float = 1.0, spacing_scale: float = 1.0) -> str:
+    """Render the resume stylesheet with font sizes and vertical spacing scaled."""
+    def gap(px: int) -> str:
+        return f"{px * spacing_scale:.1f}"
 
-    Args:
-        markdown_text: Resume content in Markdown format
+    return _RESUME_CSS_TEMPLATE.substitute(
+        page_margin_v=f"{20 * (0.5 + 0.5 * spacing_scale):.1f}",
+        body_size=f"{12 * font_scale:.1f}",
+        heading_size=f"{13 * font_scale:.1f}",
+        line_height=f"{1.15 + 0.35 * spacing_scale:.2f}",
+        gap_2=gap(2), gap_4=gap(4), gap_6=gap(6), gap_8=gap(8), gap_14=gap(14),
+    )
 
-    Returns:
-        PDF file as bytes
 
-    Raises:
-        RuntimeError: If PDF generation fails
-    """
-    # Step 1: Convert Markdown → HTML
-    html_body = markdown2.markdown(
+RESUME_CSS = build_resume_css()
+
+# ── Fit-to-page layout ladder ──────────────────────────────────────────────────
+# Ordered from the default look to the most compact one. Font size and spacing
+# shrink together, so "fits in N pages" is monotonic along the ladder and the
+# largest fitting step can be found by binary search.
+LAYOUT_STEPS = [
+    (1.00, 1.00), (0.96, 0.90), (0.92, 0.80), (0.88, 0.70),
+    (0.84, 0.60), (0.80, 0.50), (0.76, 0.40), (0.72, 0.30),
+]
+# Default step, then the binary search, then the final (possibly unmeasured) step
+FIT_MAX_PASSES = 2 + math.ceil(math.log2(len(LAYOUT_STEPS) - 1))
+
+_PAGE_OBJECT_RE = re.compile(rb"/Type\s*/Page\b(?!s)")
+_LAYOUT_CACHE_SIZE = 64
+_layout_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_layout_cache_lock = threading.Lock()
+
+
+def _markdown_to_html_body(markdown_text: str) -> str:
+    return markdown2.markdown(
         markdown_text,
         extras=["tables", "fenced-code-blocks", "strike", "header-ids"]
     )
 
-    full_html = f"""<!DOCTYPE html>
+
+def _wrap_html(html_body: str, css: str) -> str:
+    return f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8"/>
-    <style>{RESUME_CSS}</style>
+    <style>{css}</style>
 </head>
 <body>
 {html_body}
 </body>
 </html>"""
 
-    # Step 2: HTML → PDF using xhtml2pdf (pisa)
-    try:
-        from xhtml2pdf import pisa
 
-        pdf_buffer = io.BytesIO()
-        pisa_status = pisa.CreatePDF(
-            src=full_html,
-            dest=pdf_buffer,
-            encoding='utf-8'
-        )
+def _render_html(full_html: str) -> bytes:
+    """Render a complete HTML document with xhtml2pdf (raises ImportError if missing)."""
+    from xhtml2pdf import pisa
+
+    PDF_RENDER_PASSES.inc()
+    pdf_buffer = io.BytesIO()
+    pisa_status = pisa.CreatePDF(
+        src=full_html,
+        dest=pdf_buffer,
+        encoding='utf-8'
+    )
+
+    if pisa_status.err:
+        raise RuntimeError(f"PDF generation error: {pisa_status.err}")
 
-        if pisa_status.err:
-            raise RuntimeError(f"PDF generation error: {pisa_status.err}")
+    pdf_buffer.seek(0)
+    return pdf_buffer.read()
 
-        pdf_buffer.seek(0)
-        return pdf_buffer.read()
 
+def markdown_to_pdf(markdown_text: str) -> bytes:
+    """
+    Convert a Markdown-formatted resume to a styled PDF.
+
+    Args:
+        markdown_text: Resume content in Markdown format
+
+    Returns:
+        PDF file as bytes
+
+    Raises:
+        RuntimeError: If PDF generation fails
+    """
+    with PDF_RENDERS_IN_PROGRESS.track_inprogress(), PDF_RENDER_LATENCY.labels("default").time():
+        # Step 1: Convert Markdown → HTML
+        html_body = _markdown_to_html_body(markdown_text)
+
+        # Step 2: HTML → PDF using xhtml2pdf (pisa)
+        try:
+            return _render_html(_wrap_html(html_body, RESUME_CSS))
+        except ImportError:
+            # Fallback: use reportlab for basic text-only PDF
+            return _fallback_reportlab_pdf(markdown_text)
+
+
+def _measure_step(html_body: str, body_digest: str, step: int) -> tuple:
+    """
+    Render one ladder step and return (page_count, pdf_bytes).
+    Results are memoized per (content, step), so repeated fit requests for the
+    same resume and the final output render never lay the document out twice.
+    """
+    key = (body_digest, step)
+    with _layout_cache_lock:
+        if key in _layout_cache:
+            _layout_cache.move_to_end(key)
+            return _layout_cache[key]
+
+    font_scale, spacing_scale = LAYOUT_STEPS[step]
+    pdf_bytes = _render_html(_wrap_html(html_body, build_resume_css(font_scale, spacing_scale)))
+    measured = (len(_PAGE_OBJECT_RE.findall(pdf_bytes)), pdf_bytes)
+
+    with _layout_cache_lock:
+        _layout_cache[key] = measured
+        while len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return measured
+
+
+def markdown_to_pdf_fit(markdown_text: str, max_pages: int = 1) -> bytes:
+    """
+    Convert Markdown to PDF using the largest font size and spacing that fit
+    within `max_pages` pages.
+
+    Binary-searches LAYOUT_STEPS, so at most FIT_MAX_PASSES layouts are
+    measured. If even the most compact step overflows, that step is returned.
+
+    Raises:
+        RuntimeError: If PDF generation fails
+    """
+    if max_pages < 1:
+        raise RuntimeError("max_pages must be at least 1")
+
+    with PDF_RENDERS_IN_PROGRESS.track_inprogress(), PDF_RENDER_LATENCY.labels("fit").time():
+        return _fit(markdown_text, max_pages)
+
+
+def _fit(markdown_text: str, max_pages: int) -> bytes:
+    html_body = _markdown_to_html_body(markdown_text)
+    body_digest = hashlib.sha256(html_body.encode("utf-8")).hexdigest()
+
+    try:
+        pages, pdf_bytes = _measure_step(html_body, body_digest, 0)
     except ImportError:
-        # Fallback: use reportlab for basic text-only PDF
         return _fallback_reportlab_pdf(markdown_text)
+    if pages <= max_pages:
+        return pdf_bytes
+
+    # Invariant: step `lo` overflows; the answer lies in (lo, hi]
+    lo, hi = 0, len(LAYOUT_STEPS) - 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        pages, _ = _measure_step(html_body, body_digest, mid)
+        if pages <= max_pages:
+            hi = mid
+        else:
+            lo = mid
+
+    return _measure_step(html_body, body_digest, hi)[1]
 
 
 def _fallback_reportlab_pdf(markdown_text: str) -> bytes:
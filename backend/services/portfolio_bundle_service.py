@@ -0,0 +1,88 @@
+"""
+Portfolio Bundle Service — packages a portfolio as a CDN-ready static site.
+
+The ZIP holds a minified index.html that links a content-hashed shared
+stylesheet, plus precompressed .gz (and .br when Brotli is installed) variants
+of every file so a static host or CDN can serve them without compressing.
+The stylesheet is identical for every user and is built once per THEME_VERSION.
+"""
+import gzip
+import hashlib
+import io
+import re
+import zipfile
+from dataclasses import dataclass
+from functools import lru_cache
+from services.metrics import PORTFOLIO_RENDER_LATENCY
+from services.portfolio_html_service import generate_portfolio_html, PORTFOLIO_CSS, THEME_VERSION
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped without the Brotli package
+    brotli = None
+
+ASSETS_DIR = "assets"
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    path: str
+    body: bytes
+    gz: bytes
+    br: bytes | None
+
+
+def _precompress(path: str, body: bytes) -> StaticAsset:
+    return StaticAsset(
+        path=path,
+        body=body,
+        gz=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body, quality=11) if brotli else None,
+    )
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and collapse whitespace around CSS punctuation."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(html: str) -> str:
+    """Drop HTML comments and whitespace between tags; text content is untouched."""
+    html = re.sub(r"<!--(?!\[).*?-->", "", html, flags=re.S)
+    return re.sub(r">\s+<", "><", html).strip()
+
+
+@lru_cache(maxsize=4)
+def shared_stylesheet(theme_version: str = THEME_VERSION) -> StaticAsset:
+    """Minified, content-hashed portfolio stylesheet for a theme version."""
+    body = minify_css(PORTFOLIO_CSS).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    return _precompress(f"{ASSETS_DIR}/portfolio.{digest}.css", body)
+
+
+@PORTFOLIO_RENDER_LATENCY.labels("bundle").time()
+def build_portfolio_bundle(portfolio: dict, profile: dict) -> bytes:
+    """
+    Render the portfolio as a static site and return it as ZIP bytes.
+
+    Layout:
+        index.html[.gz|.br]
+        assets/portfolio.<hash>.css[.gz|.br]
+    """
+    stylesheet = shared_stylesheet()
+    html = minify_html(generate_portfolio_html(portfolio, profile, stylesheet_href=stylesheet.path))
+    page = _precompress("index.html", html.encode("utf-8"))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as bundle:
+        for asset in (page, stylesheet):
+            bundle.writestr(asset.path, asset.body, compress_type=zipfile.ZIP_DEFLATED)
+            # Already compressed — storing avoids a pointless second deflate pass
+            bundle.writestr(f"{asset.path}.gz", asset.gz, compress_type=zipfile.ZIP_STORED)
+            if asset.br is not None:
+                bundle.writestr(f"{asset.path}.br", asset.br, compress_type=zipfile.ZIP_STORED)
+    return buffer.getvalue()
@@ -1,309 +1,268 @@
 """
 Portfolio HTML Service — generates a complete, self-contained single-page portfolio website.
 All CSS is inlined. Zero external dependencies. Fully downloadable and hostable.
+
+Templates are compiled once at import time into literal chunks and named slots,
+so a render is a single join over pre-split strings plus the escaped values.
 """
+import re
+from html import escape
+from services.metrics import PORTFOLIO_RENDER_LATENCY
 
 
-def generate_portfolio_html(portfolio: dict, profile: dict) -> str:
-    """
-    Convert generated portfolio content + user profile into a beautiful
-    single-file HTML/CSS portfolio website.
+class _CompiledTemplate:
+    """A template split once into literal chunks and {{slot}} names."""
 
-    Args:
-        portfolio: dict from generate_portfolio() containing all text sections
-        profile:   user profile dict (personal_info, skills, projects, etc.)
+    _SLOT = re.compile(r"\{\{(\w+)\}\}")
 
-    Returns:
-        Complete HTML string ready to be saved as .html
-    """
-    pi = profile.get("personal_info", {})
-    name = pi.get("name", "My Portfolio")
-    email = pi.get("email", "")
-    phone = pi.get("phone", "")
-    linkedin = pi.get("linkedin", "")
-    github = pi.get("github", "")
-    website = pi.get("website", "")
-    location = pi.get("location", "")
+    def __init__(self, source: str):
+        parts = self._SLOT.split(source)
+        self._literals = parts[0::2]
+        self._slots = parts[1::2]
 
-    skills = profile.get("skills", [])
-    projects = portfolio.get("project_descriptions", [])
-    about_me = portfolio.get("about_me", "")
-    bio = portfolio.get("professional_bio", "")
-    linkedin_summary = portfolio.get("linkedin_summary", "")
-    github_highlights = portfolio.get("github_highlights", "")
+    def bind(self, **fixed: str) -> "_CompiledTemplate":
+        """Return a copy with some slots folded into the literal chunks."""
+        bound = _CompiledTemplate("")
+        literals, slots = [self._literals[0]], []
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            if slot in fixed:
+                literals[-1] += fixed[slot] + literal
+            else:
+                slots.append(slot)
+                literals.append(literal)
+        bound._literals, bound._slots = literals, slots
+        return bound
 
-    # ── Skills HTML ──────────────────────────────────────────────────────────
-    skills_html = "".join(f'<span class="skill-chip">{s}</span>' for s in skills)
+    def render(self, values: dict) -> str:
+        out = [self._literals[0]]
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            out.append(values[slot])
+            out.append(literal)
+        return "".join(out)
 
-    # ── Projects HTML ─────────────────────────────────────────────────────────
-    projects_html = ""
-    for i, proj in enumerate(projects):
-        p_name = proj.get("name", f"Project {i+1}")
-        p_desc = proj.get("description", "")
-        # Try to get tech stack and link from profile if available
-        profile_projects = profile.get("projects", [])
-        tech = ""
-        link = ""
-        for pp in profile_projects:
-            if pp.get("name", "").lower() == p_name.lower():
-                tech = pp.get("tech_stack", "")
-                link = pp.get("link", "")
-                break
-        link_html = f'<a href="{link}" target="_blank" class="proj-link">🔗 View Project</a>' if link else ""
-        tech_html = f'<p class="proj-tech">🛠 {tech}</p>' if tech else ""
-        projects_html += f"""
-        <div class="project-card">
-            <div class="proj-header">
-                <h3>{p_name}</h3>
-                {link_html}
-            </div>
-            {tech_html}
-            <p class="proj-desc">{p_desc}</p>
-        </div>"""
 
-    # ── Contact links HTML ───────────────────────────────────────────────────
-    contacts = []
-    if email:    contacts.append(f'<a href="mailto:{email}" class="contact-btn">📧 Email Me</a>')
-    if linkedin: contacts.append(f'<a href="{linkedin}" target="_blank" class="contact-btn linkedin">💼 LinkedIn</a>')
-    if github:   contacts.append(f'<a href="{github}" target="_blank" class="contact-btn github">🐙 GitHub</a>')
-    if website:  contacts.append(f'<a href="{website}" target="_blank" class="contact-btn">🌐 Website</a>')
-    contacts_html = "\n".join(contacts)
+# ── Static stylesheet (identical for every portfolio) ────────────────────────
+# Bump THEME_VERSION whenever PORTFOLIO_CSS changes so shared assets are rebuilt.
+THEME_VERSION = "1"
 
-    meta_info = []
-    if location: meta_info.append(f"📍 {location}")
-    if phone:    meta_info.append(f"📞 {phone}")
-    meta_html = "  |  ".join(meta_info)
+PORTFOLIO_CSS = """/* ── Reset & Base ─────────────────────────────────── */
+*, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
+:root {
+    --bg: #0f172a;
+    --bg2: #1e293b;
+    --surface: rgba(30, 41, 59, 0.8);
+    --border: rgba(99, 102, 241, 0.2);
+    --accent: #6366f1;
+    --accent2: #8b5cf6;
+    --accent3: #06b6d4;
+    --text: #e2e8f0;
+    --text2: #94a3b8;
+    --green: #10b981;
+    --radius: 16px;
+}
+html { scroll-behavior: smooth; }
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    background: var(--bg);
+    color: var(--text);
+    line-height: 1.7;
+}
 
-    # ── Github section ───────────────────────────────────────────────────────
-    github_section = ""
-    if github_highlights:
-        github_section = f"""
-    <section id="github" class="section alt-bg">
-        <div class="container">
-            <h2 class="section-title">🐙 GitHub Highlights</h2>
-            <div class="github-card">
-                <pre class="github-text">{github_highlights}</pre>
-                {f'<a href="{github}" target="_blank" class="btn-outline">View GitHub Profile →</a>' if github else ""}
-            </div>
-        </div>
-    </section>"""
+/* ── Noise texture overlay ────────────────────────── */
+body::before {
+    content: '';
+    position: fixed; inset: 0; z-index: -1;
+    background: radial-gradient(ellipse at 20% 20%, rgba(99,102,241,0.12) 0%, transparent 60%),
+                radial-gradient(ellipse at 80% 80%, rgba(139,92,246,0.10) 0%, transparent 60%);
+}
+
+/* ── Nav ──────────────────────────────────────────── */
+nav {
+    position: fixed; top: 0; width: 100%; z-index: 100;
+    background: rgba(15,23,42,0.85);
+    backdrop-filter: blur(12px);
+    border-bottom: 1px solid var(--border);
+    padding: 0 2rem;
+    display: flex; align-items: center; justify-content: space-between;
+    height: 64px;
+}
+.nav-brand {
+    font-size: 1.2rem; font-weight: 800;
+    background: linear-gradient(135deg, var(--accent), var(--accent2));
+    -webkit-background-clip: text; -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+.nav-links { display: flex; gap: 2rem; list-style: none; }
+.nav-links a {
+    color: var(--text2); text-decoration: none; font-size: 0.9rem;
+    transition: color 0.2s;
+}
+.nav-links a:hover { color: var(--accent); }
+
+/* ── Hero ─────────────────────────────────────────── */
+.hero {
+    min-height: 100vh;
+    display: flex; align-items: center; justify-content: center;
+    text-align: center; padding: 6rem 2rem 4rem;
+    position: relative; overflow: hidden;
+}
+.hero-avatar {
+    width: 100px; height: 100px; border-radius: 50%;
+    background: linear-gradient(135deg, var(--accent), var(--accent2));
+    display: flex; align-items: center; justify-content: center;
+    font-size: 2.5rem; font-weight: 900; margin: 0 auto 1.5rem;
+    box-shadow: 0 0 40px rgba(99,102,241,0.4);
+    animation: float 3s ease-in-out infinite;
+}
+@keyframes float {
+    0%, 100% { transform: translateY(0); }
+    50% { transform: translateY(-10px); }
+}
+.hero h1 {
+    font-size: clamp(2.5rem, 6vw, 5rem); font-weight: 900;
+    line-height: 1.1; margin-bottom: 1rem;
+    background: linear-gradient(135deg, var(--text), var(--accent), var(--accent2));
+    -webkit-background-clip: text; -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+.hero-meta { color: var(--text2); margin-bottom: 1.5rem; font-size: 0.95rem; }
+.hero-bio {
+    max-width: 650px; margin: 0 auto 2.5rem;
+    color: var(--text2); font-size: 1.05rem;
+}
+.hero-cta { display: flex; gap: 1rem; justify-content: center; flex-wrap: wrap; }
+.btn-primary {
+    background: linear-gradient(135deg, var(--accent), var(--accent2));
+    color: #fff; padding: 0.75rem 1.75rem;
+    border-radius: 12px; text-decoration: none; font-weight: 600;
+    transition: transform 0.2s, box-shadow 0.2s;
+    box-shadow: 0 4px 20px rgba(99,102,241,0.3);
+}
+.btn-primary:hover { transform: translateY(-2px); box-shadow: 0 8px 30px rgba(99,102,241,0.5); }
+.btn-outline {
+    border: 1px solid var(--accent); color: var(--accent);
+    padding: 0.75rem 1.75rem; border-radius: 12px; text-decoration: none;
+    font-weight: 600; transition: all 0.2s; display: inline-block; margin-top: 1rem;
+}
+.btn-outline:hover { background: var(--accent); color: #fff; }
+
+/* ── Section ──────────────────────────────────────── */
+.section { padding: 6rem 2rem; }
+.alt-bg { background: rgba(30,41,59,0.4); }
+.container { max-width: 1000px; margin: 0 auto; }
+.section-title {
+    font-size: 2rem; font-weight: 800; margin-bottom: 0.5rem;
+    background: linear-gradient(135deg, var(--text), var(--accent));
+    -webkit-background-clip: text; -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+.section-subtitle {
+    color: var(--text2); margin-bottom: 3rem; font-size: 0.95rem;
+}
 
-    return f"""<!DOCTYPE html>
+/* ── About ────────────────────────────────────────── */
+.about-text {
+    background: var(--surface);
+    border: 1px solid var(--border);
+    border-radius: var(--radius); padding: 2rem;
+    white-space: pre-wrap; line-height: 1.8;
+}
+
+/* ── Skills ───────────────────────────────────────── */
+.skills-grid { display: flex; flex-wrap: wrap; gap: 0.75rem; }
+.skill-chip {
+    background: rgba(99,102,241,0.15);
+    border: 1px solid rgba(99,102,241,0.3);
+    color: #a5b4fc; padding: 0.4rem 1rem;
+    border-radius: 999px; font-size: 0.85rem; font-weight: 500;
+    transition: all 0.2s;
+}
+.skill-chip:hover {
+    background: rgba(99,102,241,0.3);
+    transform: translateY(-2px);
+}
+
+/* ── Projects ─────────────────────────────────────── */
+.projects-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 1.5rem; }
+.project-card {
+    background: var(--surface);
+    border: 1px solid var(--border);
+    border-radius: var(--radius); padding: 1.5rem;
+    transition: transform 0.2s, border-color 0.2s, box-shadow 0.2s;
+}
+.project-card:hover {
+    transform: translateY(-4px);
+    border-color: var(--accent);
+    box-shadow: 0 8px 30px rgba(99,102,241,0.2);
+}
+.proj-header { display: flex; justify-content: space-between; align-items: flex-start; gap: 1rem; margin-bottom: 0.5rem; }
+.proj-header h3 { font-size: 1rem; font-weight: 700; }
+.proj-link {
+    color: var(--accent3); font-size: 0.8rem; text-decoration: none;
+    white-space: nowrap; border: 1px solid rgba(6,182,212,0.3);
+    padding: 0.2rem 0.6rem; border-radius: 6px;
+}
+.proj-tech { color: var(--text2); font-size: 0.8rem; margin-bottom: 0.75rem; }
+.proj-desc { color: var(--text2); font-size: 0.875rem; line-height: 1.6; }
+
+/* ── LinkedIn Summary ─────────────────────────────── */
+.linkedin-card {
+    background: linear-gradient(135deg, rgba(10,102,194,0.1), rgba(99,102,241,0.1));
+    border: 1px solid rgba(10,102,194,0.3);
+    border-radius: var(--radius); padding: 2rem;
+}
+.linkedin-card p { white-space: pre-wrap; line-height: 1.8; color: var(--text2); }
+
+/* ── GitHub ───────────────────────────────────────── */
+.github-card {
+    background: rgba(30,41,59,0.8);
+    border: 1px solid rgba(99,102,241,0.2);
+    border-radius: var(--radius); padding: 2rem;
+}
+.github-text {
+    font-family: 'Courier New', monospace; font-size: 0.85rem;
+    white-space: pre-wrap; color: var(--text2); margin-bottom: 1.5rem;
+}
+
+/* ── Contact ──────────────────────────────────────── */
+.contact-btns { display: flex; gap: 1rem; flex-wrap: wrap; justify-content: center; margin-top: 2rem; }
+.contact-btn {
+    display: inline-flex; align-items: center; gap: 0.5rem;
+    padding: 0.8rem 1.5rem; border-radius: 12px;
+    text-decoration: none; font-weight: 600; font-size: 0.9rem;
+    border: 1px solid var(--border); color: var(--text);
+    background: var(--surface); transition: all 0.2s;
+}
+.contact-btn:hover { border-color: var(--accent); color: var(--accent); transform: translateY(-2px); }
+.contact-btn.linkedin { border-color: rgba(10,102,194,0.5); }
+.contact-btn.github { border-color: rgba(255,255,255,0.2); }
+
+/* ── Footer ───────────────────────────────────────── */
+footer {
+    text-align: center; padding: 2rem;
+    border-top: 1px solid var(--border); color: var(--text2); font-size: 0.85rem;
+}
+
+/* ── Responsive ───────────────────────────────────── */
+@media (max-width: 640px) {
+    .nav-links { display: none; }
+    .hero h1 { font-size: 2.2rem; }
+}
+"""
+
+# ── Templates ────────────────────────────────────────────────────────────────
+_PAGE = _CompiledTemplate("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{name} — Portfolio</title>
-    <style>
-        /* ── Reset & Base ─────────────────────────────────── */
-        *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-        :root {{
-            --bg: #0f172a;
-            --bg2: #1e293b;
-            --surface: rgba(30, 41, 59, 0.8);
-            --border: rgba(99, 102, 241, 0.2);
-            --accent: #6366f1;
-            --accent2: #8b5cf6;
-            --accent3: #06b6d4;
-            --text: #e2e8f0;
-            --text2: #94a3b8;
-            --green: #10b981;
-            --radius: 16px;
-        }}
-        html {{ scroll-behavior: smooth; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: var(--bg);
-            color: var(--text);
-            line-height: 1.7;
-        }}
-
-        /* ── Noise texture overlay ────────────────────────── */
-        body::before {{
-            content: '';
-            position: fixed; inset: 0; z-index: -1;
-            background: radial-gradient(ellipse at 20% 20%, rgba(99,102,241,0.12) 0%, transparent 60%),
-                        radial-gradient(ellipse at 80% 80%, rgba(139,92,246,0.10) 0%, transparent 60%);
-        }}
-
-        /* ── Nav ──────────────────────────────────────────── */
-        nav {{
-            position: fixed; top: 0; width: 100%; z-index: 100;
-            background: rgba(15,23,42,0.85);
-            backdrop-filter: blur(12px);
-            border-bottom: 1px solid var(--border);
-            padding: 0 2rem;
-            display: flex; align-items: center; justify-content: space-between;
-            height: 64px;
-        }}
-        .nav-brand {{
-            font-size: 1.2rem; font-weight: 800;
-            background: linear-gradient(135deg, var(--accent), var(--accent2));
-            -webkit-background-clip: text; -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-        .nav-links {{ display: flex; gap: 2rem; list-style: none; }}
-        .nav-links a {{
-            color: var(--text2); text-decoration: none; font-size: 0.9rem;
-            transition: color 0.2s;
-        }}
-        .nav-links a:hover {{ color: var(--accent); }}
-
-        /* ── Hero ─────────────────────────────────────────── */
-        .hero {{
-            min-height: 100vh;
-            display: flex; align-items: center; justify-content: center;
-            text-align: center; padding: 6rem 2rem 4rem;
-            position: relative; overflow: hidden;
-        }}
-        .hero-avatar {{
-            width: 100px; height: 100px; border-radius: 50%;
-            background: linear-gradient(135deg, var(--accent), var(--accent2));
-            display: flex; align-items: center; justify-content: center;
-            font-size: 2.5rem; font-weight: 900; margin: 0 auto 1.5rem;
-            box-shadow: 0 0 40px rgba(99,102,241,0.4);
-            animation: float 3s ease-in-out infinite;
-        }}
-        @keyframes float {{
-            0%, 100% {{ transform: translateY(0); }}
-            50% {{ transform: translateY(-10px); }}
-        }}
-        .hero h1 {{
-            font-size: clamp(2.5rem, 6vw, 5rem); font-weight: 900;
-            line-height: 1.1; margin-bottom: 1rem;
-            background: linear-gradient(135deg, var(--text), var(--accent), var(--accent2));
-            -webkit-background-clip: text; -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-        .hero-meta {{ color: var(--text2); margin-bottom: 1.5rem; font-size: 0.95rem; }}
-        .hero-bio {{
-            max-width: 650px; margin: 0 auto 2.5rem;
-            color: var(--text2); font-size: 1.05rem;
-        }}
-        .hero-cta {{ display: flex; gap: 1rem; justify-content: center; flex-wrap: wrap; }}
-        .btn-primary {{
-            background: linear-gradient(135deg, var(--accent), var(--accent2));
-            color: #fff; padding: 0.75rem 1.75rem;
-            border-radius: 12px; text-decoration: none; font-weight: 600;
-            transition: transform 0.2s, box-shadow 0.2s;
-            box-shadow: 0 4px 20px rgba(99,102,241,0.3);
-        }}
-        .btn-primary:hover {{ transform: translateY(-2px); box-shadow: 0 8px 30px rgba(99,102,241,0.5); }}
-        .btn-outline {{
-            border: 1px solid var(--accent); color: var(--accent);
-            padding: 0.75rem 1.75rem; border-radius: 12px; text-decoration: none;
-            font-weight: 600; transition: all 0.2s; display: inline-block; margin-top: 1rem;
-        }}
-        .btn-outline:hover {{ background: var(--accent); color: #fff; }}
-
-        /* ── Section ──────────────────────────────────────── */
-        .section {{ padding: 6rem 2rem; }}
-        .alt-bg {{ background: rgba(30,41,59,0.4); }}
-        .container {{ max-width: 1000px; margin: 0 auto; }}
-        .section-title {{
-            font-size: 2rem; font-weight: 800; margin-bottom: 0.5rem;
-            background: linear-gradient(135deg, var(--text), var(--accent));
-            -webkit-background-clip: text; -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-        .section-subtitle {{
-            color: var(--text2); margin-bottom: 3rem; font-size: 0.95rem;
-        }}
-
-        /* ── About ────────────────────────────────────────── */
-        .about-text {{
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: var(--radius); padding: 2rem;
-            white-space: pre-wrap; line-height: 1.8;
-        }}
-
-        /* ── Skills ───────────────────────────────────────── */
-        .skills-grid {{ display: flex; flex-wrap: wrap; gap: 0.75rem; }}
-        .skill-chip {{
-            background: rgba(99,102,241,0.15);
-            border: 1px solid rgba(99,102,241,0.3);
-            color: #a5b4fc; padding: 0.4rem 1rem;
-            border-radius: 999px; font-size: 0.85rem; font-weight: 500;
-            transition: all 0.2s;
-        }}
-        .skill-chip:hover {{
-            background: rgba(99,102,241,0.3);
-            transform: translateY(-2px);
-        }}
-
-        /* ── Projects ─────────────────────────────────────── */
-        .projects-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 1.5rem; }}
-        .project-card {{
-            background: var(--surface);
-            border: 1px solid var(--border);
-            border-radius: var(--radius); padding: 1.5rem;
-            transition: transform 0.2s, border-color 0.2s, box-shadow 0.2s;
-        }}
-        .project-card:hover {{
-            transform: translateY(-4px);
-            border-color: var(--accent);
-            box-shadow: 0 8px 30px rgba(99,102,241,0.2);
-        }}
-        .proj-header {{ display: flex; justify-content: space-between; align-items: flex-start; gap: 1rem; margin-bottom: 0.5rem; }}
-        .proj-header h3 {{ font-size: 1rem; font-weight: 700; }}
-        .proj-link {{
-            color: var(--accent3); font-size: 0.8rem; text-decoration: none;
-            white-space: nowrap; border: 1px solid rgba(6,182,212,0.3);
-            padding: 0.2rem 0.6rem; border-radius: 6px;
-        }}
-        .proj-tech {{ color: var(--text2); font-size: 0.8rem; margin-bottom: 0.75rem; }}
-        .proj-desc {{ color: var(--text2); font-size: 0.875rem; line-height: 1.6; }}
-
-        /* ── LinkedIn Summary ─────────────────────────────── */
-        .linkedin-card {{
-            background: linear-gradient(135deg, rgba(10,102,194,0.1), rgba(99,102,241,0.1));
-            border: 1px solid rgba(10,102,194,0.3);
-            border-radius: var(--radius); padding: 2rem;
-        }}
-        .linkedin-card p {{ white-space: pre-wrap; line-height: 1.8; color: var(--text2); }}
-
-        /* ── GitHub ───────────────────────────────────────── */
-        .github-card {{
-            background: rgba(30,41,59,0.8);
-            border: 1px solid rgba(99,102,241,0.2);
-            border-radius: var(--radius); padding: 2rem;
-        }}
-        .github-text {{
-            font-family: 'Courier New', monospace; font-size: 0.85rem;
-            white-space: pre-wrap; color: var(--text2); margin-bottom: 1.5rem;
-        }}
-
-        /* ── Contact ──────────────────────────────────────── */
-        .contact-btns {{ display: flex; gap: 1rem; flex-wrap: wrap; justify-content: center; margin-top: 2rem; }}
-        .contact-btn {{
-            display: inline-flex; align-items: center; gap: 0.5rem;
-            padding: 0.8rem 1.5rem; border-radius: 12px;
-            text-decoration: none; font-weight: 600; font-size: 0.9rem;
-            border: 1px solid var(--border); color: var(--text);
-            background: var(--surface); transition: all 0.2s;
-        }}
-        .contact-btn:hover {{ border-color: var(--accent); color: var(--accent); transform: translateY(-2px); }}
-        .contact-btn.linkedin {{ border-color: rgba(10,102,194,0.5); }}
-        .contact-btn.github {{ border-color: rgba(255,255,255,0.2); }}
-
-        /* ── Footer ───────────────────────────────────────── */
-        footer {{
-            text-align: center; padding: 2rem;
-            border-top: 1px solid var(--border); color: var(--text2); font-size: 0.85rem;
-        }}
-
-        /* ── Responsive ───────────────────────────────────── */
-        @media (max-width: 640px) {{
-            .nav-links {{ display: none; }}
-            .hero h1 {{ font-size: 2.2rem; }}
-        }}
-    </style>
+    <title>{{name}} — Portfolio</title>
+    {{styles}}
 </head>
 <body>
     <!-- Navigation -->
     <nav>
-        <div class="nav-brand">{name}</div>
+        <div class="nav-brand">{{name}}</div>
         <ul class="nav-links">
             <li><a href="#about">About</a></li>
             <li><a href="#skills">Skills</a></li>
@@ -315,13 +274,13 @@ def generate_portfolio_html(portfolio: dict, profile: dict) -> str:
     <!-- Hero -->
     <section class="hero">
         <div>
-            <div class="hero-avatar">{name[0].upper() if name else "👤"}</div>
-            <h1>{name}</h1>
-            <p class="hero-meta">{meta_html}</p>
-            <p class="hero-bio">{bio or about_me}</p>
+            <div class="hero-avatar">{{initial}}</div>
+            <h1>{{name}}</h1>
+            <p class="hero-meta">{{meta}}</p>
+            <p class="hero-bio">{{hero_bio}}</p>
             <div class="hero-cta">
-                {f'<a href="#{{}}" class="btn-primary contact-btn" onclick="document.getElementById(\'contact\').scrollIntoView()" href="#contact">Get In Touch →</a>'.format("") if email else ""}
-                {f'<a href="{github}" target="_blank" class="btn-outline">GitHub Profile</a>' if github else ""}
+                {{cta_contact}}
+                {{cta_github}}
             </div>
         </div>
     </section>
@@ -331,7 +290,7 @@ def generate_portfolio_html(portfolio: dict, profile: dict) -> str:
         <div class="container">
             <h2 class="section-title">👋 About Me</h2>
             <p class="section-subtitle">Who I am and what I'm passionate about</p>
-            <div class="about-text">{about_me}</div>
+            <div class="about-text">{{about_me}}</div>
         </div>
     </section>
 
@@ -340,7 +299,7 @@ def generate_portfolio_html(portfolio: dict, profile: dict) -> str:
         <div class="container">
             <h2 class="section-title">🛠 Technical Skills</h2>
             <p class="section-subtitle">Technologies and tools I work with</p>
-            <div class="skills-grid">{skills_html}</div>
+            <div class="skills-grid">{{skills}}</div>
         </div>
     </section>
 
@@ -349,7 +308,7 @@ def generate_portfolio_html(portfolio: dict, profile: dict) -> str:
         <div class="container">
             <h2 class="section-title">🚀 Projects</h2>
             <p class="section-subtitle">Things I've built</p>
-            <div class="projects-grid">{projects_html}</div>
+            <div class="projects-grid">{{projects}}</div>
         </div>
     </section>
 
@@ -359,12 +318,12 @@ def generate_portfolio_html(portfolio: dict, profile: dict) -> str:
             <h2 class="section-title">💼 LinkedIn Summary</h2>
             <p class="section-subtitle">My professional narrative</p>
             <div class="linkedin-card">
-                <p>{linkedin_summary}</p>
+                <p>{{linkedin_summary}}</p>
             </div>
         </div>
     </section>
 
-    {github_section}
+    {{github_section}}
 
     <!-- Contact -->
     <section id="contact" class="section alt-bg">
@@ -372,14 +331,142 @@ def generate_portfolio_html(portfolio: dict, profile: dict) -> str:
             <h2 class="section-title">📬 Get In Touch</h2>
             <p class="section-subtitle">Open to opportunities and collaborations</p>
             <div class="contact-btns">
-                {contacts_html}
+                {{contacts}}
             </div>
         </div>
     </section>
 
     <!-- Footer -->
     <footer>
-        <p>© 2026 {name} — Portfolio generated with AI Resume & Portfolio Builder</p>
+        <p>© 2026 {{name}} — Portfolio generated with AI Resume & Portfolio Builder</p>
     </footer>
 </body>
-</html>"""
+</html>""")
+
+# The stylesheet is folded in once so each render only joins the dynamic parts
+_INLINE_PAGE = _PAGE.bind(styles=f"<style>\n{PORTFOLIO_CSS}</style>")
+
+_PROJECT_CARD = _CompiledTemplate("""
+        <div class="project-card">
+            <div class="proj-header">
+                <h3>{{name}}</h3>
+                {{link}}
+            </div>
+            {{tech}}
+            <p class="proj-desc">{{description}}</p>
+        </div>""")
+
+_GITHUB_SECTION = _CompiledTemplate("""
+    <section id="github" class="section alt-bg">
+        <div class="container">
+            <h2 class="section-title">🐙 GitHub Highlights</h2>
+            <div class="github-card">
+                <pre class="github-text">{{highlights}}</pre>
+                {{profile_link}}
+            </div>
+        </div>
+    </section>""")
+
+_SAFE_URL_SCHEMES = ("http://", "https://", "mailto:", "#", "/")
+
+
+def _url(value: str) -> str:
+    """Escape a user-supplied URL for an href, dropping script-capable schemes."""
+    value = (value or "").strip()
+    if not value:
+        return ""
+    if ":" in value.split("/", 1)[0] and not value.lower().startswith(_SAFE_URL_SCHEMES):
+        return ""
+    return escape(value, quote=True)
+
+
+def _project_index(profile_projects: list) -> dict:
+    """Map lower-cased project name -> profile project (first occurrence wins)."""
+    index = {}
+    for pp in profile_projects:
+        index.setdefault((pp.get("name") or "").lower(), pp)
+    return index
+
+
+def _project_cards(projects: list, profile_projects: list) -> str:
+    index = _project_index(profile_projects)
+    cards = []
+    for i, proj in enumerate(projects):
+        p_name = proj.get("name", f"Project {i+1}")
+        # Tech stack and link come from the profile entry with the same name
+        pp = index.get(p_name.lower(), {})
+        tech = pp.get("tech_stack", "")
+        link = _url(pp.get("link", ""))
+        cards.append(_PROJECT_CARD.render({
+            "name": escape(p_name),
+            "link": f'<a href="{link}" target="_blank" class="proj-link">🔗 View Project</a>' if link else "",
+            "tech": f'<p class="proj-tech">🛠 {escape(tech)}</p>' if tech else "",
+            "description": escape(proj.get("description", "")),
+        }))
+    return "".join(cards)
+
+
+@PORTFOLIO_RENDER_LATENCY.labels("html").time()
+def generate_portfolio_html(portfolio: dict, profile: dict, stylesheet_href: str = None) -> str:
+    """
+    Convert generated portfolio content + user profile into a beautiful
+    single-file HTML/CSS portfolio website.
+
+    Args:
+        portfolio:       dict from generate_portfolio() containing all text sections
+        profile:         user profile dict (personal_info, skills, projects, etc.)
+        stylesheet_href: link this external stylesheet instead of inlining PORTFOLIO_CSS
+
+    Returns:
+        Complete HTML string ready to be saved as .html
+    """
+    pi = profile.get("personal_info", {})
+    name = pi.get("name", "My Portfolio")
+    email = pi.get("email", "")
+    phone = pi.get("phone", "")
+    linkedin = _url(pi.get("linkedin", ""))
+    github = _url(pi.get("github", ""))
+    website = _url(pi.get("website", ""))
+    location = pi.get("location", "")
+
+    about_me = portfolio.get("about_me", "")
+    bio = portfolio.get("professional_bio", "")
+    github_highlights = portfolio.get("github_highlights", "")
+
+    # ── Contact links HTML ───────────────────────────────────────────────────
+    contacts = []
+    if email:    contacts.append(f'<a href="mailto:{escape(email)}" class="contact-btn">📧 Email Me</a>')
+    if linkedin: contacts.append(f'<a href="{linkedin}" target="_blank" class="contact-btn linkedin">💼 LinkedIn</a>')
+    if github:   contacts.append(f'<a href="{github}" target="_blank" class="contact-btn github">🐙 GitHub</a>')
+    if website:  contacts.append(f'<a href="{website}" target="_blank" class="contact-btn">🌐 Website</a>')
+
+    meta_info = []
+    if location: meta_info.append(f"📍 {escape(location)}")
+    if phone:    meta_info.append(f"📞 {escape(phone)}")
+
+    # ── Github section ───────────────────────────────────────────────────────
+    github_section = ""
+    if github_highlights:
+        github_section = _GITHUB_SECTION.render({
+            "highlights": escape(github_highlights),
+            "profile_link": f'<a href="{github}" target="_blank" class="btn-outline">View GitHub Profile →</a>' if github else "",
+        })
+
+    values = {
+        "name": escape(name),
+        "initial": escape(name[0].upper()) if name else "👤",
+        "meta": "  |  ".join(meta_info),
+        "hero_bio": escape(bio or about_me),
+        "cta_contact": '<a href="#contact" class="btn-primary contact-btn">Get In Touch →</a>' if email else "",
+        "cta_github": f'<a href="{github}" target="_blank" class="btn-outline">GitHub Profile</a>' if github else "",
+        "about_me": escape(about_me),
+        "skills": "".join(f'<span class="skill-chip">{escape(s)}</span>' for s in profile.get("skills", [])),
+        "projects": _project_cards(portfolio.get("project_descriptions", []), profile.get("projects", [])),
+        "linkedin_summary": escape(portfolio.get("linkedin_summary", "")),
+        "github_section": github_section,
+        "contacts": "\n".join(contacts),
+    }
+    if stylesheet_href:
+        values["styles"] = f'<link rel="stylesheet" href="{escape(stylesheet_href, quote=True)}">'
+        return _PAGE.render(values)
+    return _INLINE_PAGE.render(values)
@@ -0,0 +1,130 @@
+"""
+Portfolio Page Cache — in-process LRU of rendered public portfolio pages.
+
+Each entry holds the final HTML, a pre-gzipped copy and strong ETags, so a
+cache hit on /p/{slug} is served without touching the database or re-rendering.
+Slugs that resolved to no page are remembered as misses for
+PORTFOLIO_MISS_CACHE_TTL seconds, so probing unknown or unpublished slugs costs
+one query per slug and TTL rather than one per request.
+
+Writers call invalidate_user() when a new portfolio is generated, the profile
+changes or the user publishes/unpublishes; it drops both pages and misses.
+Entries also expire after their TTL to bound staleness in worker processes that
+did not see the invalidation.
+"""
+import gzip
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from config import PORTFOLIO_PAGE_CACHE_SIZE, PORTFOLIO_PAGE_CACHE_TTL, PORTFOLIO_MISS_CACHE_TTL
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    user_id: int
+    html: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+    expires_at: float
+
+
+def portfolio_slug(name: str, user_id: int) -> str:
+    """Public slug for a user's portfolio, e.g. 'ada-lovelace-42'."""
+    base = re.sub(r"[^a-z0-9]+", "-", (name or "").lower()).strip("-")[:48].strip("-")
+    return f"{base}-{user_id}" if base else str(user_id)
+
+
+def user_id_from_slug(slug: str) -> int | None:
+    """Extract the trailing user id from a slug, or None if it has none."""
+    match = re.search(r"(?:^|-)(\d+)$", slug)
+    return int(match.group(1)) if match else None
+
+
+class PortfolioPageCache:
+    def __init__(self, max_entries: int, ttl_seconds: int, miss_ttl_seconds: int):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._miss_ttl = miss_ttl_seconds
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._slugs_by_user: dict = {}
+        self._misses: "OrderedDict[str, tuple[int, float]]" = OrderedDict()   # slug -> (user_id, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, slug: str) -> CachedPage | None:
+        with self._lock:
+            page = self._pages.get(slug)
+            if page is None:
+                return None
+            if page.expires_at <= time.monotonic():
+                self._drop(slug)
+                return None
+            self._pages.move_to_end(slug)
+            return page
+
+    def put(self, slug: str, user_id: int, html: str) -> CachedPage:
+        body = html.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        page = CachedPage(
+            user_id=user_id,
+            html=body,
+            gzipped=gzip.compress(body, compresslevel=6, mtime=0),
+            etag=f'"{digest}"',
+            gzip_etag=f'"{digest}-gz"',
+            expires_at=time.monotonic() + self._ttl,
+        )
+        with self._lock:
+            self._pages[slug] = page
+            self._pages.move_to_end(slug)
+            self._slugs_by_user.setdefault(user_id, set()).add(slug)
+            while len(self._pages) > self._max_entries:
+                self._drop(next(iter(self._pages)))
+        return page
+
+    def is_miss(self, slug: str) -> bool:
+        """True if slug recently resolved to no page."""
+        with self._lock:
+            entry = self._misses.get(slug)
+            if entry is None:
+                return False
+            if entry[1] <= time.monotonic():
+                del self._misses[slug]
+                return False
+            return True
+
+    def put_miss(self, slug: str, user_id: int) -> None:
+        if self._miss_ttl <= 0:
+            return
+        with self._lock:
+            self._misses[slug] = (user_id, time.monotonic() + self._miss_ttl)
+            self._misses.move_to_end(slug)
+            while len(self._misses) > self._max_entries:
+                self._misses.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for slug in self._slugs_by_user.pop(user_id, ()):
+                self._pages.pop(slug, None)
+            for slug in [s for s, (uid, _) in self._misses.items() if uid == user_id]:
+                del self._misses[slug]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._slugs_by_user.clear()
+            self._misses.clear()
+
+    def _drop(self, slug: str) -> None:
+        page = self._pages.pop(slug, None)
+        if page is not None:
+            slugs = self._slugs_by_user.get(page.user_id)
+            if slugs is not None:
+                slugs.discard(slug)
+                if not slugs:
+                    del self._slugs_by_user[page.user_id]
+
+
+page_cache = PortfolioPageCache(PORTFOLIO_PAGE_CACHE_SIZE, PORTFOLIO_PAGE_CACHE_TTL, PORTFOLIO_MISS_CACHE_TTL)
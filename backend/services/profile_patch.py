@@ -0,0 +1,158 @@
+"""
+Profile Patch Service — applies JSON-Patch style operations to profile sections.
+
+Paths are JSON Pointers rooted at the profile (see schemas.profile.ProfilePatchOperation).
+apply_patch() works on plain section values and returns only the sections it
+changed, copying each one before the first edit, so the caller can write just
+those columns and bump just their versions. Any invalid operation rejects the
+whole patch with 422 before anything is written.
+"""
+import copy
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from schemas.profile import (
+    PersonalInfo, EducationItem, ExperienceItem, ProjectItem, CertificationItem, InternshipItem,
+)
+
+# List sections whose items are objects, and the schema each item must satisfy
+ITEM_SECTIONS = {
+    "education": EducationItem,
+    "experience": ExperienceItem,
+    "projects": ProjectItem,
+    "certifications": CertificationItem,
+    "internships": InternshipItem,
+}
+SECTIONS = ("personal_info", *ITEM_SECTIONS, "skills", "achievements")
+
+
+def empty_section(section: str):
+    if section == "personal_info":
+        return {}
+    if section == "achievements":
+        return None
+    return []
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+
+def _parse_path(path: str) -> list:
+    if not path.startswith("/"):
+        raise _invalid(f"Invalid path '{path}': must start with '/'")
+    tokens = [t.replace("~1", "/").replace("~0", "~") for t in path[1:].split("/")]
+    if tokens[0] not in SECTIONS:
+        raise _invalid(f"Unknown profile section '{tokens[0]}'")
+    return tokens
+
+
+def _validated(model: type[BaseModel], value, path: str) -> dict:
+    try:
+        return model.model_validate(value).model_dump()
+    except ValidationError as e:
+        raise _invalid(f"Invalid value for '{path}': {e.errors()[0]['msg']}")
+
+
+def _validated_section(section: str, value, path: str):
+    if section == "personal_info":
+        return _validated(PersonalInfo, value, path)
+    if section == "achievements":
+        if value is not None and not isinstance(value, str):
+            raise _invalid(f"Invalid value for '{path}': expected a string")
+        return value
+    if not isinstance(value, list):
+        raise _invalid(f"Invalid value for '{path}': expected a list")
+    if section == "skills":
+        return [_validated_skill(v, path) for v in value]
+    return [_validated(ITEM_SECTIONS[section], v, path) for v in value]
+
+
+def _validated_skill(value, path: str) -> str:
+    if not isinstance(value, str):
+        raise _invalid(f"Invalid value for '{path}': skills are strings")
+    return value
+
+
+def _index(token: str, items: list, path: str, allow_end: bool) -> int:
+    if allow_end and token == "-":
+        return len(items)
+    if not token.isdigit():
+        raise _invalid(f"Invalid index '{token}' in '{path}'")
+    idx = int(token)
+    if idx > len(items) or (idx == len(items) and not allow_end):
+        raise _invalid(f"Index {idx} out of range in '{path}'")
+    return idx
+
+
+def _check_field(model: type[BaseModel], field: str, path: str) -> None:
+    if field not in model.model_fields:
+        raise _invalid(f"Unknown field '{field}' in '{path}'")
+
+
+def apply_patch(sections: dict, operations) -> dict:
+    """
+    Apply operations to sections ({section: current value}) and return
+    {section: new value} for every section that ended up different.
+    """
+    working = {}
+
+    def section_value(name):
+        if name not in working:
+            current = sections.get(name)
+            working[name] = copy.deepcopy(current) if current is not None else empty_section(name)
+        return working[name]
+
+    for op in operations:
+        tokens = _parse_path(op.path)
+        section = tokens[0]
+
+        if len(tokens) == 1:
+            if op.op == "remove":
+                working[section] = empty_section(section)
+            else:
+                working[section] = _validated_section(section, op.value, op.path)
+            continue
+
+        if section == "achievements":
+            raise _invalid(f"Invalid path '{op.path}': achievements has no sub-paths")
+
+        if section == "personal_info":
+            if len(tokens) != 2:
+                raise _invalid(f"Invalid path '{op.path}'")
+            _check_field(PersonalInfo, tokens[1], op.path)
+            info = section_value(section)
+            if op.op == "remove":
+                info.pop(tokens[1], None)
+            else:
+                info.update(_validated(PersonalInfo, {**info, tokens[1]: op.value}, op.path))
+            continue
+
+        items = section_value(section)
+        if len(tokens) == 2:
+            idx = _index(tokens[1], items, op.path, allow_end=op.op == "add")
+            if op.op == "remove":
+                items.pop(idx)
+                continue
+            if section == "skills":
+                value = _validated_skill(op.value, op.path)
+            else:
+                value = _validated(ITEM_SECTIONS[section], op.value, op.path)
+            if op.op == "add":
+                items.insert(idx, value)
+            else:
+                items[idx] = value
+            continue
+
+        if len(tokens) != 3 or section == "skills":
+            raise _invalid(f"Invalid path '{op.path}'")
+        model = ITEM_SECTIONS[section]
+        idx = _index(tokens[1], items, op.path, allow_end=False)
+        _check_field(model, tokens[2], op.path)
+        item = items[idx] if isinstance(items[idx], dict) else {}
+        new_value = "" if op.op == "remove" else op.value
+        items[idx] = _validated(model, {**item, tokens[2]: new_value}, op.path)
+
+    return {
+        name: value for name, value in working.items()
+        if value != (sections.get(name) if sections.get(name) is not None else empty_section(name))
+    }
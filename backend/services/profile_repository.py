@@ -0,0 +1,190 @@
+"""
+Profile Repository — the one place profiles are read for generation.
+
+get_snapshot() returns an immutable ProfileSnapshot: the generator dict
+(personal_info, education, ..., achievements) frozen as canonical JSON, its
+fingerprint (services.profile_service.profile_fingerprint, so it matches the
+values already stored on history rows), the row version and the per-section
+versions. Snapshots are kept in an in-process LRU, so a user generating
+repeatedly costs no profile query after the first.
+
+Writers call profile_cache.store(row) after committing a profile change (or
+invalidate(user_id) after deleting one). A per-user generation counter keeps a
+reader that loaded the old row before the write from caching it afterwards;
+entries also expire after PROFILE_CACHE_TTL seconds for the benefit of worker
+processes that did not see the write.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL
+from models.profile import Profile
+from services.profile_service import profile_fingerprint
+
+PROFILE_NOT_FOUND = "Profile not found. Please complete your profile first."
+
+
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    user_id: int
+    version: int
+    section_versions: MappingProxyType
+    fingerprint: str
+    canonical: str            # generator dict as sorted, compact JSON
+    achievements_set: bool    # False when the column is NULL (GET /api/profile returns null)
+
+    def to_dict(self) -> dict:
+        """A private copy of the generator dict; callers may mutate it freely."""
+        return json.loads(self.canonical)
+
+    @cached_property
+    def personal_info(self) -> MappingProxyType:
+        return MappingProxyType(self.to_dict()["personal_info"])
+
+    @cached_property
+    def text(self) -> str:
+        """Plain-text rendering of the profile, used for ATS scoring."""
+        profile = self.to_dict()
+        personal = profile["personal_info"]
+        parts = [personal.get("name", ""), personal.get("summary", "")]
+        parts.append("Skills: " + ", ".join(profile["skills"]))
+
+        for exp in profile["experience"]:
+            parts.append(f"{exp.get('role', '')} at {exp.get('company', '')} - {exp.get('description', '')}")
+
+        for proj in profile["projects"]:
+            parts.append(f"Project: {proj.get('name', '')} - {proj.get('description', '')} ({proj.get('tech_stack', '')})")
+
+        for cert in profile["certifications"]:
+            parts.append(f"Certification: {cert.get('name', '')} by {cert.get('issuer', '')}")
+
+        for edu in profile["education"]:
+            parts.append(f"{edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('institution', '')}")
+
+        return " ".join(parts)
+
+
+def snapshot_from_row(profile: Profile) -> ProfileSnapshot:
+    data = {
+        "personal_info": profile.personal_info or {},
+        "education": profile.education or [],
+        "experience": profile.experience or [],
+        "skills": profile.skills or [],
+        "projects": profile.projects or [],
+        "certifications": profile.certifications or [],
+        "internships": profile.internships or [],
+        "achievements": profile.achievements or "",
+    }
+    return ProfileSnapshot(
+        user_id=profile.user_id,
+        version=profile.version or 1,
+        section_versions=MappingProxyType(dict(profile.section_versions or {})),
+        fingerprint=profile_fingerprint(data),
+        canonical=json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False),
+        achievements_set=profile.achievements is not None,
+    )
+
+
+class ProfileCache:
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[int, tuple[ProfileSnapshot, float]]" = OrderedDict()
+        self._generations: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> ProfileSnapshot | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put(self, snapshot: ProfileSnapshot, generation: int) -> None:
+        """Cache a snapshot loaded at generation, unless a write happened since."""
+        with self._lock:
+            if self._generations.get(snapshot.user_id, 0) != generation:
+                return
+            self._put(snapshot)
+
+    def store(self, profile: Profile) -> ProfileSnapshot:
+        """Replace the cached snapshot with a just-committed profile row."""
+        snapshot = snapshot_from_row(profile)
+        with self._lock:
+            self._bump(snapshot.user_id)
+            self._put(snapshot)
+        return snapshot
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._bump(user_id)
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _bump(self, user_id: int) -> None:
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def _put(self, snapshot: ProfileSnapshot) -> None:
+        self._entries[snapshot.user_id] = (snapshot, time.monotonic() + self._ttl)
+        self._entries.move_to_end(snapshot.user_id)
+        # Generation counters outlive evicted entries (one int per user) so a
+        # load that started before a write can never be cached after it.
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+profile_cache = ProfileCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL)
+
+
+async def get_snapshot(db: AsyncSession, user_id: int) -> ProfileSnapshot | None:
+    """The user's profile snapshot, from the cache or one query. None if no profile exists."""
+    snapshot = profile_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+    generation = profile_cache.generation(user_id)
+    profile = await db.scalar(select(Profile).where(Profile.user_id == user_id))
+    if profile is None:
+        return None
+    snapshot = snapshot_from_row(profile)
+    profile_cache.put(snapshot, generation)
+    return snapshot
+
+
+async def require_snapshot(db: AsyncSession, user_id: int) -> ProfileSnapshot:
+    """Like get_snapshot, but raises 404 when the user has no profile yet."""
+    snapshot = await get_snapshot(db, user_id)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=PROFILE_NOT_FOUND)
+    return snapshot
@@ -0,0 +1,15 @@
+"""
+Profile Service — helpers shared by routers that consume a user's profile dict.
+"""
+import hashlib
+import json
+
+
+def profile_fingerprint(profile: dict) -> str:
+    """
+    Stable SHA-256 of a profile dict. Two profiles with the same content hash
+    identically regardless of key order, so the value can be stored next to
+    generated content and compared later to tell whether it is still current.
+    """
+    canonical = json.dumps(profile, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
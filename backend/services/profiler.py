@@ -0,0 +1,284 @@
+"""
+Request Profiler — sampled statistical profiles of individual requests.
+
+The profiling middleware in main.py records a request when it is picked by
+PROFILE_SAMPLE_RATE or when an admin sends "X-Profile: 1". While at least one
+request is being recorded, a background thread wakes every PROFILE_INTERVAL_MS,
+reads every thread's stack (sys._current_frames) and adds the busy ones to
+each active recording. Nothing runs between samples and the thread sleeps when
+no request is recorded, so unsampled requests only pay for the sampling
+decision.
+
+A stack is "busy" unless it is parked in select/wait/get with no application
+frame on it (the idle event loop, idle threadpool workers). Threads blocked in
+app code (waiting on Gemini, a PDF render or a database lock) stay in, so waits
+show up next to CPU time.
+
+Profiles are process-wide: a thread's stack does not say which request it is
+serving (the event loop and the threadpool are shared), so requests running at
+the same time appear in each other's profiles. Every profile is labelled with
+scope "process" and max_concurrent_requests, the most requests this worker had
+in flight at any sample; at 1 the profile holds only this request (plus
+background work such as history commits). Reproduce a request alone with
+X-Profile when it is higher.
+
+Each profile is written to PROFILE_DIR as <id>.json (metadata), <id>.collapsed
+(Brendan Gregg's folded stacks, for flamegraph.pl / speedscope) and
+<id>.speedscope.json. Files are shared by every worker pointed at the same
+directory; each worker prunes from an in-memory index of the profile ids it has
+seen (the directory at its first save plus its own profiles), keeping the
+newest PROFILE_KEEP.
+"""
+import bisect
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from config import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_KEEP
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "wait", "get", "_worker", "accept", "sleep"}
+_IDLE_LOOPS = {"Connection.run"}   # aiosqlite's connection thread, blocked in a C queue.get
+_MAX_DEPTH = 128
+PROFILE_ID = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+
+def _short_path(filename: str) -> str:
+    if "site-packages" + os.sep in filename:
+        return filename.split("site-packages" + os.sep, 1)[1]
+    if filename.startswith(_APP_DIR):
+        return filename[len(_APP_DIR):]
+    return os.path.basename(filename)
+
+
+def _is_app_file(filename: str) -> bool:
+    return filename.startswith(_APP_DIR) and "site-packages" not in filename
+
+
+class Recording:
+    """Samples collected for one request: [(stack, weight_ms)], stacks root first."""
+
+    def __init__(self, concurrent: int = 1):
+        self.samples: list = []
+        self.max_concurrent = max(1, concurrent)
+
+
+class Sampler:
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self._active: set = set()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._frames: dict = {}   # code object -> frame key, so stacks share tuples
+        self.in_flight = 0        # requests in progress; only changed on the event loop thread
+
+    def begin(self) -> Recording:
+        recording = Recording(self.in_flight)
+        with self._cond:
+            self._active.add(recording)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return recording
+
+    def end(self, recording: Recording) -> None:
+        with self._cond:
+            self._active.discard(recording)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        last = time.perf_counter()
+        while True:
+            with self._cond:
+                while not self._active:
+                    self._cond.wait()
+                    last = time.perf_counter()
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            weight, last = (now - last) * 1000, now
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    stack = self._stack(frame, names.get(ident, f"thread-{ident}"))
+                    if stack is not None:
+                        stacks.append(stack)
+            del frame   # drop the last frame reference promptly
+            concurrent = self.in_flight
+            with self._cond:
+                for recording in self._active:
+                    recording.samples.extend((stack, weight) for stack in stacks)
+                    if concurrent > recording.max_concurrent:
+                        recording.max_concurrent = concurrent
+
+    def _stack(self, frame, thread_name: str) -> tuple | None:
+        """Root-first tuple of (function, file, line) keys, or None for an idle thread."""
+        leaf = frame.f_code
+        frames, app = [], False
+        while frame is not None and len(frames) < _MAX_DEPTH:
+            code = frame.f_code
+            key = self._frames.get(code)
+            if key is None:
+                key = self._frames[code] = (code.co_qualname, _short_path(code.co_filename), code.co_firstlineno)
+            app = app or _is_app_file(code.co_filename)
+            frames.append(key)
+            frame = frame.f_back
+        if not app and (leaf.co_name in _IDLE_FUNCTIONS or leaf.co_qualname in _IDLE_LOOPS):
+            return None
+        frames.append((thread_name, "", 0))
+        frames.reverse()
+        return tuple(frames)
+
+
+sampler = Sampler(PROFILE_INTERVAL_MS)
+
+
+# ── Output formats ──────────────────────────────────────────────────────────
+def _frame_label(key: tuple) -> str:
+    name, path, line = key
+    return f"{name} ({path}:{line})" if path else name
+
+
+def to_collapsed(samples: list) -> str:
+    """Folded stacks, one 'root;...;leaf weight' line per distinct stack (weight in ms)."""
+    totals = Counter()
+    for stack, weight in samples:
+        totals[stack] += weight
+    return "".join(
+        ";".join(_frame_label(key).replace(";", ":") for key in stack) + f" {max(1, round(ms))}\n"
+        for stack, ms in totals.most_common()
+    )
+
+
+def to_speedscope(samples: list, name: str, duration_ms: float) -> dict:
+    """A speedscope 'sampled' profile (https://www.speedscope.app/file-format-schema.json)."""
+    index, frames, stacks, weights = {}, [], [], []
+    for stack, weight in samples:
+        ids = []
+        for key in stack:
+            if key not in index:
+                index[key] = len(frames)
+                frame = {"name": key[0]}
+                if key[1]:
+                    frame.update(file=key[1], line=key[2])
+                frames.append(frame)
+            ids.append(index[key])
+        stacks.append(ids)
+        weights.append(round(weight, 3))
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "resume-builder request profiler",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": round(max(duration_ms, sum(weights)), 3),
+            "samples": stacks,
+            "weights": weights,
+        }],
+    }
+
+
+# ── Storage ─────────────────────────────────────────────────────────────────
+def new_profile_id() -> str:
+    """Sortable, unique id: UTC timestamp plus a random suffix."""
+    return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def save_profile(profile_id: str, recording: Recording, meta: dict) -> dict:
+    """Write the three files for a finished recording and prune old profiles. Returns the metadata."""
+    meta = {
+        "id": profile_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "samples": len(recording.samples),
+        "interval_ms": PROFILE_INTERVAL_MS,
+        "pid": os.getpid(),
+        "scope": "process",
+        "max_concurrent_requests": recording.max_concurrent,
+        **meta,
+    }
+    name = f"{meta.get('method', '')} {meta.get('path', '')}".strip() or profile_id
+    if recording.max_concurrent > 1:
+        name += f" [process-wide, up to {recording.max_concurrent} concurrent requests]"
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, profile_id)
+    with open(base + ".collapsed", "w", encoding="utf-8") as f:
+        f.write(to_collapsed(recording.samples))
+    with open(base + ".speedscope.json", "w", encoding="utf-8") as f:
+        json.dump(to_speedscope(recording.samples, name, meta.get("duration_ms", 0)), f, separators=(",", ":"))
+    # Metadata last: a profile is listed only once all of its files exist
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    _prune(profile_id)
+    return meta
+
+
+_index: list | None = None   # ids this process knows about, oldest first (ids sort by time)
+_index_lock = threading.Lock()
+
+
+def _stored_ids() -> list:
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        name[:-5] for name in names
+        if name.endswith(".json") and not name.endswith(".speedscope.json") and PROFILE_ID.match(name[:-5])
+    )
+
+
+def _prune(saved_id: str) -> None:
+    """Record saved_id and delete the oldest known profiles beyond PROFILE_KEEP."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = _stored_ids()
+        position = bisect.bisect_left(_index, saved_id)
+        if position == len(_index) or _index[position] != saved_id:
+            _index.insert(position, saved_id)
+        excess = max(0, len(_index) - max(PROFILE_KEEP, 0))
+        expired = _index[:excess]
+        del _index[:excess]
+    for profile_id in expired:
+        for suffix in (".json", ".collapsed", ".speedscope.json"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> list:
+    """Metadata of stored profiles, newest first."""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for name in names:
+        if name.endswith(".json") and not name.endswith(".speedscope.json") and PROFILE_ID.match(name[:-5]):
+            try:
+                with open(os.path.join(PROFILE_DIR, name), encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue   # pruned or half-written by another worker
+    profiles.sort(key=lambda meta: meta["id"], reverse=True)
+    return profiles
+
+
+def profile_path(profile_id: str, fmt: str) -> str | None:
+    """Path of a stored profile file ('collapsed' or 'speedscope'), or None if it does not exist."""
+    if not PROFILE_ID.match(profile_id):
+        return None
+    suffix = ".collapsed" if fmt == "collapsed" else ".speedscope.json"
+    path = os.path.join(PROFILE_DIR, profile_id + suffix)
+    return path if os.path.exists(path) else None
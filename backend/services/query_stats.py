@@ -0,0 +1,144 @@
+"""
+Query Stats — per-request SQL counting, timing, slow-query log and N+1 warnings.
+
+database.py registers before/after_cursor_execute on both engines. Every
+statement is timed; while a request is being tracked (the timing middleware in
+main.py wraps each request in track_queries()) it is also added to that
+request's QueryStats through a context variable, which follows the request
+into the threadpool and SQLAlchemy's async greenlets. Work that outlives the
+request (the history writer's group commits) is not attributed to it.
+
+Per request the middleware returns X-DB-Query-Count and X-DB-Query-Time-Ms and
+exports the count to /metrics. Statements slower than SQL_SLOW_QUERY_MS are
+logged with their parameters. Statements are grouped by shape (whitespace
+collapsed, literals and expanded IN lists replaced by "?"); a shape that runs
+more than SQL_REPEAT_THRESHOLD times in one request is logged as a likely N+1.
+
+For tests, assert_max_queries(n) fails when the code in the block, or any
+request handled by this process while it is open (e.g. through TestClient),
+ran more than n statements.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from config import SQL_SLOW_QUERY_MS, SQL_REPEAT_THRESHOLD
+from services.metrics import DB_QUERY_LATENCY, DB_SLOW_QUERIES, DB_REPEATED_STATEMENTS
+
+logger = logging.getLogger(__name__)
+
+_PARAM_LOG_LIMIT = 500
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so repeats differing only in literals or IN-list length compare equal."""
+    shape = " ".join(statement.split())
+    shape = re.sub(r"'(?:[^']|'')*'", "?", shape)
+    shape = re.sub(r"\((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)", "(?)", shape)
+    shape = re.sub(r"\b\d+(?:\.\d+)?\b", "?", shape)
+    return shape
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.shapes[shape] += 1
+
+    @property
+    def ms(self) -> float:
+        return round(self.seconds * 1000, 2)
+
+    def repeated(self, threshold: int = SQL_REPEAT_THRESHOLD) -> list:
+        """[(shape, times)] for shapes that ran more than threshold times, most frequent first."""
+        if threshold <= 0:
+            return []
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_captures: list = []
+_captures_lock = threading.Lock()
+
+
+@contextmanager
+def track_queries():
+    """Count the statements run in this context (and tasks/threads started from it)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def finish_request(stats: QueryStats, method: str, route: str) -> None:
+    """Called by the middleware once a tracked request is done: N+1 warnings and test captures."""
+    for shape, n in stats.repeated():
+        DB_REPEATED_STATEMENTS.labels(method, route).inc()
+        logger.warning(f"Possible N+1: {method} {route} ran this statement {n} times: {shape[:300]}")
+    if _captures:
+        with _captures_lock:
+            for captured in _captures:
+                captured.append((f"{method} {route}", stats))
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Test helper: raise AssertionError if the block itself, or any single request
+    handled while it is open, ran more than limit statements. Yields the list of
+    (request, QueryStats) captured so far.
+    """
+    captured: list = []
+    with _captures_lock:
+        _captures.append(captured)
+    try:
+        with track_queries() as own:
+            yield captured
+    finally:
+        with _captures_lock:
+            _captures.remove(captured)
+    for label, stats in [("block", own), *captured]:
+        if stats.count > limit:
+            shapes = "\n".join(f"  {n} x {shape}" for shape, n in stats.shapes.most_common())
+            raise AssertionError(f"{label} ran {stats.count} queries (max {limit}):\n{shapes}")
+
+
+# ── Engine event listeners (registered in database.py) ──────────────────────
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if SQL_SLOW_QUERY_MS > 0 and elapsed * 1000 >= SQL_SLOW_QUERY_MS:
+        DB_SLOW_QUERIES.inc()
+        params = repr(parameters)
+        if len(params) > _PARAM_LOG_LIMIT:
+            params = params[:_PARAM_LOG_LIMIT] + "..."
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())} | params: {params}")
+
+
+def handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
@@ -0,0 +1,262 @@
+"""
+Rate Limiter — token buckets in front of the LLM-backed endpoints.
+
+Every limited request takes one token from three buckets: its user's
+(RATE_LIMIT_PER_USER), its client IP's (RATE_LIMIT_PER_IP) and a global one
+(RATE_LIMIT_GLOBAL) that protects the shared Gemini quota. Tokens are only
+taken if all three have one, so a request rejected by one bucket does not
+drain the others. A rejection is a 429 with Retry-After set to when the
+emptiest bucket will have a token again.
+
+Backends:
+  memory  per-process dict; a check takes a few microseconds, but each gunicorn
+          worker enforces the limits on its own
+  sqlite  buckets in a small SQLite file shared by every worker on the host,
+          one BEGIN IMMEDIATE transaction per check (run in the threadpool)
+
+Routes opt in with `dependencies=[Depends(limit_llm_requests)]`; it runs after
+authentication and before any profile load or Gemini call. Routes that only
+sometimes call Gemini (POST /api/portfolio/download reuses stored content)
+call rate_limiter.check() themselves on the path that does. If the sqlite
+backend fails, requests are let through (and logged) rather than failing.
+"""
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from config import (
+    RATE_LIMIT_ENABLED, RATE_LIMIT_PER_USER, RATE_LIMIT_PER_IP, RATE_LIMIT_GLOBAL,
+    RATE_LIMIT_BACKEND, RATE_LIMIT_SQLITE_PATH, RATE_LIMIT_TRUST_FORWARDED,
+)
+from services.auth_service import Principal, get_current_user
+from services.metrics import RATE_LIMIT_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: float   # bucket size (burst)
+    rate: float       # tokens added per second
+
+
+def parse_limit(spec: str) -> Limit | None:
+    """'10/minute' -> Limit(10, 10/60). Empty or '0/...' means unlimited (None)."""
+    spec = (spec or "").strip().lower()
+    if not spec:
+        return None
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*/\s*(second|minute|hour|day)s?", spec)
+    if not match:
+        raise ValueError(f"Invalid rate limit '{spec}', expected e.g. '10/minute'")
+    count = float(match.group(1))
+    if count <= 0:
+        return None
+    return Limit(capacity=count, rate=count / _PERIODS[match.group(2)])
+
+
+def _take(buckets: list, states: dict, cost: float, now: float) -> tuple[float, str | None, dict]:
+    """
+    Refill each bucket to now and try to take cost tokens from all of them.
+    Returns (seconds to wait, limiting key, new token counts); wait 0 = allowed.
+    """
+    wait, limited_by, tokens_after = 0.0, None, {}
+    for key, limit in buckets:
+        tokens, updated = states.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + max(0.0, now - updated) * limit.rate)
+        if tokens < cost:
+            needed = (cost - tokens) / limit.rate
+            if needed > wait:
+                wait, limited_by = needed, key
+        tokens_after[key] = tokens - cost
+    return wait, limited_by, tokens_after
+
+
+# ── Backends ─────────────────────────────────────────────────────────────────
+class MemoryBackend:
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000):
+        self._max_keys = max_keys
+        self._states: OrderedDict = OrderedDict()   # key -> (tokens, updated, limit), least recently used first
+        self._lock = threading.Lock()
+
+    def acquire(self, buckets: list, cost: float) -> tuple[float, str | None]:
+        now = time.monotonic()
+        with self._lock:
+            states = {key: self._states[key][:2] for key, _ in buckets if key in self._states}
+            wait, limited_by, tokens_after = _take(buckets, states, cost, now)
+            if wait == 0:
+                for key, limit in buckets:
+                    self._states[key] = (tokens_after[key], now, limit)
+                    self._states.move_to_end(key)
+                # Drop the buckets idle longest: O(1) per request however many
+                # clients there are. They have usually refilled, and one that has
+                # not just starts over full.
+                while len(self._states) > self._max_keys:
+                    self._states.popitem(last=False)
+            return wait, limited_by
+
+
+class SQLiteBackend:
+    name = "sqlite"
+    blocking = True
+
+    _SWEEP_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, buckets: list, cost: float) -> tuple[float, str | None]:
+        now = time.time()   # wall clock: shared between processes
+        conn = self._connection()
+        keys = [key for key, _ in buckets]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                f"SELECT key, tokens, updated FROM rate_buckets WHERE key IN ({', '.join('?' * len(keys))})", keys
+            ).fetchall()
+            states = {key: (tokens, updated) for key, tokens, updated in rows}
+            wait, limited_by, tokens_after = _take(buckets, states, cost, now)
+            if wait == 0:
+                conn.executemany(
+                    "INSERT INTO rate_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, "
+                    "updated = excluded.updated, full_at = excluded.full_at",
+                    [(key, tokens_after[key], now, now + (limit.capacity - tokens_after[key]) / limit.rate)
+                     for key, limit in buckets],
+                )
+            self._calls += 1
+            if self._calls % self._SWEEP_EVERY == 0:
+                conn.execute("DELETE FROM rate_buckets WHERE full_at < ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait, limited_by
+
+
+# ── Limiter ──────────────────────────────────────────────────────────────────
+class RateLimiter:
+    def __init__(self, backend, per_user: Limit | None, per_ip: Limit | None,
+                 global_limit: Limit | None, enabled: bool = True):
+        self.backend = backend
+        self.per_user = per_user
+        self.per_ip = per_ip
+        self.global_limit = global_limit
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = {"user": 0, "ip": 0, "global": 0}
+        self.errors = 0
+        self._check_seconds = 0.0
+
+    def _buckets(self, user_id: int | None, ip: str | None) -> list:
+        buckets = []
+        if self.per_user and user_id is not None:
+            buckets.append((f"user:{user_id}", self.per_user))
+        if self.per_ip and ip:
+            buckets.append((f"ip:{ip}", self.per_ip))
+        if self.global_limit:
+            buckets.append(("global", self.global_limit))
+        return buckets
+
+    async def check(self, user_id: int | None, ip: str | None, cost: float = 1) -> None:
+        """Take a token for this request or raise 429 with Retry-After."""
+        buckets = self._buckets(user_id, ip) if self.enabled else []
+        if not buckets:
+            return
+        start = time.perf_counter()
+        try:
+            if self.backend.blocking:
+                wait, limited_by = await run_in_threadpool(self.backend.acquire, buckets, cost)
+            else:
+                wait, limited_by = self.backend.acquire(buckets, cost)
+        except Exception as e:
+            logger.warning(f"Rate limit check failed ({e}); allowing request")
+            with self._lock:
+                self.errors += 1
+            return
+        elapsed = time.perf_counter() - start
+        scope = limited_by.split(":", 1)[0] if limited_by else None
+        with self._lock:
+            self._check_seconds += elapsed
+            if scope:
+                self.rejected[scope] += 1
+            else:
+                self.allowed += 1
+        if scope:
+            RATE_LIMIT_REJECTIONS.labels(scope).inc()
+            who = "the service" if scope == "global" else f"this {scope}"
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many AI generation requests for {who}. Please retry later.",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            checks = self.allowed + sum(self.rejected.values())
+            return {
+                "enabled": self.enabled,
+                "backend": self.backend.name,
+                "allowed": self.allowed,
+                "rejected_user": self.rejected["user"],
+                "rejected_ip": self.rejected["ip"],
+                "rejected_global": self.rejected["global"],
+                "errors": self.errors,
+                "check_us_avg": round(self._check_seconds / checks * 1e6, 1) if checks else 0.0,
+            }
+
+
+def _build_backend(name: str):
+    if name == "sqlite":
+        return SQLiteBackend(RATE_LIMIT_SQLITE_PATH)
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{name}' (expected 'memory' or 'sqlite')")
+
+
+rate_limiter = RateLimiter(
+    backend=_build_backend(RATE_LIMIT_BACKEND),
+    per_user=parse_limit(RATE_LIMIT_PER_USER),
+    per_ip=parse_limit(RATE_LIMIT_PER_IP),
+    global_limit=parse_limit(RATE_LIMIT_GLOBAL),
+    enabled=RATE_LIMIT_ENABLED,
+)
+
+
+def client_ip(request: Request) -> str | None:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+async def limit_llm_requests(request: Request, current_user: Principal = Depends(get_current_user)) -> None:
+    """FastAPI dependency: apply the user, IP and global buckets to an LLM-backed route."""
+    await rate_limiter.check(current_user.id, client_ip(request))
@@ -0,0 +1,204 @@
+"""
+Retention Service — moves old generation history out of the live table.
+
+A RetentionPolicy selects rows to archive:
+  keep_last     keep the newest N rows per (user, generation_type), archive the rest
+  max_age_days  archive rows older than this many days
+Either rule (or both) may be set; a row matching either is archived. The newest
+row of each (user, type) is never archived by age, so "latest resume/portfolio"
+lookups and hosted pages keep working.
+
+Candidate ids are read first with one window query, then moved in batches of
+batch_size rows, each batch its own short transaction: bodies are read, written
+to the sink (the compressed resume_history_archive table, or a JSONL.gz file)
+and the live rows are deleted through content_store.delete_history so their
+blobs are released. Other writers only ever wait for one batch.
+
+Run with `python manage.py retention` (see manage.py for options); it is safe
+to schedule since a run only touches rows that still match the policy.
+"""
+import gzip
+import json
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.orm import Session
+from models.history_archive import HistoryArchive
+from models.resume_history import ResumeHistory, RESUME_BODY, COVER_LETTER_BODY
+from services.content_store import delete_history
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    keep_last: int = 0               # 0 = no per-user count limit
+    max_age_days: int = 0            # 0 = no age limit
+    generation_types: tuple = ()     # empty = every type
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep_last > 0 or self.max_age_days > 0
+
+
+@dataclass
+class RetentionReport:
+    candidates: int = 0
+    archived: int = 0
+    batches: int = 0
+    body_bytes: int = 0              # uncompressed document bytes moved
+    archive_bytes: int = 0           # compressed bytes written to the sink
+    elapsed: float = 0.0
+    destination: str = ""
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.archived / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Archived {self.archived}/{self.candidates} rows in {self.batches} batches "
+            f"to {self.destination} in {self.elapsed:.2f}s ({self.rows_per_second:.0f} rows/s, "
+            f"{self.body_bytes / 1e6:.1f} MB of documents -> {self.archive_bytes / 1e6:.1f} MB)"
+        )
+
+
+def select_candidates(db: Session, policy: RetentionPolicy, now: datetime = None) -> list:
+    """Ids of live history rows the policy would archive, oldest id first."""
+    if not policy.enabled:
+        return []
+    rank = func.row_number().over(
+        partition_by=(ResumeHistory.user_id, ResumeHistory.generation_type),
+        order_by=(ResumeHistory.created_at.desc(), ResumeHistory.id.desc()),
+    ).label("rank")
+    ranked = select(ResumeHistory.id, ResumeHistory.created_at, rank)
+    if policy.generation_types:
+        ranked = ranked.where(ResumeHistory.generation_type.in_(policy.generation_types))
+    ranked = ranked.subquery("ranked")
+
+    rules = []
+    if policy.keep_last > 0:
+        rules.append(ranked.c.rank > policy.keep_last)
+    if policy.max_age_days > 0:
+        cutoff = (now or datetime.utcnow()) - timedelta(days=policy.max_age_days)
+        rules.append(and_(ranked.c.created_at < cutoff, ranked.c.rank > 1))
+    return list(db.execute(select(ranked.c.id).where(or_(*rules)).order_by(ranked.c.id)).scalars())
+
+
+def _record(row: ResumeHistory) -> dict:
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "generation_type": row.generation_type,
+        "job_role": row.job_role,
+        "company_name": row.company_name,
+        "ats_score": row.ats_score,
+        "profile_fingerprint": row.profile_fingerprint,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "resume_markdown": row.resume_markdown,
+        "cover_letter": row.cover_letter,
+    }
+
+
+# ── Sinks ────────────────────────────────────────────────────────────────────
+class TableSink:
+    """Inserts archived rows into resume_history_archive in the batch's transaction."""
+
+    name = "resume_history_archive"
+
+    def write(self, db: Session, records: list) -> int:
+        values, written = [], 0
+        archived_at = datetime.utcnow()
+        for rec in records:
+            payload = zlib.compress(json.dumps(rec, separators=(",", ":")).encode("utf-8"), 9)
+            written += len(payload)
+            values.append({
+                "history_id": rec["id"],
+                "user_id": rec["user_id"],
+                "generation_type": rec["generation_type"],
+                "job_role": rec["job_role"],
+                "company_name": rec["company_name"],
+                "ats_score": rec["ats_score"],
+                "created_at": datetime.fromisoformat(rec["created_at"]) if rec["created_at"] else None,
+                "archived_at": archived_at,
+                "payload": payload,
+            })
+        db.execute(insert(HistoryArchive), values)
+        return written
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink:
+    """Appends one JSON line per row to a gzip file; each batch is flushed before its rows are deleted."""
+
+    def __init__(self, directory: str):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.path = Path(directory) / f"history-archive-{datetime.utcnow():%Y%m%dT%H%M%S}.jsonl.gz"
+        self.name = str(self.path)
+        self._raw = self._file = None
+
+    def write(self, db: Session, records: list) -> int:
+        if self._file is None:
+            self._raw = open(self.path, "ab")
+            self._file = gzip.GzipFile(fileobj=self._raw, mode="ab")
+        before = self._raw.tell()
+        for rec in records:
+            self._file.write(json.dumps(rec, separators=(",", ":")).encode("utf-8") + b"\n")
+        self._file.flush()
+        self._raw.flush()
+        return self._raw.tell() - before
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._raw.close()
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+def run_retention(session_factory, policy: RetentionPolicy, sink=None, batch_size: int = 500,
+                  pause_ms: float = 0, dry_run: bool = False) -> RetentionReport:
+    """Archive every row matching policy, batch_size rows per transaction."""
+    sink = sink or TableSink()
+    report = RetentionReport(destination=sink.name)
+    start = time.perf_counter()
+
+    with session_factory() as db:
+        ids = select_candidates(db, policy)
+    report.candidates = len(ids)
+    if dry_run or not ids:
+        sink.close()
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    try:
+        for offset in range(0, len(ids), batch_size):
+            chunk = ids[offset:offset + batch_size]
+            with session_factory() as db:
+                rows = (
+                    db.query(ResumeHistory)
+                    .options(*RESUME_BODY, *COVER_LETTER_BODY)
+                    .filter(ResumeHistory.id.in_(chunk))
+                    .order_by(ResumeHistory.id)
+                    .all()
+                )
+                if not rows:
+                    continue
+                records = [_record(row) for row in rows]
+                report.archive_bytes += sink.write(db, records)
+                report.body_bytes += sum(
+                    len((rec["resume_markdown"] or "").encode("utf-8")) + len((rec["cover_letter"] or "").encode("utf-8"))
+                    for rec in records
+                )
+                delete_history(db, ResumeHistory.id.in_([row.id for row in rows]))
+                db.commit()
+            report.archived += len(rows)
+            report.batches += 1
+            if pause_ms:
+                time.sleep(pause_ms / 1000)
+    finally:
+        sink.close()
+        report.elapsed = time.perf_counter() - start
+    return report
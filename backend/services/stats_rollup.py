@@ -0,0 +1,164 @@
+"""
+Stats Rollup Service — keeps the daily_stats table in step with users and history.
+
+A before_flush hook turns pending User / ResumeHistory inserts, ATS score
+changes and user deletions into per-day counter deltas and applies them with
+an atomic upsert on the flushing connection, so the rollup commits or rolls
+back together with the rows it counts. Dashboard reads are then O(days).
+
+Counters record events: deleting or archiving history does not decrement
+generation counts, while user deletions are tracked so the live user total
+stays exact. ATS scores count towards the day the scored resume was created,
+whether the score arrives with the insert or is set later, so rebuild() (which
+only sees created_at) reproduces the same buckets.
+
+rebuild() recounts from users, resume_history and resume_history_archive. It
+cannot see history that is gone for good (rows of deleted users, rows that
+retention exported to JSONL) or past user deletions, so after those a rebuild
+lowers the generation and signup counts; the live user total stays correct.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import event, func, inspect, delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from models.daily_stats import DailyStats
+from models.history_archive import HistoryArchive
+from models.resume_history import ResumeHistory
+from models.user import User
+
+COUNTERS = ("resumes", "cover_letters", "portfolios", "ats_score_sum", "ats_score_count", "signups", "user_deletions")
+_GENERATION_COUNTERS = {"resume": "resumes", "cover_letter": "cover_letters", "portfolio": "portfolios"}
+
+
+def _day(value) -> date:
+    return value.date() if isinstance(value, datetime) else datetime.utcnow().date()
+
+
+@event.listens_for(Session, "before_flush")
+def _record_rollups(session: Session, flush_context, instances) -> None:
+    deltas = defaultdict(lambda: defaultdict(int))
+    today = datetime.utcnow().date()
+
+    for obj in session.new:
+        if isinstance(obj, ResumeHistory):
+            day = deltas[_day(obj.created_at)]
+            counter = _GENERATION_COUNTERS.get(obj.generation_type or "resume")
+            if counter:
+                day[counter] += 1
+            if obj.ats_score is not None:
+                day["ats_score_sum"] += obj.ats_score
+                day["ats_score_count"] += 1
+        elif isinstance(obj, User):
+            deltas[_day(obj.created_at)]["signups"] += 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, ResumeHistory):
+            continue
+        history = inspect(obj).attrs.ats_score.history
+        if not history.has_changes():
+            continue
+        old = next((v for v in history.deleted if v is not None), None)
+        new = obj.ats_score
+        day = deltas[_day(obj.created_at)]
+        day["ats_score_sum"] += (new or 0) - (old or 0)
+        day["ats_score_count"] += (new is not None) - (old is not None)
+
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            deltas[today]["user_deletions"] += 1
+
+    if deltas:
+        _apply(session, deltas)
+
+
+def _apply(session: Session, deltas: dict) -> None:
+    """Add counter deltas to their day rows with INSERT ... ON CONFLICT DO UPDATE."""
+    connection = session.connection()
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    table = DailyStats.__table__
+    for day, counters in deltas.items():
+        values = {name: counters.get(name, 0) for name in COUNTERS}
+        if not any(values.values()):
+            continue
+        stmt = dialect_insert(table).values(day=day, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.day],
+            set_={name: table.c[name] + stmt.excluded[name] for name in COUNTERS},
+        )
+        connection.execute(stmt)
+
+
+# ─── Reads ────────────────────────────────────────────────────────────────────
+
+def totals(db: Session) -> dict:
+    """Sum of every counter across all days."""
+    row = db.query(*[func.coalesce(func.sum(DailyStats.__table__.c[name]), 0) for name in COUNTERS]).one()
+    return dict(zip(COUNTERS, (int(v) for v in row)))
+
+
+def daily_series(db: Session, days: int) -> list:
+    """DailyStats rows for the last `days` days (including today), oldest first."""
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    return (
+        db.query(DailyStats)
+        .filter(DailyStats.day >= since)
+        .order_by(DailyStats.day.asc())
+        .all()
+    )
+
+
+def today_stats(db: Session) -> DailyStats | None:
+    return db.get(DailyStats, datetime.utcnow().date())
+
+
+# ─── Backfill / Rebuild ───────────────────────────────────────────────────────
+
+def rebuild(db: Session) -> int:
+    """
+    Recompute daily_stats from users and from live and archived history in one
+    transaction. Past user deletions cannot be recovered, but signups are
+    recounted from live users so the user total stays correct (see the module
+    docstring for what else is lost). Returns day rows written.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+
+    for model in (ResumeHistory, HistoryArchive):
+        history_day = func.date(model.created_at)
+        for day, gen_type, count, score_sum, score_count in (
+            db.query(
+                history_day, model.generation_type, func.count(model.id),
+                func.coalesce(func.sum(model.ats_score), 0), func.count(model.ats_score)
+            )
+            .group_by(history_day, model.generation_type)
+        ):
+            counters = deltas[_parse_day(day)]
+            counter = _GENERATION_COUNTERS.get(gen_type or "resume")
+            if counter:
+                counters[counter] += count
+            counters["ats_score_sum"] += int(score_sum)
+            counters["ats_score_count"] += score_count
+
+    user_day = func.date(User.created_at)
+    for day, count in db.query(user_day, func.count(User.id)).group_by(user_day):
+        deltas[_parse_day(day)]["signups"] += count
+
+    db.execute(delete(DailyStats))
+    rows = [{"day": day, **{name: counters.get(name, 0) for name in COUNTERS}} for day, counters in deltas.items()]
+    if rows:
+        db.execute(insert(DailyStats), rows)
+    db.commit()
+    return len(rows)
+
+
+def backfill_if_empty(db: Session) -> None:
+    """Build the rollup on first start after upgrading from a database without it."""
+    if db.query(DailyStats.day).first() is None and db.query(User.id).first() is not None:
+        rebuild(db)
+
+
+def _parse_day(value) -> date:
+    # func.date() returns a string on SQLite and a date on PostgreSQL
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value) if value else datetime.utcnow().date()
@@ -0,0 +1,91 @@
+"""
+Shared fixtures. Settings are read when config.py is imported, so the test
+environment (a throwaway SQLite file, in-process bcrypt at a low cost, no rate
+limits, a temporary profile directory) is set here before the app is imported.
+Gemini is replaced by fake_gemini, which records prompts and returns canned
+text shaped like the real responses.
+"""
+import itertools
+import os
+import re
+import sys
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="resume-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["PROFILE_DIR"] = os.path.join(_TMP, "profiles")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import services.ai_service as ai_service
+
+PROMPTS: list = []
+
+
+def fake_gemini(prompt: str, max_retries: int = 3, task: str = "other") -> str:
+    PROMPTS.append(prompt)
+    if "[SCORE]" in prompt:
+        return "[SCORE]\n77\n[MATCHING]\n- python\n[MISSING]\n- go\n[SUGGESTIONS]\n- add metrics"
+    sections = [tag for tag in ("ABOUT_ME", "BIO", "LINKEDIN", "GITHUB") if f"[{tag}]" in prompt]
+    projects = re.findall(r"\[PROJECT:([^\]]+)\]", prompt)
+    if sections or projects:
+        out = []
+        for tag in sections:
+            out += [f"[{tag}]", f"{tag.lower()} text"]
+        for name in projects:
+            out += [f"[PROJECT:{name}]", f"About {name}"]
+        return "\n".join(out)
+    return "# Resume\n\n- Built things"
+
+
+ai_service._call_gemini = fake_gemini
+
+import main  # noqa: E402  (after the environment above)
+
+PROFILE = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com", "phone": "555-0100",
+                      "location": "London", "github": "https://github.com/ada"},
+    "skills": ["python", "sql"],
+    "projects": [{"name": "Engine", "tech_stack": "Python", "description": "Analytical engine"},
+                 {"name": "Notes", "tech_stack": "Markdown", "description": "Notes on Menabrea"}],
+}
+
+_emails = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def register(client):
+    """register(role="user") -> Authorization headers for a new account."""
+    def _register(role: str = "user", full_name: str = "Test User") -> dict:
+        email = f"user{next(_emails)}-{role}@example.com"
+        client.post("/api/auth/register",
+                    json={"email": email, "password": "secret1", "full_name": full_name, "role": role})
+        r = client.post("/api/auth/login", json={"email": email, "password": "secret1"})
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+    return _register
+
+
+@pytest.fixture
+def user(client, register):
+    """A user with PROFILE saved."""
+    headers = register()
+    assert client.put("/api/profile", json=PROFILE, headers=headers).status_code == 200
+    return headers
+
+
+@pytest.fixture
+def admin(register):
+    return register("admin")
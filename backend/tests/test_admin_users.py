@@ -0,0 +1,61 @@
+"""
+GET /api/admin/users over a large seeded table: every sort/order pages through
+all users exactly once, in order, with a fixed number of queries per page.
+"""
+import random
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert
+from database import engine
+from models.resume_history import ResumeHistory
+from models.user import User, UserRole
+from services.query_stats import assert_max_queries
+
+SEEDED_USERS = 1500
+PAGE = 200
+
+
+@pytest.fixture(scope="module")
+def seeded_users(client):
+    rng = random.Random(33)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        first_id = conn.execute(insert(User).returning(User.id), [
+            {"email": f"seed{i:05d}-{rng.randrange(10**6)}@bulk.example.com", "full_name": f"Seed {i}",
+             "hashed_password": "x", "role": UserRole.user,
+             # Duplicate timestamps on purpose: the keyset must break ties on id
+             "created_at": start + timedelta(minutes=rng.randrange(SEEDED_USERS // 3))}
+            for i in range(SEEDED_USERS)
+        ]).scalars().all()
+        conn.execute(insert(ResumeHistory), [
+            {"user_id": user_id, "generation_type": "resume", "created_at": start}
+            for user_id in first_id for _ in range(rng.choice((0, 0, 1, 2, 5)))
+        ])
+
+
+def _walk(client, headers, sort: str, order: str) -> list:
+    rows, cursor = [], None
+    while True:
+        params = {"limit": PAGE, "sort": sort, "order": order}
+        if cursor:
+            params["cursor"] = cursor
+        with assert_max_queries(3):
+            r = client.get("/api/admin/users", params=params, headers=headers)
+        assert r.status_code == 200, r.text
+        rows += r.json()
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("sort", ["created_at", "email", "resume_count"])
+def test_keyset_pages_cover_every_user_once(client, admin, seeded_users, sort, order):
+    rows = _walk(client, admin, sort, order)
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)) and len(ids) >= SEEDED_USERS
+
+    key = {"created_at": lambda r: (r["created_at"], r["id"]),
+           "email": lambda r: (r["email"], r["id"]),
+           "resume_count": lambda r: (r["resume_count"], r["id"])}[sort]
+    assert rows == sorted(rows, key=key, reverse=order == "desc")
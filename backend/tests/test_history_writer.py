@@ -0,0 +1,100 @@
+"""
+HistoryWriter group commit: stop() must not strand rows queued behind it, and
+rows retried after a failed batch commit still get their document blobs.
+"""
+import asyncio
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from database import _async_url
+from models.content_blob import ContentBlob
+from models.resume_history import ResumeHistory, RESUME_BODY
+from services.history_writer import HistoryWriter
+
+
+def _user_id(client, headers) -> int:
+    return client.get("/api/auth/me", headers=headers).json()["id"]
+
+
+async def _submit_around_stop(user_id: int) -> tuple:
+    engine = create_async_engine(_async_url(), poolclass=NullPool)
+    writer = HistoryWriter(async_sessionmaker(engine, expire_on_commit=False), max_batch=8, max_delay_ms=50)
+    try:
+        await writer.start()
+
+        def submit(i):
+            row = ResumeHistory(user_id=user_id, generation_type="resume",
+                                resume_markdown=f"# drain test {i}", job_role="drain")
+            return asyncio.ensure_future(writer.submit(row))
+
+        # Scheduled in order, so the queue holds: 3 rows, _STOP, 3 more rows.
+        # The writer takes _STOP in the middle of its first batch.
+        before = [submit(i) for i in range(3)]
+        stop = asyncio.ensure_future(writer.stop())
+        after = [submit(i) for i in range(3, 6)]
+        ids = await asyncio.wait_for(asyncio.gather(*before, *after), 10)
+        await stop
+        assert not writer.running
+
+        async with async_sessionmaker(engine)() as db:
+            stored = await db.scalar(select(func.count(ResumeHistory.id)).where(
+                ResumeHistory.user_id == user_id, ResumeHistory.job_role == "drain"))
+        return ids, stored, writer.stats()
+    finally:
+        await engine.dispose()
+
+
+def test_rows_queued_behind_stop_are_committed(client, user):
+    ids, stored, stats = asyncio.run(_submit_around_stop(_user_id(client, user)))
+    assert len(set(ids)) == 6 and all(ids)
+    assert stored == 6
+    assert stats["rows"] == 6 and stats["queued"] == 0
+
+
+class _FirstCommitFails:
+    """Session factory whose first session flushes, then fails to commit."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.failed = False
+
+    def __call__(self):
+        session = self.factory()
+        if not self.failed:
+            self.failed = True
+
+            async def commit():
+                await session.flush()
+                raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+            session.commit = commit
+        return session
+
+
+async def _retry_after_failed_commit(user_id: int) -> list:
+    engine = create_async_engine(_async_url(), poolclass=NullPool)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    writer = HistoryWriter(_FirstCommitFails(factory), max_batch=8, max_delay_ms=50)
+    try:
+        await writer.start()
+        bodies = [f"# Retried resume {i} for user {user_id}" for i in range(3)]
+        ids = await asyncio.wait_for(asyncio.gather(*[
+            writer.submit(ResumeHistory(user_id=user_id, generation_type="resume", resume_markdown=body))
+            for body in bodies
+        ]), 10)
+        await writer.stop()
+
+        async with factory() as db:
+            rows = (await db.scalars(select(ResumeHistory).options(*RESUME_BODY)
+                                     .where(ResumeHistory.id.in_(ids)).order_by(ResumeHistory.id))).all()
+            blobs = {blob.hash: blob.ref_count for blob in (await db.scalars(
+                select(ContentBlob).where(ContentBlob.hash.in_([row.resume_blob_hash for row in rows])))).all()}
+        return [(row.resume_markdown, blobs.get(row.resume_blob_hash)) for row in rows], bodies
+    finally:
+        await engine.dispose()
+
+
+def test_rows_retried_after_failed_commit_keep_their_bodies(client, user):
+    stored, bodies = asyncio.run(_retry_after_failed_commit(_user_id(client, user)))
+    assert stored == [(body, 1) for body in bodies]
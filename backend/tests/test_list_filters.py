@@ -0,0 +1,28 @@
+"""
+Substring filters on list endpoints take LIKE wildcards in the search text
+literally: '%' or '_' only match rows that contain that character.
+"""
+
+
+def test_history_job_role_filter_escapes_wildcards(client, user):
+    for role in ("Data_Engineer", "DataXEngineer", "100% Remote", "C:\\Ops"):
+        assert client.post("/api/resume/generate", json={"job_role": role}, headers=user).status_code == 200
+
+    def roles(job_role):
+        r = client.get("/api/resume/history", params={"job_role": job_role}, headers=user)
+        assert r.status_code == 200, r.text
+        return sorted(item["job_role"] for item in r.json())
+
+    assert roles("%") == ["100% Remote"]
+    assert roles("a_e") == ["Data_Engineer"]
+    assert roles("\\") == ["C:\\Ops"]
+    assert roles("engineer") == ["DataXEngineer", "Data_Engineer"]
+
+
+def test_admin_user_search_escapes_wildcards(client, register, admin):
+    register(full_name="Under_Score Person")
+    register(full_name="UnderXScore Person")
+
+    r = client.get("/api/admin/users", params={"search": "under_score"}, headers=admin)
+    assert r.status_code == 200, r.text
+    assert [u["full_name"] for u in r.json()] == ["Under_Score Person"]
@@ -0,0 +1,60 @@
+"""
+Migrations under concurrent startup: several processes (like gunicorn workers
+with AUTO_MIGRATE) run create_all_tables() on the same SQLite file at once,
+including the 0003 body -> blob data move. Every process must start, and each
+migration must be applied exactly once.
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS = 3000
+
+
+def _run(code: str, db_path: str, **kwargs):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", "PASSWORD_HASH_WORKERS": "0"}
+    return subprocess.Popen([sys.executable, "-c", textwrap.dedent(code)], cwd=BACKEND, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, **kwargs)
+
+
+def _seed_pre_migration_database(db_path: str) -> None:
+    """Tables without any recorded migration and with bodies still in the legacy columns."""
+    seed = _run("""
+        from database import create_all_tables
+        create_all_tables(migrate=False)
+    """, db_path)
+    assert seed.wait(60) == 0, seed.stdout.read()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO users (id, email, hashed_password, role) VALUES (1, 'a@x.io', 'x', 'user')")
+        conn.executemany(
+            "INSERT INTO resume_history (user_id, generation_type, resume_markdown, created_at) "
+            "VALUES (1, 'resume', ?, '2024-01-01 00:00:00')",
+            [(f"# Resume {i % 500}\n" + "text " * 200,) for i in range(ROWS)],
+        )
+    conn.close()
+
+
+def test_concurrent_startup_applies_each_migration_once(tmp_path):
+    db_path = str(tmp_path / "concurrent.db")
+    _seed_pre_migration_database(db_path)
+
+    workers = [_run("""
+        from database import create_all_tables
+        create_all_tables()
+    """, db_path) for _ in range(4)]
+    results = [(w.wait(120), w.stdout.read()) for w in workers]
+    for code, output in results:
+        assert code == 0, output
+
+    conn = sqlite3.connect(db_path)
+    versions = [v for (v,) in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+    legacy = conn.execute("SELECT COUNT(*) FROM resume_history WHERE resume_markdown IS NOT NULL").fetchone()[0]
+    blobs, refs = conn.execute("SELECT COUNT(*), SUM(ref_count) FROM content_blobs").fetchone()
+    conn.close()
+    assert versions == sorted(set(versions)) and versions[:4] == [1, 2, 3, 4]
+    assert legacy == 0
+    assert (blobs, refs) == (500, ROWS)
@@ -0,0 +1,64 @@
+"""
+Fit-to-pages PDF rendering binary-searches the layout ladder for the largest
+step that fits, and falls back to the most compact step when none does.
+"""
+import hashlib
+import pytest
+from services import pdf_service
+from services.pdf_service import FIT_MAX_PASSES, LAYOUT_STEPS, markdown_to_pdf, markdown_to_pdf_fit
+
+
+def _resume(bullets: int) -> str:
+    return "# Ada Lovelace\n\n## Experience\n\n" + "\n".join(
+        f"- Built analytical engine component number {i} with careful notes" for i in range(bullets)
+    )
+
+
+def _pages(pdf_bytes: bytes) -> int:
+    return len(pdf_service._PAGE_OBJECT_RE.findall(pdf_bytes))
+
+
+def _measure_all_steps(markdown_text: str) -> list:
+    """(page_count, pdf_bytes) for every ladder step."""
+    html_body = pdf_service._markdown_to_html_body(markdown_text)
+    digest = hashlib.sha256(html_body.encode("utf-8")).hexdigest()
+    return [pdf_service._measure_step(html_body, digest, step) for step in range(len(LAYOUT_STEPS))]
+
+
+@pytest.fixture
+def render_passes(monkeypatch):
+    """Empty the layout cache and count the xhtml2pdf renders that follow."""
+    pdf_service._layout_cache.clear()
+    passes = []
+    render = pdf_service._render_html
+    monkeypatch.setattr(pdf_service, "_render_html", lambda html: passes.append(1) or render(html))
+    yield passes
+    pdf_service._layout_cache.clear()
+
+
+def test_overflowing_resume_is_fitted_to_one_page(render_passes):
+    markdown_text = _resume(50)
+    assert _pages(markdown_to_pdf(markdown_text)) > 1
+    render_passes.clear()
+
+    fitted = markdown_to_pdf_fit(markdown_text, max_pages=1)
+    assert _pages(fitted) == 1
+    assert len(render_passes) <= FIT_MAX_PASSES
+
+    # The search picked the largest layout that fits: every step before it overflows
+    steps = _measure_all_steps(markdown_text)
+    chosen = [pages for pages, _ in steps].index(1)
+    assert chosen > 0 and all(pages > 1 for pages, _ in steps[:chosen])
+    assert fitted == steps[chosen][1]
+
+
+def test_falls_back_to_most_compact_step_when_nothing_fits(render_passes):
+    markdown_text = _resume(400)
+
+    fitted = markdown_to_pdf_fit(markdown_text, max_pages=1)
+    assert len(render_passes) <= FIT_MAX_PASSES
+
+    steps = _measure_all_steps(markdown_text)
+    assert all(pages > 1 for pages, _ in steps)
+    assert fitted == steps[-1][1]
+    assert _pages(fitted) == min(pages for pages, _ in steps)
@@ -0,0 +1,87 @@
+"""
+Portfolio HTML rendering: the compiled templates reproduce the page the
+original f-string renderer produced, and every user-supplied value is escaped.
+"""
+import os
+import re
+from services.portfolio_html_service import _CompiledTemplate, _url, generate_portfolio_html
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+PORTFOLIO = {
+    "about_me": "I build analytical engines.\nAnd notes.",
+    "professional_bio": "Mathematician and writer",
+    "linkedin_summary": "Pioneer of computing",
+    "github_highlights": "Engine: 42 stars",
+    "project_descriptions": [
+        {"name": "Engine", "description": "Analytical engine"},
+        {"name": "Notes", "description": "Notes on Menabrea"},
+        {"name": "Orphan", "description": "No profile entry"},
+    ],
+}
+PROFILE = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com", "phone": "555-0100", "location": "London",
+                      "linkedin": "https://linkedin.com/in/ada", "github": "https://github.com/ada",
+                      "website": "https://ada.dev"},
+    "skills": ["python", "sql", "math"],
+    "projects": [{"name": "Engine", "tech_stack": "Python", "description": "x", "link": "https://example.com/engine"},
+                 {"name": "Notes", "tech_stack": "", "description": "y"}],
+}
+
+
+def _normalise(html: str) -> str:
+    # The stylesheet moved to a module constant without the old 8-space indent, and
+    # the hero CTA lost its duplicate href/inline onclick; everything else is byte-identical.
+    html = re.sub(r"^[ \t]+", "", html, flags=re.M)
+    return html.replace(
+        """<a href="#" class="btn-primary contact-btn" onclick="document.getElementById('contact').scrollIntoView()" href="#contact">""",
+        '<a href="#contact" class="btn-primary contact-btn">',
+    )
+
+
+def test_render_matches_reference_output():
+    # portfolio_reference.html was produced by the pre-compilation renderer from the input above
+    with open(os.path.join(DATA, "portfolio_reference.html"), encoding="utf-8") as f:
+        reference = f.read()
+    assert _normalise(generate_portfolio_html(PORTFOLIO, PROFILE)) == _normalise(reference)
+
+
+def test_compiled_template_matches_plain_substitution():
+    source = "<p>{{a}}</p>{{b}}<i>{{a}}</i>{{c}}"
+    values = {"a": "1", "b": "<b>2</b>", "c": ""}
+    expected = source
+    for slot, value in values.items():
+        expected = expected.replace("{{" + slot + "}}", value)
+    template = _CompiledTemplate(source)
+    assert template.render(values) == expected
+    assert template.bind(b="<b>2</b>").render({"a": "1", "c": ""}) == expected
+
+
+def test_user_text_is_escaped():
+    hostile = '<script>alert("x")</script>'
+    profile = {
+        "personal_info": {"name": hostile, "email": 'a@b.c"><img src=x onerror=alert(1)>', "location": hostile},
+        "skills": [hostile],
+        "projects": [{"name": hostile, "tech_stack": hostile, "link": "https://ok.example/?a=1&b=\"2\""}],
+    }
+    portfolio = {"about_me": hostile, "linkedin_summary": hostile, "github_highlights": hostile,
+                 "project_descriptions": [{"name": hostile, "description": hostile}]}
+    html = generate_portfolio_html(portfolio, profile)
+    assert "<script>" not in html and "<img" not in html
+    assert "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt;" in html
+    assert 'href="https://ok.example/?a=1&amp;b=&quot;2&quot;"' in html
+
+
+def test_unsafe_urls_are_dropped():
+    for url in ("javascript:alert(1)", " JavaScript:alert(1)", "java\tscript:alert(1)",
+                "data:text/html,<script>alert(1)</script>", "vbscript:msgbox(1)"):
+        assert _url(url) == "", url
+    for url in ("https://github.com/ada", "http://x.dev/a:b", "mailto:ada@example.com", "#contact", "/p/ada-1",
+                "github.com/ada"):
+        assert _url(url) != "", url
+    assert _url('https://x.dev/"onmouseover="alert(1)') == "https://x.dev/&quot;onmouseover=&quot;alert(1)"
+
+    profile = {"personal_info": {"name": "Ada", "github": "javascript:alert(1)", "linkedin": "data:text/html,x"},
+               "projects": [{"name": "P", "link": "javascript:alert(1)"}]}
+    html = generate_portfolio_html({"github_highlights": "gh", "project_descriptions": [{"name": "P"}]}, profile)
+    assert "javascript:" not in html and "data:text/html" not in html
@@ -0,0 +1,34 @@
+"""
+Incremental portfolio generation: only changed sections are requested, and a
+section Gemini left out of its reply is requested again on the next call.
+"""
+import services.ai_service as ai_service
+from tests.conftest import PROFILE, fake_gemini
+
+
+def test_section_missing_from_reply_is_regenerated_next_time(monkeypatch):
+    prompts = []
+
+    def drop_bio(prompt, max_retries=3, task="other"):
+        prompts.append(prompt)
+        return fake_gemini(prompt).replace("[BIO]\nbio text", "")
+
+    monkeypatch.setattr(ai_service, "_call_gemini", drop_bio)
+    first = ai_service.generate_portfolio(PROFILE, fanout=False)
+    assert first["professional_bio"] == ""
+    assert "professional_bio" not in first["section_hashes"]
+
+    def record(prompt, max_retries=3, task="other"):
+        prompts.append(prompt)
+        return fake_gemini(prompt)
+
+    monkeypatch.setattr(ai_service, "_call_gemini", record)
+    prompts.clear()
+    second = ai_service.generate_portfolio(PROFILE, previous=first, fanout=False)
+    assert len(prompts) == 1 and "[BIO]" in prompts[0] and "[ABOUT_ME]" not in prompts[0]
+    assert second["professional_bio"] == "bio text"
+    assert second["section_hashes"].keys() == ai_service.section_fingerprints(PROFILE).keys()
+
+    prompts.clear()
+    ai_service.generate_portfolio(PROFILE, previous=second, fanout=False)
+    assert prompts == []
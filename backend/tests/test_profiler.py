@@ -0,0 +1,38 @@
+"""
+Request profiler: profiles say they are process-wide and how many requests
+overlapped them, and pruning works from the in-memory index.
+"""
+import os
+from services import profiler
+
+
+def test_requested_profile_is_labelled(client, admin):
+    r = client.get("/api/admin/stats", headers={**admin, "X-Profile": "1"})
+    assert r.status_code == 200
+    profile_id = r.headers["X-Profile-Id"]
+
+    listed = client.get("/api/admin/profiles", headers=admin).json()
+    meta = next(p for p in listed if p["id"] == profile_id)
+    assert meta["scope"] == "process"
+    assert meta["max_concurrent_requests"] == 1     # TestClient sends one request at a time
+    assert meta["reason"] == "requested"
+
+
+def test_prune_keeps_newest_without_reading_metadata(monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILE_KEEP", 3)
+    monkeypatch.setattr(profiler, "_index", None)
+    def no_metadata_reads():
+        raise AssertionError("pruning read the stored metadata")
+
+    monkeypatch.setattr(profiler, "list_profiles", no_metadata_reads)
+
+    recording = profiler.Recording()
+    recording.samples.append(((("thread", "", 0), ("f", "app.py", 1)), 5.0))
+    ids = [f"29990101T0000{i:02d}-0000000{i}" for i in range(6)]
+    for profile_id in ids:
+        profiler.save_profile(profile_id, recording, {"method": "GET", "path": "/x"})
+
+    stored = set(profiler._stored_ids())
+    assert set(ids[-3:]) <= stored and not set(ids[:3]) & stored
+    for profile_id in ids[:3]:
+        assert not os.path.exists(os.path.join(profiler.PROFILE_DIR, profile_id + ".collapsed"))
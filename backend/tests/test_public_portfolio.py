@@ -0,0 +1,73 @@
+"""
+Hosted portfolios (/p/{slug}) are opt-in, and repeated misses are answered
+from the page cache without querying the database.
+"""
+from services.portfolio_page_cache import page_cache
+from services.query_stats import assert_max_queries
+
+
+def _publish_state(client, headers):
+    r = client.get("/api/portfolio/publish", headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_portfolio_is_private_until_published(client, user):
+    assert client.post("/api/portfolio/generate", headers=user).status_code == 200
+    state = _publish_state(client, user)
+    assert state["published"] is False
+    slug = state["public_slug"]
+
+    assert client.get(f"/p/{slug}").status_code == 404
+
+    r = client.put("/api/portfolio/publish", headers=user)
+    assert r.status_code == 200 and r.json()["published"] is True
+    page = client.get(f"/p/{slug}")
+    assert page.status_code == 200
+    assert "Ada Lovelace" in page.text
+
+    r = client.delete("/api/portfolio/publish", headers=user)
+    assert r.status_code == 200 and r.json()["published"] is False
+    assert client.get(f"/p/{slug}").status_code == 404
+
+
+def test_publish_requires_a_profile(client, register):
+    assert client.put("/api/portfolio/publish", headers=register()).status_code == 404
+
+
+def test_misses_are_cached(client, user):
+    slug = _publish_state(client, user)["public_slug"]
+    page_cache.clear()
+
+    for unpublished_or_unknown in (slug, "nobody-999999"):
+        assert client.get(f"/p/{unpublished_or_unknown}").status_code == 404
+    with assert_max_queries(0):
+        for _ in range(5):
+            assert client.get(f"/p/{slug}").status_code == 404
+            assert client.get("/p/nobody-999999").status_code == 404
+
+    # Publishing drops the cached miss in this worker
+    assert client.post("/api/portfolio/generate", headers=user).status_code == 200
+    assert client.put("/api/portfolio/publish", headers=user).status_code == 200
+    assert client.get(f"/p/{slug}").status_code == 200
+
+
+def test_gzip_only_when_accepted(client, user):
+    assert client.post("/api/portfolio/generate", headers=user).status_code == 200
+    assert client.put("/api/portfolio/publish", headers=user).status_code == 200
+    slug = _publish_state(client, user)["public_slug"]
+
+    for accept_encoding, gzipped in [
+        ("gzip", True),
+        ("br, gzip;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("GZIP; q=0.0, *", False),
+        ("x-gzip", False),
+        ("identity", False),
+        ("*, gzip;q=0", False),
+    ]:
+        r = client.get(f"/p/{slug}", headers={"Accept-Encoding": accept_encoding})
+        assert r.status_code == 200
+        assert (r.headers.get("content-encoding") == "gzip") is gzipped, accept_encoding
+        assert "Ada Lovelace" in r.text
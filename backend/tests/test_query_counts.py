@@ -0,0 +1,56 @@
+"""
+Query budgets for the hot endpoints. Each check runs with the profile and
+principal caches cleared (the worst case for a request) against enough rows
+that an N+1 would blow the budget many times over.
+"""
+import pytest
+from services.auth_service import principal_cache
+from services.profile_repository import profile_cache
+from services.query_stats import assert_max_queries
+
+HISTORY_ROWS = 30
+EXTRA_USERS = 25
+
+
+@pytest.fixture
+def seeded(client, user, register):
+    for i in range(HISTORY_ROWS):
+        assert client.post("/api/resume/generate", json={"job_role": f"Role {i}"}, headers=user).status_code == 200
+    assert client.post("/api/portfolio/generate", headers=user).status_code == 200
+    for _ in range(EXTRA_USERS):
+        register()
+    return user
+
+
+def _cold():
+    profile_cache.clear()
+    principal_cache.clear()
+
+
+def test_admin_user_list(client, seeded, admin):
+    _cold()
+    with assert_max_queries(3):
+        r = client.get("/api/admin/users?limit=50", headers=admin)
+    assert r.status_code == 200 and len(r.json()) > EXTRA_USERS
+
+
+def test_history_listing(client, seeded):
+    _cold()
+    with assert_max_queries(3):
+        r = client.get("/api/resume/history", headers=seeded)
+    assert r.status_code == 200 and len(r.json()) > HISTORY_ROWS
+
+
+def test_ats_analyze(client, seeded):
+    _cold()
+    with assert_max_queries(4):
+        r = client.post("/api/ats/analyze", json={"job_description": "python, sql and go"}, headers=seeded)
+    assert r.status_code == 200, r.text
+
+
+@pytest.mark.parametrize("query", ["", "?fresh=true", "?format=bundle"])
+def test_portfolio_download(client, seeded, query):
+    _cold()
+    with assert_max_queries(4):
+        r = client.post(f"/api/portfolio/download{query}", headers=seeded)
+    assert r.status_code == 200
@@ -0,0 +1,99 @@
+"""
+EXPLAIN QUERY PLAN checks for the hot resume_history lookups.
+
+The statements are captured from real requests (so they are exactly what the
+routers send) and explained on SQLite with the same parameters. "Latest X for
+this user" lookups and the history list must be answered from the composite
+indexes of migration 0002; by-id fetches must be primary-key searches. No
+lookup may scan the table.
+"""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event, text
+from database import async_engine, engine
+
+
+@contextmanager
+def captured_history_queries():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM resume_history" in statement and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+def query_plan(statement: str, parameters) -> str:
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, tuple(parameters)).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def history_plans(statements) -> list:
+    plans = [query_plan(s, p) for s, p in statements]
+    return [plan for plan in plans if "resume_history" in plan]
+
+
+@pytest.fixture
+def history(client, user):
+    """A user with a resume and a portfolio on record."""
+    r = client.post("/api/resume/generate", json={"job_role": "Engineer"}, headers=user)
+    assert r.status_code == 200
+    assert client.post("/api/portfolio/generate", headers=user).status_code == 200
+    return user
+
+
+def assert_no_scan(plans):
+    for plan in plans:
+        assert "SCAN resume_history" not in plan, plan
+
+
+def test_history_list_uses_user_created_index(client, history):
+    with captured_history_queries() as statements:
+        assert client.get("/api/resume/history", headers=history).status_code == 200
+    plans = history_plans(statements)
+    assert plans
+    assert_no_scan(plans)
+    assert any("ix_resume_history_user_created" in plan for plan in plans), plans
+
+
+def test_ats_latest_resume_uses_user_type_index(client, history):
+    with captured_history_queries() as statements:
+        r = client.post("/api/ats/analyze", json={"job_description": "python"}, headers=history)
+        assert r.status_code == 200
+    plans = history_plans(statements)
+    assert plans
+    assert_no_scan(plans)
+    assert all("ix_resume_history_user_type_created" in plan for plan in plans), plans
+
+
+def test_portfolio_lookups_use_user_type_index(client, history):
+    with captured_history_queries() as statements:
+        assert client.post("/api/portfolio/download", headers=history).status_code == 200
+    plans = history_plans(statements)
+    assert plans
+    assert_no_scan(plans)
+    assert all("ix_resume_history_user_type_created" in plan for plan in plans), plans
+
+
+def test_pdf_by_id_is_a_primary_key_search(client, history):
+    item = client.get("/api/resume/history", params={"generation_type": "resume"}, headers=history).json()[0]
+    with captured_history_queries() as statements:
+        assert client.get(f"/api/pdf/history/{item['id']}", headers=history).status_code == 200
+    plans = history_plans(statements)
+    assert plans
+    assert_no_scan(plans)
+    assert all("INTEGER PRIMARY KEY" in plan or "ix_resume_history" in plan for plan in plans), plans
+
+
+def test_indexes_exist_after_migrations():
+    with engine.connect() as conn:
+        names = set(conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'resume_history'"
+        )).scalars())
+    assert {"ix_resume_history_user_type_created", "ix_resume_history_user_created"} <= names
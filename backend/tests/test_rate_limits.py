@@ -0,0 +1,40 @@
+"""
+AI rate limits: POST /api/portfolio/download only spends a token when it has to
+call Gemini, not when it reuses content generated from the same profile.
+"""
+import pytest
+from services.rate_limiter import Limit, MemoryBackend, rate_limiter
+
+
+@pytest.fixture
+def one_generation_per_user(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setattr(rate_limiter, "per_user", Limit(capacity=1, rate=1e-6))
+    monkeypatch.setattr(rate_limiter, "per_ip", None)
+    monkeypatch.setattr(rate_limiter, "global_limit", None)
+
+
+def test_download_reusing_stored_content_is_not_charged(client, user, one_generation_per_user):
+    assert client.post("/api/portfolio/download", headers=user).status_code == 200   # generates
+    for _ in range(3):
+        assert client.post("/api/portfolio/download", headers=user).status_code == 200   # reuses
+
+    r = client.post("/api/portfolio/download?fresh=true", headers=user)
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+
+
+def test_generate_is_always_charged(client, user, one_generation_per_user):
+    assert client.post("/api/portfolio/generate", headers=user).status_code == 200
+    assert client.post("/api/portfolio/generate", headers=user).status_code == 429
+
+
+def test_memory_backend_evicts_least_recently_used_bucket():
+    backend, slow = MemoryBackend(max_keys=3), Limit(capacity=1, rate=1e-6)
+    for key in ("a", "b", "c"):
+        assert backend.acquire([(key, slow)], 1)[0] == 0
+    assert backend.acquire([("a", slow)], 1)[0] > 0      # limited, and not touched
+    assert backend.acquire([("d", slow)], 1)[0] == 0     # evicts "a", the oldest
+    assert len(backend._states) == 3
+    assert backend.acquire([("a", slow)], 1)[0] == 0     # a fresh bucket
+    assert backend.acquire([("c", slow)], 1)[0] > 0      # still tracked
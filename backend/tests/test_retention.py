@@ -0,0 +1,79 @@
+"""
+History retention: archived rows survive rowid reuse in resume_history and are
+removed with their user.
+"""
+import importlib
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, inspect, select, text
+from database import SessionLocal
+from models.history_archive import HistoryArchive
+from models.resume_history import ResumeHistory
+from services.retention import RetentionPolicy, run_retention
+
+_POLICY = RetentionPolicy(max_age_days=5, generation_types=("cover_letter",))
+
+
+def _user_id(client, headers) -> int:
+    return client.get("/api/auth/me", headers=headers).json()["id"]
+
+
+def _add_letter(user_id: int, days_old: int) -> int:
+    with SessionLocal() as db:
+        row = ResumeHistory(user_id=user_id, generation_type="cover_letter", cover_letter=f"Letter {days_old}",
+                            created_at=datetime.utcnow() - timedelta(days=days_old))
+        db.add(row)
+        db.commit()
+        return row.id
+
+
+def test_archiving_a_reused_history_id(client, register):
+    user_id = _user_id(client, register())
+    _add_letter(user_id, 0)                 # newest row of the type, never archived
+    first = _add_letter(user_id, 30)        # highest rowid in resume_history
+    assert run_retention(SessionLocal, _POLICY).archived >= 1
+
+    reused = _add_letter(user_id, 30)       # SQLite hands out the freed rowid again
+    assert reused == first
+    assert run_retention(SessionLocal, _POLICY).archived >= 1
+
+    with SessionLocal() as db:
+        archived = db.scalars(select(HistoryArchive.history_id).where(HistoryArchive.user_id == user_id)).all()
+    assert archived == [first, first]
+
+
+def test_deleting_a_user_removes_archived_history(client, register, admin):
+    headers = register()
+    user_id = _user_id(client, headers)
+    _add_letter(user_id, 0)
+    _add_letter(user_id, 30)
+    run_retention(SessionLocal, _POLICY)
+
+    count = select(func.count(HistoryArchive.id)).where(HistoryArchive.user_id == user_id)
+    with SessionLocal() as db:
+        assert db.scalar(count) == 1
+    assert client.delete(f"/api/admin/users/{user_id}", headers=admin).status_code == 204
+    with SessionLocal() as db:
+        assert db.scalar(count) == 0
+
+
+def test_migration_moves_archive_ids_to_history_id(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE resume_history_archive (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+            "generation_type VARCHAR, job_role VARCHAR, company_name VARCHAR, ats_score INTEGER, "
+            "created_at DATETIME, archived_at DATETIME NOT NULL, payload BLOB NOT NULL)"))
+        conn.execute(text("CREATE INDEX ix_resume_history_archive_user_created ON resume_history_archive (user_id, created_at)"))
+        conn.execute(text("INSERT INTO resume_history_archive (id, user_id, archived_at, payload) "
+                          "VALUES (41, 7, '2025-01-01 00:00:00', x'00')"))
+
+    migration = importlib.import_module("migrations.v0006_history_archive_surrogate_key")
+    for _ in range(2):      # idempotent
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT history_id, user_id FROM resume_history_archive")).all() == [(41, 7)]
+        indexes = {ix["name"] for ix in inspect(conn).get_indexes("resume_history_archive")}
+    assert {"ix_resume_history_archive_user_created", "ix_resume_history_archive_history_id"} <= indexes
+    engine.dispose()